@@ -0,0 +1,290 @@
+# benchmarks/bench_scan.py
+"""
+스캔 엔진 end-to-end 벤치마크 (루프백 가짜 타겟 farm 대상).
+- farm: TCP open(배너) / closed / blackhole, UDP echo / ICMP closed 포트 (benchmarks/farm.py)
+- 케이스마다 새 프로세스(spawn)에서 실행 → RSS / CPU가 케이스끼리 섞이지 않음
+- 측정: ports/sec, 포트당 latency p50 / p99, peak RSS, CPU(user + sys), 기대 상태와의 일치율
+  (latency는 포트 단위 스캔 함수를 감싸서 측정 → 배치 UDP 엔진은 포트별 호출이 없어 null)
+
+    python -m benchmarks.bench_scan [--hosts 2] [--tcp-open 1000] [--cases threaded_scan,run_scan_async]
+                                    [--output bench.json] [--json]
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.farm import FakeTargetFarm, FarmLayout, plan_farm, BANNER_MIXES
+
+# 케이스 이름 → (프로토콜, 실행 함수). 실행 함수는 [(host, port, state), ...] 반환
+CASES: Dict[str, Tuple[str, Callable]] = {}
+
+
+def case(name: str, protocol: str):
+    def register(fn: Callable) -> Callable:
+        CASES[name] = (protocol, fn)
+        return fn
+    return register
+
+
+# ---------------------------------------------------------------------
+# 포트당 latency 측정 (벤치마크 프로세스 안에서만 모듈 함수를 교체)
+# ---------------------------------------------------------------------
+
+def _install_latency_hooks(samples: List[float]) -> None:
+    from scanner import tcp_scanner, udp_scanner, scan_runner
+
+    def timed(fn):
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                samples.append(time.perf_counter() - t0)
+        return wrapper
+
+    def timed_async(fn):
+        async def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                samples.append(time.perf_counter() - t0)
+        return wrapper
+
+    tcp_scanner.scan_single_port = scan_runner.scan_single_port = timed(tcp_scanner.scan_single_port)
+    tcp_scanner.async_scan_single_port = scan_runner.async_scan_single_port = timed_async(
+        tcp_scanner.async_scan_single_port
+    )
+    udp_scanner.scan_single_udp_port = scan_runner.scan_single_udp_port = timed(udp_scanner.scan_single_udp_port)
+
+
+def percentile(sorted_values: List[float], q: float) -> float | None:
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[idx]
+
+
+# ---------------------------------------------------------------------
+# 케이스
+# ---------------------------------------------------------------------
+
+def _single(fn, layout: FarmLayout, ports: List[int], **kwargs) -> List[Tuple[str, int, str]]:
+    host = layout.hosts[0]
+    return [(host, r["port"], r["state"]) for r in fn(host, ports, **kwargs)]
+
+
+@case("sequential_scan", "tcp")
+def _sequential_scan(layout: FarmLayout, opts: Dict):
+    from scanner.tcp_scanner import sequential_scan
+    return _single(sequential_scan, layout, _subset(layout.tcp_ports, opts["sequential_ports"]),
+                   timeout=opts["timeout"])
+
+
+@case("threaded_scan", "tcp")
+def _threaded_scan(layout: FarmLayout, opts: Dict):
+    from scanner.tcp_scanner import threaded_scan
+    return _single(threaded_scan, layout, layout.tcp_ports, timeout=opts["timeout"], max_workers=opts["workers"])
+
+
+@case("async_scan", "tcp")
+def _async_scan(layout: FarmLayout, opts: Dict):
+    from scanner.tcp_scanner import async_scan
+    return _single(async_scan, layout, layout.tcp_ports, timeout=opts["timeout"], concurrency=opts["concurrency"])
+
+
+@case("sequential_udp_scan", "udp")
+def _sequential_udp_scan(layout: FarmLayout, opts: Dict):
+    from scanner.udp_scanner import sequential_udp_scan
+    return _single(sequential_udp_scan, layout, _subset(layout.udp_ports, opts["sequential_ports"]),
+                   timeout=opts["timeout"])
+
+
+@case("threaded_udp_scan", "udp")
+def _threaded_udp_scan(layout: FarmLayout, opts: Dict):
+    from scanner.udp_scanner import threaded_udp_scan
+    return _single(threaded_udp_scan, layout, layout.udp_ports, timeout=opts["timeout"], max_workers=opts["workers"])
+
+
+@case("batch_udp_scan", "udp")
+def _batch_udp_scan(layout: FarmLayout, opts: Dict):
+    from scanner.udp_scanner import batch_udp_scan
+    return _single(batch_udp_scan, layout, layout.udp_ports, timeout=opts["timeout"])
+
+
+def _run_scan(layout: FarmLayout, ports: List[int], **options):
+    from scanner.scan_runner import run_scan
+
+    out: List[Tuple[str, int, str]] = []
+    run_scan(layout.hosts, ports, on_result=lambda host, r: out.append((host, r.port, r.state)), **options)
+    return out
+
+
+@case("run_scan_threaded", "tcp")
+def _run_scan_threaded(layout: FarmLayout, opts: Dict):
+    return _run_scan(layout, layout.tcp_ports, timeout=opts["timeout"], engine="threaded",
+                     max_workers=opts["workers"])
+
+
+@case("run_scan_async", "tcp")
+def _run_scan_async(layout: FarmLayout, opts: Dict):
+    return _run_scan(layout, layout.tcp_ports, timeout=opts["timeout"], engine="async",
+                     concurrency=opts["concurrency"])
+
+
+@case("run_scan_udp_batch", "udp")
+def _run_scan_udp_batch(layout: FarmLayout, opts: Dict):
+    return _run_scan(layout, layout.udp_ports, timeout=opts["timeout"], udp_only=True, udp_engine="batch")
+
+
+def _subset(ports: List[int], n: int) -> List[int]:
+    """순차 엔진용 부분 집합 (open / closed / blackhole 비율을 유지하도록 고르게 추출)."""
+    if n <= 0 or n >= len(ports):
+        return ports
+    step = len(ports) / n
+    return [ports[int(i * step)] for i in range(n)]
+
+
+# ---------------------------------------------------------------------
+# 실행 / 측정
+# ---------------------------------------------------------------------
+
+def _measure(name: str, layout_dict: Dict, opts: Dict) -> Dict:
+    """케이스 1개 실행 (새 프로세스 안에서 호출됨)."""
+    layout = FarmLayout(**layout_dict)
+    protocol, fn = CASES[name]
+    samples: List[float] = []
+    _install_latency_hooks(samples)
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    ru0 = resource.getrusage(resource.RUSAGE_SELF)
+    t0 = time.perf_counter()
+    results = fn(layout, opts)
+    elapsed = time.perf_counter() - t0
+    ru1 = resource.getrusage(resource.RUSAGE_SELF)
+
+    expected = layout.expected(protocol)
+    states: Dict[str, int] = {}
+    matched = 0
+    for _, port, state in results:
+        states[state] = states.get(state, 0) + 1
+        matched += expected.get(port) == state
+
+    cpu_user = ru1.ru_utime - ru0.ru_utime
+    cpu_sys = ru1.ru_stime - ru0.ru_stime
+    samples.sort()
+    p50, p99 = percentile(samples, 50), percentile(samples, 99)
+
+    return {
+        "protocol": protocol,
+        "ports": len(results),
+        "elapsed_s": round(elapsed, 4),
+        "ports_per_sec": round(len(results) / elapsed, 1) if elapsed > 0 else None,
+        "latency_ms": {
+            "samples": len(samples),
+            "p50": round(p50 * 1000, 3) if p50 is not None else None,
+            "p99": round(p99 * 1000, 3) if p99 is not None else None,
+        },
+        "cpu_s": {"user": round(cpu_user, 3), "sys": round(cpu_sys, 3)},
+        "cpu_percent": round((cpu_user + cpu_sys) / elapsed * 100, 1) if elapsed > 0 else None,
+        # Linux ru_maxrss 단위는 KiB
+        "peak_rss_mb": round(ru1.ru_maxrss / 1024, 1),
+        "baseline_rss_mb": round(rss_before / 1024, 1),
+        "states": states,
+        "accuracy": round(matched / len(results), 4) if results else None,
+    }
+
+
+def run_case(name: str, layout: FarmLayout, opts: Dict) -> Dict:
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+        return pool.submit(_measure, name, layout.to_dict(), opts).result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scanner engine benchmark on a loopback fake-target farm")
+    parser.add_argument("--hosts", type=int, default=2, help="farm 주소 수 (127.0.0.1부터)")
+    parser.add_argument("--tcp-open", type=int, default=1000)
+    parser.add_argument("--tcp-closed", type=int, default=500)
+    parser.add_argument("--tcp-blackhole", type=int, default=20)
+    parser.add_argument("--udp-open", type=int, default=50)
+    parser.add_argument("--udp-closed", type=int, default=200)
+    parser.add_argument("--base-port", type=int, default=20000)
+    parser.add_argument("--banners", choices=sorted(BANNER_MIXES), default="greeting",
+                        help="open TCP 포트 응답 종류")
+    parser.add_argument("--timeout", type=float, default=0.5)
+    parser.add_argument("--workers", type=int, default=100, help="threaded 엔진 스레드 수")
+    parser.add_argument("--concurrency", type=int, default=1000, help="async 엔진 동시 connect 수")
+    parser.add_argument("--sequential-ports", type=int, default=200,
+                        help="순차 엔진은 이 개수만 스캔 (0: 전체)")
+    parser.add_argument("--cases", default=",".join(CASES), help="쉼표로 구분한 케이스 이름")
+    parser.add_argument("--output", help="결과 JSON 파일 경로")
+    parser.add_argument("--json", action="store_true", help="결과 JSON을 stdout으로 출력")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.cases.split(",") if n.strip()]
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)} (available: {', '.join(CASES)})")
+
+    layout = plan_farm(
+        hosts=args.hosts, tcp_open=args.tcp_open, tcp_closed=args.tcp_closed,
+        tcp_blackhole=args.tcp_blackhole, udp_open=args.udp_open, udp_closed=args.udp_closed,
+        base_port=args.base_port, banner_mix=args.banners,
+    )
+    opts = {
+        "timeout": args.timeout,
+        "workers": args.workers,
+        "concurrency": args.concurrency,
+        "sequential_ports": args.sequential_ports,
+    }
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "options": opts,
+            "farm": {
+                "hosts": layout.hosts,
+                "banner_mix": layout.banner_mix,
+                "tcp_open": len(layout.tcp_open),
+                "tcp_closed": len(layout.tcp_closed),
+                "tcp_blackhole": len(layout.tcp_blackhole),
+                "udp_open": len(layout.udp_open),
+                "udp_closed": len(layout.udp_closed),
+            },
+        },
+        "results": {},
+    }
+
+    with FakeTargetFarm(layout):
+        for name in names:
+            res = run_case(name, layout, opts)
+            report["results"][name] = res
+            if not args.json:
+                lat = res["latency_ms"]
+                print(
+                    f"{name:<22} {res['ports']:>7} ports  {res['elapsed_s']:>8.3f}s  "
+                    f"{res['ports_per_sec'] or 0:>9.1f} p/s  p50 {lat['p50']} ms  p99 {lat['p99']} ms  "
+                    f"rss {res['peak_rss_mb']} MB  cpu {res['cpu_percent']}%  acc {res['accuracy']}",
+                    file=sys.stderr,
+                )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# benchmarks/bench_signatures.py
+"""
+시그니처 DB 매칭 벤치마크.
+- 기본 DB vs 합성 시그니처를 수천 개 추가한 DB의 배너당 매칭 시간 비교
+  (keyword 색인 덕분에 시그니처 수가 늘어도 배너당 비용이 거의 같아야 함)
+- 기존 방식(배너마다 서비스별 inline re.search)도 참고용으로 측정
+
+    python -m benchmarks.bench_signatures [--rounds 200] [--extra 5000] [--json]
+"""
+import argparse
+import json
+import random
+import re
+import time
+
+from scanner.signatures import SignatureDB, SIGNATURES_PATH
+
+BANNER_CORPUS = [
+    ("ssh", "SSH-2.0-OpenSSH_8.9p1 Ubuntu-3ubuntu0.1"),
+    ("ssh", "SSH-2.0-OpenSSH_7.4"),
+    ("ssh", "SSH-2.0-dropbear_2020.81"),
+    ("ssh", "SSH-2.0-ROSSSH"),
+    ("ftp", "220 (vsFTPd 3.0.5)"),
+    ("ftp", "220 ProFTPD 1.3.5e Server (Debian) [::ffff:10.0.0.5]"),
+    ("ftp", "220-FileZilla Server 0.9.60 beta"),
+    ("ftp", "220 Microsoft FTP Service"),
+    ("http", "HTTP/1.1 200 OK\r\nDate: Mon, 01 Jan 2024 00:00:00 GMT\r\nServer: Apache/2.4.25 (Debian)\r\nContent-Type: text/html\r\n"),
+    ("http", "HTTP/1.1 301 Moved Permanently\r\nServer: nginx/1.18.0 (Ubuntu)\r\nLocation: https://example.com/\r\n"),
+    ("http", "HTTP/1.1 200 OK\r\nServer: Microsoft-IIS/10.0\r\nX-Powered-By: ASP.NET\r\nX-AspNet-Version: 4.0.30319\r\n"),
+    ("http", "HTTP/1.0 200 OK\r\nServer: SimpleHTTP/0.6 Python/3.11.7\r\n"),
+    ("http", "HTTP/1.1 404 Not Found\r\nServer: cloudflare\r\nCF-RAY: 1234\r\n"),
+    ("http", "HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\nContent-Length: 2\r\n\r\nok"),
+    ("smtp", "220 mail.example.com ESMTP Postfix (Ubuntu)"),
+    ("smtp", "220 mx.example.org ESMTP Exim 4.94.2 Mon, 01 Jan 2024 00:00:00 +0000"),
+    ("imap", "* OK [CAPABILITY IMAP4rev1 SASL-IR LOGIN-REFERRALS] Dovecot (Ubuntu) ready."),
+    ("mysql", "J\x00\x00\x00\n8.0.33-0ubuntu0.22.04.2\x00\x08\x00\x00\x00mysql_native_password\x00"),
+    ("telnet", "\xff\xfd\x18\xff\xfd \r\nUbuntu 22.04 LTS\r\nlogin: "),
+    ("unknown", "+OK ready"),
+]
+
+
+def legacy_parse(service, banner):
+    """기존 version_parser 방식 (배너마다 inline 패턴으로 re.search)."""
+    b = banner.lower()
+    if service == "ssh":
+        m = re.search(r"openssh[_/ ]([\d\.p]+)", b)
+        return m.group(1) if m else banner.strip()
+    if service == "ftp":
+        m = re.search(r"vsftpd ([\d\.]+)", b)
+        return m.group(1) if m else banner.strip()
+    if service == "http":
+        m = re.search(r"Apache/([\d\.]+)", banner, re.IGNORECASE)
+        return m.group(1) if m else None
+    return banner.strip()
+
+
+def synthetic_signatures(n, seed=0):
+    """서로 다른 keyword를 가진 합성 시그니처 n개 (실제 배너에는 매칭되지 않음)."""
+    rng = random.Random(seed)
+    services = ["ssh", "ftp", "http", "smtp", "imap", "mysql", "telnet"]
+    sigs = []
+    for i in range(n):
+        name = f"product{i}x{rng.randrange(1 << 20):x}"
+        sigs.append({
+            "id": f"synthetic-{i}",
+            "service": rng.choice(services),
+            "product": name,
+            "keyword": name,
+            "pattern": rf"{name}/(?P<version>[\d\.]+)",
+        })
+    return sigs
+
+
+def _time_per_banner(fn, corpus, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for service, banner in corpus:
+            fn(service, banner)
+    elapsed = time.perf_counter() - start
+    return elapsed / (rounds * len(corpus)) * 1e6   # µs / banner
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Signature DB matching benchmark")
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--extra", type=int, default=5000, help="Synthetic signatures added for the scaling run")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    with open(SIGNATURES_PATH, "r", encoding="utf-8") as f:
+        base = json.load(f)["signatures"]
+
+    t0 = time.perf_counter()
+    db = SignatureDB(base)
+    load_base = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    big = SignatureDB(base + synthetic_signatures(args.extra))
+    load_big = time.perf_counter() - t0
+
+    # 두 DB의 매칭 결과가 같아야 함 (합성 시그니처는 실제 배너와 무관)
+    for service, banner in BANNER_CORPUS:
+        assert db.match(banner, service) == big.match(banner, service), banner
+
+    results = {
+        "corpus_banners": len(BANNER_CORPUS),
+        "rounds": args.rounds,
+        "legacy_inline_us": _time_per_banner(legacy_parse, BANNER_CORPUS, args.rounds),
+        "db": {
+            "signatures": len(db),
+            "load_ms": load_base * 1e3,
+            "match_us": _time_per_banner(lambda s, b: db.match(b, s), BANNER_CORPUS, args.rounds),
+        },
+        "db_scaled": {
+            "signatures": len(big),
+            "load_ms": load_big * 1e3,
+            "match_us": _time_per_banner(lambda s, b: big.match(b, s), BANNER_CORPUS, args.rounds),
+        },
+        "matched": sum(1 for s, b in BANNER_CORPUS if db.match(b, s)),
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"banners: {results['corpus_banners']} x {args.rounds} rounds (matched {results['matched']})")
+    print(f"legacy inline regex      : {results['legacy_inline_us']:8.2f} us/banner (ssh/ftp/apache only)")
+    for key in ("db", "db_scaled"):
+        r = results[key]
+        print(
+            f"signature DB ({r['signatures']:>5} sigs): {r['match_us']:8.2f} us/banner"
+            f"  (load {r['load_ms']:.1f} ms)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# benchmarks/farm.py
+"""
+루프백 가짜 타겟 farm (스캐너 벤치마크용).
+- 127.0.0.1, 127.0.0.2, ... 주소마다 같은 포트 구성 (Linux는 127.0.0.0/8 전체가 loopback)
+- TCP open: greeting 배너 / HTTP 응답 / 무응답 (banner mix로 비율 지정)
+- TCP closed: 바인드하지 않은 포트 → RST
+- TCP blackhole: accept 큐를 가득 채운 listen 소켓 → SYN drop → connect timeout
+- UDP open: echo / UDP closed: 바인드하지 않은 포트 → ICMP port unreachable
+farm은 별도 프로세스에서 selector 하나로 돌아가므로 스캐너와 GIL을 나눠 쓰지 않음.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import resource
+import selectors
+import socket
+from dataclasses import dataclass, asdict, field
+from typing import Dict, List
+
+BANNERS = {
+    "ssh": b"SSH-2.0-OpenSSH_8.9p1 Ubuntu-3ubuntu0.1\r\n",
+    "ftp": b"220 (vsFTPd 3.0.5)\r\n",
+    "smtp": b"220 bench.local ESMTP Postfix (Ubuntu)\r\n",
+}
+HTTP_RESPONSE = (
+    b"HTTP/1.1 200 OK\r\nServer: nginx/1.18.0 (Ubuntu)\r\n"
+    b"Content-Type: text/html\r\nContent-Length: 2\r\nConnection: close\r\n\r\nok"
+)
+
+# banner mix 이름 → open 포트에 순서대로 돌려 쓰는 응답 종류
+BANNER_MIXES = {
+    "greeting": ["ssh", "ftp", "smtp"],
+    "mixed": ["ssh", "ftp", "smtp", "http"],
+    "http": ["http"],
+    "silent": ["silent"],
+}
+
+
+@dataclass
+class FarmLayout:
+    hosts: List[str]
+    tcp_open: List[int] = field(default_factory=list)
+    tcp_closed: List[int] = field(default_factory=list)
+    tcp_blackhole: List[int] = field(default_factory=list)
+    udp_open: List[int] = field(default_factory=list)
+    udp_closed: List[int] = field(default_factory=list)
+    banner_mix: str = "greeting"
+
+    @property
+    def tcp_ports(self) -> List[int]:
+        return sorted(self.tcp_open + self.tcp_closed + self.tcp_blackhole)
+
+    @property
+    def udp_ports(self) -> List[int]:
+        return sorted(self.udp_open + self.udp_closed)
+
+    def expected(self, protocol: str) -> Dict[int, str]:
+        """포트별 기대 상태 (이 스캐너는 connect timeout도 closed로 판정)."""
+        if protocol == "tcp":
+            return {
+                **{p: "open" for p in self.tcp_open},
+                **{p: "closed" for p in self.tcp_closed + self.tcp_blackhole},
+            }
+        return {**{p: "open" for p in self.udp_open}, **{p: "closed" for p in self.udp_closed}}
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def plan_farm(
+    hosts: int = 1,
+    tcp_open: int = 1000,
+    tcp_closed: int = 500,
+    tcp_blackhole: int = 20,
+    udp_open: int = 50,
+    udp_closed: int = 200,
+    base_port: int = 20000,
+    banner_mix: str = "greeting",
+) -> FarmLayout:
+    """연속된 포트 구간으로 farm 구성 (TCP open → closed → blackhole / UDP open → closed)."""
+    def take(n: int) -> List[int]:
+        nonlocal base_port
+        ports = list(range(base_port, base_port + n))
+        base_port += n
+        return ports
+
+    layout = FarmLayout(hosts=[f"127.0.0.{i + 1}" for i in range(hosts)], banner_mix=banner_mix)
+    layout.tcp_open = take(tcp_open)
+    layout.tcp_closed = take(tcp_closed)
+    layout.tcp_blackhole = take(tcp_blackhole)
+    layout.udp_open = take(udp_open)
+    layout.udp_closed = take(udp_closed)
+    return layout
+
+
+def _raise_nofile(needed: int) -> None:
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+
+def _serve(layout: FarmLayout, ready, stop) -> None:
+    n_hosts = len(layout.hosts)
+    _raise_nofile(n_hosts * (len(layout.tcp_open) + 3 * len(layout.tcp_blackhole) + len(layout.udp_open)) + 4096)
+
+    sel = selectors.DefaultSelector()
+    mix = BANNER_MIXES[layout.banner_mix]
+    held = []   # blackhole accept 큐를 채우는 연결 (닫히지 않게 보관)
+
+    for host in layout.hosts:
+        for i, port in enumerate(layout.tcp_open):
+            s = socket.socket()
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            s.bind((host, port))
+            s.listen(1024)
+            s.setblocking(False)
+            sel.register(s, selectors.EVENT_READ, ("listen", mix[i % len(mix)]))
+
+        for port in layout.tcp_blackhole:
+            s = socket.socket()
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            s.bind((host, port))
+            s.listen(0)
+            held.append(s)
+            for _ in range(2):
+                c = socket.socket()
+                c.setblocking(False)
+                c.connect_ex((host, port))
+                held.append(c)
+
+        for port in layout.udp_open:
+            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            s.bind((host, port))
+            s.setblocking(False)
+            sel.register(s, selectors.EVENT_READ, ("udp", None))
+
+    ready.set()
+
+    while not stop.is_set():
+        for key, _ in sel.select(0.2):
+            kind, banner = key.data
+            sock = key.fileobj
+
+            if kind == "listen":
+                while True:
+                    try:
+                        conn, _ = sock.accept()
+                    except (BlockingIOError, OSError):
+                        break
+                    if banner in BANNERS:
+                        try:
+                            conn.send(BANNERS[banner])
+                        except OSError:
+                            pass
+                        conn.close()
+                    else:
+                        conn.setblocking(False)
+                        sel.register(conn, selectors.EVENT_READ, ("conn", banner))
+
+            elif kind == "conn":
+                try:
+                    data = sock.recv(4096)
+                except OSError:
+                    data = b""
+                if data and banner == "http":
+                    try:
+                        sock.send(HTTP_RESPONSE)
+                    except OSError:
+                        pass
+                if not data or banner == "http":
+                    sel.unregister(sock)
+                    sock.close()
+
+            else:   # udp echo
+                try:
+                    data, addr = sock.recvfrom(4096)
+                    sock.sendto(data or b"echo", addr)
+                except OSError:
+                    pass
+
+
+class FakeTargetFarm:
+    """
+    with FakeTargetFarm(layout): ... 형태로 사용.
+    시작 시 모든 포트 바인드가 끝날 때까지 기다림.
+    """
+
+    def __init__(self, layout: FarmLayout):
+        self.layout = layout
+        ctx = multiprocessing.get_context("fork")
+        self._ready = ctx.Event()
+        self._stop = ctx.Event()
+        self._proc = ctx.Process(target=_serve, args=(layout, self._ready, self._stop), daemon=True)
+
+    def start(self, timeout: float = 60.0) -> "FakeTargetFarm":
+        self._proc.start()
+        if not self._ready.wait(timeout):
+            self.stop()
+            raise RuntimeError("fake target farm did not start")
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._proc.join(5)
+        if self._proc.is_alive():
+            self._proc.terminate()
+
+    def __enter__(self) -> "FakeTargetFarm":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -173,6 +173,60 @@ def insert_scan(
 
 
 
+# -----------------------------
+# 3-1) SCAN 상태 UPDATE  (스트리밍 저장: RUNNING → DONE / FAILED)
+# -----------------------------
+def update_scan_status(
+    conn: MySQLConnection,
+    scan_db_id: int,
+    status: str,
+    finished_at: Optional[datetime] = None,
+) -> None:
+
+    sql = """
+    UPDATE scans
+    SET status = %s,
+        finished_at = COALESCE(%s, finished_at)
+    WHERE id = %s;
+    """
+
+    with conn.cursor() as cur:
+        cur.execute(sql, (status, finished_at, scan_db_id))
+
+
+
+# -----------------------------
+# 3-2) 증분 스캔용 조회
+# -----------------------------
+def get_open_ports(conn: MySQLConnection) -> List[Dict[str, Any]]:
+    """현재 open으로 기록된 포트 전체 (호스트 IP 포함)."""
+    sql = """
+    SELECT h.host_ip, p.port, p.protocol, p.service, p.version, p.last_scan_id
+    FROM ports p
+    JOIN hosts h ON p.host_id = h.id
+    WHERE p.state = 'open';
+    """
+    with conn.cursor(dictionary=True) as cur:
+        cur.execute(sql)
+        return cur.fetchall()
+
+
+def get_last_full_sweep(conn: MySQLConnection, target: str) -> Optional[datetime]:
+    """같은 타겟으로 끝까지 실행된 증분 full sweep 중 가장 최근 시작 시각."""
+    sql = """
+    SELECT MAX(started_at)
+    FROM scans
+    WHERE target = %s
+      AND status = 'DONE'
+      AND JSON_UNQUOTE(JSON_EXTRACT(config_snapshot, '$.incremental')) = 'full';
+    """
+    with conn.cursor() as cur:
+        cur.execute(sql, (target,))
+        row = cur.fetchone()
+    return row[0] if row else None
+
+
+
 # -----------------------------
 # 4) 취약점 INSERT
 # -----------------------------
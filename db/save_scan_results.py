@@ -1,19 +1,28 @@
 # db/save_scan_results.py
 
+import time
+
 from db.db_client import get_connection
-from db.query_helpers import upsert_host, upsert_port, insert_scan
+from db.query_helpers import upsert_host, upsert_port, insert_scan, update_scan_status
 from scanner.service_fingerprints import PORT_SERVICE_MAP, guess_service
+from scanner.result_store import HostResults
 from datetime import datetime
-from scanner.utils import resolve_hostname
+from scanner.rdns import attach_host_names
+from scanner.metrics import STAGE_SECONDS, DB_WRITE_SECONDS
 
 
 def save_scan_results(scan_result: dict):
     scan_id = scan_result["scan_id"]
     targets = scan_result["targets"]
 
+    # 역방향 DNS는 트랜잭션 밖에서 (동시 조회 + 캐시) 미리 채워둠
+    attach_host_names(scan_result)
+
+    start = time.perf_counter()
     conn = get_connection()
 
-    target_str = ",".join(t["ip"] for t in targets)
+    # scans.target은 VARCHAR(255): 타겟 스펙 라벨(run_scan이 results["target"]에 기록) 우선, 없으면 IP 목록
+    target_str = (scan_result.get("target") or ",".join(t["ip"] for t in targets))[:255]
     started_at = datetime.fromisoformat(scan_result["started_at"])
     finished_at = datetime.fromisoformat(scan_result["finished_at"])
 
@@ -29,16 +38,22 @@ def save_scan_results(scan_result: dict):
     )
 
     for t in targets:
+        # invalid_ip / host discovery에서 down으로 판정된 호스트는 저장하지 않음
+        if "error" in t or t.get("status") == "down":
+            continue
+
         ip = t["ip"]
-        host_name = resolve_hostname(ip)
         host_id = upsert_host(
             conn,
             host_ip=ip,
-            host_name=host_name,
+            host_name=t.get("host_name"),
             last_scan_id=scan_id,
         )
 
-        for r in t["results"]: 
+        # HostResults면 open 포트만 바로 꺼냄 (closed 포트 dict를 만들지 않음)
+        results = t["results"]
+        rows = results.dicts(("open",)) if isinstance(results, HostResults) else results
+        for r in rows:
             port = r["port"]
 
             if r["state"] != "open":
@@ -63,4 +78,132 @@ def save_scan_results(scan_result: dict):
 
     conn.commit()
     conn.close()
+    STAGE_SECONDS.inc("db_save", value=time.perf_counter() - start)
     return True
+
+
+class StreamingScanSaver:
+    """
+    스캔 도중 결과를 바로 DB에 기록 (iter_scan / run_scan(on_result=...)용).
+    - 생성 시 scans 행을 RUNNING 상태로 insert
+      (scan_db_id를 주면 중단됐던 스캔의 기존 행을 다시 RUNNING으로 → 재개해도 행은 하나)
+    - add(host, result): open 포트가 나오면 host / port upsert 후 바로 commit
+    - finish(scan_result): up 호스트 전체를 역방향 DNS 이름과 함께 기록하고 DONE으로 변경
+      (스캔 도중에는 DNS 조회를 하지 않음 → 이름은 attach_host_names 결과만 사용)
+    - fail(): 중단된 스캔을 FAILED로 표시 (그때까지 저장된 포트는 유지)
+    """
+
+    def __init__(
+        self,
+        scan_id: str,
+        target: str,
+        scan_type: str,
+        port_range: str,
+        started_at: str,
+        config_snapshot: dict | None = None,
+        scan_db_id: int | None = None,
+    ):
+        self.scan_id = scan_id
+        self.conn = get_connection()
+        self.host_ids: dict[str, int] = {}
+
+        if scan_db_id is not None:
+            self.scan_db_id = scan_db_id
+            update_scan_status(self.conn, scan_db_id, "RUNNING")
+        else:
+            self.scan_db_id = insert_scan(
+                conn=self.conn,
+                target=target[:255],
+                scan_type=scan_type,
+                port_range=str(port_range),
+                started_at=datetime.fromisoformat(started_at),
+                finished_at=None,
+                status="RUNNING",
+                config_snapshot=config_snapshot,
+            )
+        self.conn.commit()
+
+    def _host_id(self, ip: str) -> int:
+        host_id = self.host_ids.get(ip)
+        if host_id is None:
+            host_id = self.host_ids[ip] = upsert_host(
+                self.conn,
+                host_ip=ip,
+                last_scan_id=self.scan_id,
+            )
+        return host_id
+
+    def add(self, host: str, result) -> None:
+        if result.state != "open":
+            return
+
+        with DB_WRITE_SECONDS.time("port_upsert"):
+            upsert_port(
+                self.conn,
+                host_id=self._host_id(host),
+                port=result.port,
+                protocol=result.protocol,
+                service=result.service,
+                version=getattr(result, "version", None),
+                banner=result.banner,
+                last_scan_id=self.scan_id,
+                state=result.state,
+            )
+            self.conn.commit()
+
+    def finish(self, scan_result: dict) -> None:
+        attach_host_names(scan_result)
+        start = time.perf_counter()
+        for t in scan_result["targets"]:
+            if "error" in t or t.get("status") == "down":
+                continue
+            self.host_ids[t["ip"]] = upsert_host(
+                self.conn,
+                host_ip=t["ip"],
+                host_name=t.get("host_name"),
+                last_scan_id=self.scan_id,
+            )
+
+        update_scan_status(
+            self.conn,
+            self.scan_db_id,
+            scan_result.get("status", "DONE"),
+            finished_at=datetime.fromisoformat(scan_result["finished_at"]),
+        )
+        self.conn.commit()
+        self.conn.close()
+        STAGE_SECONDS.inc("db_save", value=time.perf_counter() - start)
+
+    def fail(self) -> None:
+        try:
+            update_scan_status(self.conn, self.scan_db_id, "FAILED", finished_at=datetime.now())
+            self.conn.commit()
+        finally:
+            self.conn.close()
+
+
+def save_port_changes(scan_id: str, changes) -> None:
+    """증분 스캔에서 닫힌 것으로 확인된 포트를 closed로 기록 (open 포트는 스캔 저장 시 이미 기록됨)."""
+    closed = [c for c in changes if c.change == "closed"]
+    if not closed:
+        return
+
+    start = time.perf_counter()
+    conn = get_connection()
+    try:
+        host_ids: dict[str, int] = {}
+        for c in closed:
+            if c.ip not in host_ids:
+                host_ids[c.ip] = upsert_host(conn, host_ip=c.ip, last_scan_id=scan_id)
+            upsert_port(
+                conn,
+                host_id=host_ids[c.ip],
+                port=c.port,
+                protocol=c.protocol,
+                last_scan_id=scan_id,
+                state="closed",
+            )
+        conn.commit()
+    finally:
+        conn.close()
+    STAGE_SECONDS.inc("db_save", value=time.perf_counter() - start)
@@ -1,22 +1,316 @@
 # scanner/banner_grabber_versioned.py
+from __future__ import annotations
 
+import asyncio
 import socket
-from .probes import PROBES
+import time
+from functools import lru_cache
+from typing import Dict, Generator, List, Tuple, TYPE_CHECKING
 
-def grab_banner(host: str, port: int, service: str, timeout: float = 1.0) -> str | None:
+from .config import load_scanner_config
+from .probes import PROBES, PASSIVE_BANNER_SERVICES, ESCALATION_PROBES, http_probe
+from .signatures import match_banner
+from .transport import get_transport
+from .metrics import INFLIGHT, observe_banner
+from .tls_scanner import TLS_PORTS
+from .utils import tcp_connect, async_tcp_connect
+
+if TYPE_CHECKING:
+    from .rate_limit import RateLimiter
+    from .timing import TimingTable
+
+# (probe 이름, payload, 포트 기반 서비스의 기본 probe 여부)
+Probe = Tuple[str, bytes, bool]
+
+
+@lru_cache(maxsize=1)
+def banner_settings() -> Dict:
+    """scanner_config.yaml의 banner 섹션 (프로세스당 한 번만 로드)."""
+    return load_scanner_config()["banner"]
+
+
+def _decode(data: bytes) -> str:
+    return data.decode(errors="ignore")
+
+
+def _identified(data: bytes, service: str | None) -> bool:
+    """시그니처가 매칭되거나 HTTP 응답이면 더 이상 probe 불필요."""
+    return data.startswith(b"HTTP/") or match_banner(_decode(data), service) is not None
+
+
+def _complete(data: bytes, service: str | None) -> bool:
+    """읽기 도중 멈춰도 되는지 (HTTP는 헤더 끝까지, 나머지는 시그니처 매칭 시)."""
+    if data.startswith(b"HTTP/"):
+        return b"\r\n\r\n" in data or match_banner(_decode(data), service) is not None
+    return match_banner(_decode(data), service) is not None
+
+
+def _ranked_probes(service: str | None, port: int, host: str, settings: Dict) -> List[Probe]:
+    """
+    보낼 probe 목록.
+    1) 포트 기반 서비스의 기본 probe (http는 http_probe.paths 순서대로)
+    2) ESCALATION_PROBES (이 포트가 ports에 있는 probe 먼저)
+       - probe_escalation(기본 켜짐): 기본 probe가 없는 서비스 (모르는 서비스 / 비표준 포트)
+       - send_payload: 기본 probe가 있는 서비스도 (응답이 식별되지 않으면 다음 probe)
+       단, TLS 후보 포트(https / TLS_PORTS)는 평문 probe를 보내지 않음 (TLS 단계에서 처리)
+    """
+    http = settings.get("http_probe") or {}
+    paths = (http.get("paths") or ["/"]) if http.get("enabled", True) else []
+
+    probes: List[Probe] = []
+    if service == "http":
+        probes.extend(("http", http_probe(path, host), True) for path in paths)
+    elif PROBES.get(service):
+        probes.append((service, PROBES[service], True))
+
+    escalate = settings.get("send_payload") or (settings.get("probe_escalation", True) and not probes)
+    if escalate and service != "https" and port not in TLS_PORTS:
+        ranked = sorted(ESCALATION_PROBES, key=lambda p: port not in p[2])
+        for name, payload, _ in ranked:
+            if name == service:
+                continue
+            if name == "http":
+                probes.extend(("http", http_probe(path, host), False) for path in paths[:1])
+            else:
+                probes.append((name, payload, False))
+
+    return probes[: max(1, int(settings.get("max_probes", 4)))]
+
+
+def _banner_plan(
+    service: str | None,
+    port: int,
+    host: str,
+    timeout: float,
+    settings: Dict,
+) -> Generator[tuple, object, bytes | None]:
+    """
+    배너 그랩 절차 (소켓 I/O는 sync / async 드라이버가 실행).
+    - ("read", 첫 응답 대기 시간) → (data, 연결 유지 여부)
+    - ("send", payload)          → 성공 여부
+    - ("reconnect",)             → 새 연결 성공 여부
+    1) greeting 서비스는 수동 배너를 기다리고, 모르는 서비스는 passive_wait만큼 짧게 기다림
+    2) probe를 순서대로 보내고 시그니처가 매칭되면 중단
+       (포트 기반 서비스의 기본 probe는 응답이 오면 바로 중단 → 알려진 서비스는 1 round trip)
+    3) 두 번째 probe부터는 새 연결 사용 (이전 probe로 서버가 연결을 끊었을 수 있음)
+    """
+    probes = _ranked_probes(service, port, host, settings)
+    has_own_probe = any(own for _, _, own in probes)
+    live = True
+    best = None
+
+    if service in PASSIVE_BANNER_SERVICES or not has_own_probe:
+        wait = timeout if service in PASSIVE_BANNER_SERVICES or not probes else min(timeout, settings["passive_wait"])
+        data, live = yield ("read", wait)
+        if data:
+            return data
+
+    for i, (_, payload, own) in enumerate(probes):
+        if i > 0 or not live:
+            if not (yield ("reconnect",)):
+                break
+        if not (yield ("send", payload)):
+            continue
+        data, _ = yield ("read", timeout)
+        if not data:
+            continue
+        best = best or data
+        if own or _identified(data, service):
+            return data
+
+    return best
+
+
+def _read_sync(sock: socket.socket, wait: float, idle: float, max_bytes: int, service: str | None) -> Tuple[bytes, bool]:
+    """idle 상태가 되거나 max_bytes에 도달할 때까지 읽기."""
+    buf = bytearray()
+    live = True
+    sock.settimeout(wait)
+    while len(buf) < max_bytes:
+        try:
+            chunk = sock.recv(max_bytes - len(buf))
+        except socket.timeout:
+            break
+        except OSError:
+            live = False
+            break
+        if not chunk:
+            live = False
+            break
+        buf += chunk
+        if _complete(bytes(buf), service):
+            break
+        sock.settimeout(idle)
+    return bytes(buf), live
+
+
+def _run_sync(
+    sock: socket.socket,
+    service: str | None,
+    timeout: float,
+    settings: Dict,
+    timing: TimingTable | None = None,
+    limiter: RateLimiter | None = None,
+) -> bytes | None:
+    peer = sock.getpeername()
+    plan = _banner_plan(service, peer[1], peer[0], timeout, settings)
+    idle = min(timeout, settings["read_idle"])
+    max_bytes = int(settings["max_bytes"])
+
+    current = sock
+    extra = None   # 재연결한 소켓 (원래 소켓 close는 호출자 책임)
     try:
-        sock = socket.socket()
-        sock.settimeout(timeout)
-        sock.connect((host, port))
+        action = next(plan)
+        while True:
+            if action[0] == "read":
+                result = _read_sync(current, action[1], idle, max_bytes, service)
+            elif action[0] == "send":
+                try:
+                    current.sendall(action[1])
+                    result = True
+                except OSError:
+                    result = False
+            else:
+                if extra is not None:
+                    extra.close()
+                    extra = None
+                # 재연결도 스캔 connect와 같은 rate limit / RTT timing을 거침
+                conn = tcp_connect(peer[0], peer[1], timeout, timing=timing, limiter=limiter)
+                if conn is not None:
+                    extra = current = conn
+                result = conn is not None
+            action = plan.send(result)
+    except StopIteration as stop:
+        return stop.value
+    finally:
+        if extra is not None:
+            extra.close()
 
-        probe = PROBES.get(service)
-        
-        if probe:
-            sock.sendall(probe)
 
-        data = sock.recv(4096)
-        sock.close()
-        return data.decode(errors="ignore")
+async def _read_async(sock: socket.socket, wait: float, idle: float, max_bytes: int, service: str | None) -> Tuple[bytes, bool]:
+    loop = asyncio.get_running_loop()
+    buf = bytearray()
+    live = True
+    while len(buf) < max_bytes:
+        try:
+            chunk = await asyncio.wait_for(loop.sock_recv(sock, max_bytes - len(buf)), wait)
+        except asyncio.TimeoutError:
+            break
+        except OSError:
+            live = False
+            break
+        if not chunk:
+            live = False
+            break
+        buf += chunk
+        if _complete(bytes(buf), service):
+            break
+        wait = idle
+    return bytes(buf), live
+
+
+async def _run_async(
+    sock: socket.socket,
+    service: str | None,
+    timeout: float,
+    settings: Dict,
+    timing: TimingTable | None = None,
+    limiter: RateLimiter | None = None,
+) -> bytes | None:
+    loop = asyncio.get_running_loop()
+    peer = sock.getpeername()
+    plan = _banner_plan(service, peer[1], peer[0], timeout, settings)
+    idle = min(timeout, settings["read_idle"])
+    max_bytes = int(settings["max_bytes"])
+
+    current = sock
+    extra = None
+    try:
+        action = next(plan)
+        while True:
+            if action[0] == "read":
+                result = await _read_async(current, action[1], idle, max_bytes, service)
+            elif action[0] == "send":
+                try:
+                    await loop.sock_sendall(current, action[1])
+                    result = True
+                except OSError:
+                    result = False
+            else:
+                if extra is not None:
+                    extra.close()
+                extra = current = socket.socket(sock.family, socket.SOCK_STREAM)
+                extra.setblocking(False)
+                result = await async_tcp_connect(extra, peer, timeout, timing, limiter)
+            action = plan.send(result)
+    except StopIteration as stop:
+        return stop.value
+    finally:
+        if extra is not None:
+            extra.close()
+
+
+def grab_banner_from_socket(
+    sock: socket.socket,
+    service: str,
+    timeout: float = 1.0,
+    timing: TimingTable | None = None,
+    limiter: RateLimiter | None = None,
+) -> str | None:
+    """
+    이미 연결된 소켓(포트 open 판정에 쓴 소켓)으로 배너를 읽는다.
+    절차는 _banner_plan 참고 (banner 설정: max_bytes, probe_escalation, send_payload, http_probe.paths ...)
+    소켓 close는 호출자 책임. 재연결(probe escalation)은 timing / limiter를 그대로 사용.
+    """
+    settings = banner_settings()
+    if not settings.get("enabled", True):
+        return None
+    transport = get_transport()
+    INFLIGHT.inc("banner")
+    start = transport.monotonic()
+    try:
+        data = _run_sync(sock, service, timeout, settings, timing, limiter)
+    except Exception:
+        observe_banner("error", transport.monotonic() - start)
+        return None
+    finally:
+        INFLIGHT.dec("banner")
+    observe_banner("banner" if data else "empty", transport.monotonic() - start)
+    return _decode(data) if data else None
+
 
+async def async_grab_banner_from_socket(
+    sock: socket.socket,
+    service: str,
+    timeout: float = 1.0,
+    timing: TimingTable | None = None,
+    limiter: RateLimiter | None = None,
+) -> str | None:
+    """grab_banner_from_socket의 asyncio 버전 (non-blocking 소켓 전용)."""
+    settings = banner_settings()
+    if not settings.get("enabled", True):
+        return None
+    INFLIGHT.inc("banner")
+    start = time.monotonic()
+    try:
+        data = await _run_async(sock, service, timeout, settings, timing, limiter)
     except Exception:
+        observe_banner("error", time.monotonic() - start)
+        return None
+    finally:
+        INFLIGHT.dec("banner")
+    observe_banner("banner" if data else "empty", time.monotonic() - start)
+    return _decode(data) if data else None
+
+
+def grab_banner(host: str, port: int, service: str, timeout: float = 1.0) -> str | None:
+    """새 연결을 열어 배너 그랩 (스캔 경로에서는 grab_banner_from_socket 사용)."""
+    try:
+        sock = get_transport().create_connection((host, port), timeout=timeout)
+    except OSError:
         return None
+
+    try:
+        return grab_banner_from_socket(sock, service, timeout)
+    finally:
+        sock.close()
@@ -0,0 +1,123 @@
+# scanner/checkpoint.py
+from __future__ import annotations
+
+import base64
+import json
+import os
+import time
+import zlib
+from typing import TYPE_CHECKING, Dict
+
+from .result_store import HostResults, PortLayout
+
+if TYPE_CHECKING:
+    from .scan_runner import ScanRun
+
+CHECKPOINT_DIR = "logs/checkpoints"
+
+
+def checkpoint_path(scan_id: str, directory: str = CHECKPOINT_DIR) -> str:
+    return os.path.join(directory, f"{scan_id}.json")
+
+
+def _encode_states(states: bytearray) -> str:
+    return base64.b64encode(zlib.compress(bytes(states))).decode("ascii")
+
+
+def _decode_states(data: str) -> bytes:
+    return zlib.decompress(base64.b64decode(data))
+
+
+def dump_result(result: Dict, layout: PortLayout) -> Dict:
+    """스캔 결과 dict를 JSON 가능한 compact 형식으로 (체크포인트 / shard 출력 공용)."""
+    targets = []
+    for entry in result["targets"]:
+        t = {k: v for k, v in entry.items() if k != "results"}
+        results = entry["results"]
+        if isinstance(results, HostResults):
+            t["states"] = _encode_states(results.states)
+            t["records"] = [r.to_dict() for r in results.records.values()]
+        targets.append(t)
+
+    data = {k: v for k, v in result.items() if k != "targets"}
+    data["layout"] = {"tcp": layout.tcp, "udp": layout.udp}
+    data["saved_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    data["targets"] = targets
+    return data
+
+
+def dump_run(run: "ScanRun") -> Dict:
+    data = dump_result(run.result(), run.layout)
+    data["finished_at"] = run.finished_at
+    if run.seen is not None:
+        # flush_hosts: 정리된 호스트 표시 (재개 시 다시 스캔하지 않음)
+        data["seen"] = {"bits": _encode_states(run.seen.bits), "addrs": sorted(run.seen.addrs)}
+    return data
+
+
+def decode_scan_data(data: Dict) -> Dict:
+    """dump_result 형식 → 포트 상태를 bytes로 복원."""
+    for t in data["targets"]:
+        if "states" in t:
+            t["states"] = _decode_states(t["states"])
+    if "seen" in data:
+        data["seen"]["bits"] = _decode_states(data["seen"]["bits"])
+    return data
+
+
+def write_scan_file(path: str, data: Dict) -> None:
+    """임시 파일에 쓴 뒤 os.replace (중간에 죽어도 이전 파일 유지)."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def load_scan_file(path: str) -> Dict:
+    """dump_run 형식 파일 로드. 포트 상태는 bytes로 복원해서 반환."""
+    with open(path, "r", encoding="utf-8") as f:
+        return decode_scan_data(json.load(f))
+
+
+class ScanCheckpoint:
+    """
+    scan_id별 진행 상황 파일 (logs/checkpoints/<scan_id>.json).
+    - options  : 스캔을 다시 시작할 때 쓸 실행 옵션 (CLI 인자 등, JSON 가능한 값만)
+    - 호스트별 포트 상태 배열(zlib + base64)과 open 포트 레코드를 저장
+      → 재개 시 상태가 기록된 포트는 다시 스캔하지 않음
+    - flush_hosts로 정리된 호스트는 seen 비트맵(zlib + base64)으로 저장 → 재개 시 건너뜀
+    - scan_db_id: 스트리밍 저장 중인 DB scans 행 id (재개 시 새 행 대신 같은 행을 갱신)
+    """
+
+    def __init__(self, scan_id: str, options: Dict, interval: float = 30.0, directory: str = CHECKPOINT_DIR):
+        self.scan_id = scan_id
+        self.options = options
+        self.interval = interval
+        self.path = checkpoint_path(scan_id, directory)
+        self.scan_db_id: int | None = None
+        self._last_save = time.monotonic()
+
+    def maybe_save(self, run: "ScanRun") -> None:
+        if time.monotonic() - self._last_save >= self.interval:
+            self.save(run)
+
+    def save(self, run: "ScanRun") -> None:
+        data = dump_run(run)
+        data["options"] = self.options
+        if self.scan_db_id is not None:
+            data["scan_db_id"] = self.scan_db_id
+        write_scan_file(self.path, data)
+        self._last_save = time.monotonic()
+
+    def remove(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def load_checkpoint(scan_id: str, directory: str = CHECKPOINT_DIR) -> Dict:
+    return load_scan_file(checkpoint_path(scan_id, directory))
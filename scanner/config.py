@@ -0,0 +1,77 @@
+# scanner/config.py
+from __future__ import annotations
+
+import copy
+from pathlib import Path
+from typing import Any, Dict
+
+import yaml
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+SCANNER_CONFIG_PATH = BASE_DIR / "config" / "scanner_config.yaml"
+
+# 설정 파일에 키가 없을 때 사용할 기본값
+DEFAULT_SCANNER_CONFIG: Dict[str, Any] = {
+    "network": {
+        "connect_timeout": 1.0,
+        "adaptive_timeout": True,
+        "min_rtt_timeout": 0.1,
+        "read_timeout": 1.0,
+        "max_retries": 1,
+        "max_workers": 200,
+        "rate_limit_per_second": 0,
+        "rate_limit_per_host": 0,
+        "rate_limit_burst": 0,
+    },
+    "banner": {
+        "enabled": True,
+        "max_bytes": 1024,
+        "probe_escalation": True,
+        "send_payload": False,
+        "passive_wait": 0.5,
+        "read_idle": 0.2,
+        "max_probes": 4,
+        "http_probe": {
+            "enabled": True,
+            "paths": ["/", "/index.html"],
+        },
+    },
+    "tls": {
+        "enabled": False,
+        "timeout": 3.0,
+        "max_concurrency": 50,
+    },
+    "dns": {
+        "max_concurrency": 32,
+        "timeout": 10.0,
+        "cache_path": "logs/dns_cache.json",
+        "forward_cache_path": "logs/dns_forward_cache.json",
+        "cache_ttl": 86400,
+        "negative_ttl": 3600,
+    },
+    "incremental": {
+        "top_ports": 100,
+        "full_sweep_hours": 24,
+    },
+}
+
+
+def _merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _merge(base[key], value)
+        else:
+            base[key] = value
+    return base
+
+
+def load_scanner_config(path: str | Path | None = None) -> Dict[str, Any]:
+    """config/scanner_config.yaml 로드 (없는 키는 기본값으로 채움)."""
+    config = copy.deepcopy(DEFAULT_SCANNER_CONFIG)
+    path = Path(path) if path else SCANNER_CONFIG_PATH
+    if not path.exists():
+        return config
+
+    with open(path, "r", encoding="utf-8") as f:
+        loaded = yaml.safe_load(f) or {}
+    return _merge(config, loaded)
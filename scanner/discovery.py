@@ -0,0 +1,186 @@
+# scanner/discovery.py
+from __future__ import annotations
+
+import os
+import socket
+import struct
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .rate_limit import RateLimiter
+from .scheduler import ScanScheduler, ScanTask
+from .timing import TimingTable
+from .utils import tcp_ping
+
+# 생존 확인용 기본 포트 (nmap 기본 host discovery와 유사)
+DEFAULT_DISCOVERY_PORTS = [80, 443, 22, 445, 3389]
+
+
+@dataclass
+class HostDiscoveryResult:
+    ip: str
+    alive: bool
+    method: str | None = None   # 생존 판정 근거: "tcp/80 open", "tcp/22 refused", "icmp echo"
+    rtt: float | None = None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+# =====================================================
+# ICMP echo
+#   - Linux 비특권 ping 소켓(SOCK_DGRAM/IPPROTO_ICMP) → 안 되면 RAW 소켓
+#   - 둘 다 권한이 없으면 PermissionError
+# =====================================================
+
+def _icmp_checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _open_icmp_socket() -> Tuple[socket.socket, bool]:
+    """(소켓, raw 여부) 반환."""
+    try:
+        return socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP), False
+    except OSError:
+        pass
+    try:
+        return socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP), True
+    except OSError as e:
+        raise PermissionError("ICMP echo requires a ping socket or raw socket privilege") from e
+
+
+def icmp_echo(
+    host: str,
+    timeout: float = 1.0,
+    limiter: RateLimiter | None = None,
+) -> float | None:
+    """ICMP echo request 1회. 응답이 오면 RTT, 없으면 None. (IPv4 전용)"""
+    sock, raw = _open_icmp_socket()
+    try:
+        ident = os.getpid() & 0xFFFF
+        seq = int(time.monotonic() * 1000) & 0xFFFF
+        header = struct.pack("!BBHHH", 8, 0, 0, ident, seq)
+        payload = b"portscan-discovery"
+        packet = struct.pack("!BBHHH", 8, 0, _icmp_checksum(header + payload), ident, seq) + payload
+
+        if limiter is not None:
+            limiter.acquire(host)
+
+        start = time.monotonic()
+        deadline = start + timeout
+        sock.sendto(packet, (host, 0))
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            sock.settimeout(remaining)
+            try:
+                data, addr = sock.recvfrom(1024)
+            except socket.timeout:
+                return None
+
+            if addr[0] != host:
+                continue
+            if raw:
+                data = data[(data[0] & 0x0F) * 4:]   # IP 헤더 제거
+            # type 0 = echo reply (ping 소켓은 ident를 커널이 바꾸므로 raw일 때만 비교)
+            if len(data) >= 8 and data[0] == 0:
+                if raw and struct.unpack("!H", data[4:6])[0] != ident:
+                    continue
+                return time.monotonic() - start
+    finally:
+        sock.close()
+
+
+def icmp_available() -> bool:
+    try:
+        sock, _ = _open_icmp_socket()
+    except PermissionError:
+        return False
+    sock.close()
+    return True
+
+
+# =====================================================
+# Host discovery
+# =====================================================
+
+def _discovery_tasks(hosts: Iterable[str], ports: List[int], icmp: bool) -> Iterable[ScanTask]:
+    for host in hosts:
+        if icmp and ":" not in host:
+            yield (host, 0, "icmp")
+        for port in ports:
+            yield (host, port, "tcp")
+
+
+def discover_hosts(
+    hosts: Iterable[str],
+    ports: Iterable[int] | None = None,
+    timeout: float = 1.0,
+    icmp: bool = False,
+    max_workers: int = 100,
+    timing: TimingTable | None = None,
+    limiter: RateLimiter | None = None,
+) -> Iterator[HostDiscoveryResult]:
+    """
+    포트 스캔 전에 살아있는 호스트만 골라낸다.
+    - 소수의 포트에 TCP connect: open/refused 모두 alive
+    - icmp=True이고 권한이 있으면 ICMP echo도 병행
+    - 호스트별 판정이 끝나는 대로 yield (alive는 첫 응답 즉시, dead는 모든 probe 실패 후)
+    - alive로 판정된 호스트의 남은 probe는 보내지 않음 (전송 / rate limit 토큰 / timeout 대기 없이 건너뜀)
+    """
+    port_list = list(ports) if ports is not None else list(DEFAULT_DISCOVERY_PORTS)
+    if icmp and not icmp_available():
+        icmp = False
+
+    decided: set[str] = set()   # alive로 판정된 호스트 (남은 작업이 끝날 때까지)
+
+    def probe_tcp(host: str, port: int) -> Tuple[str | None, float | None]:
+        if host in decided:
+            return None, None
+        outcome, rtt = tcp_ping(host, port, timeout, timing=timing, limiter=limiter)
+        if outcome in ("open", "refused"):
+            return f"tcp/{port} {outcome}", rtt
+        return None, None
+
+    def probe_icmp(host: str, port: int) -> Tuple[str | None, float | None]:
+        if host in decided:
+            return None, None
+        rtt = icmp_echo(host, timing.timeout(host) if timing else timeout, limiter)
+        if rtt is None:
+            return None, None
+        if timing is not None:
+            timing.observe(host, rtt)
+        return "icmp echo", rtt
+
+    scheduler = ScanScheduler(
+        {"tcp": probe_tcp, "icmp": probe_icmp},
+        max_workers=max_workers,
+        backend="thread",
+    )
+
+    # 건너뛴 probe도 결과(None)로 돌아오므로 호스트별 남은 작업 수 계산은 그대로
+    remaining: Dict[str, int] = {}
+
+    for host, (method, rtt) in scheduler.run(_discovery_tasks(hosts, port_list, icmp)):
+        if host not in remaining:
+            remaining[host] = len(port_list) + (1 if icmp and ":" not in host else 0)
+        remaining[host] -= 1
+
+        if method is not None and host not in decided:
+            decided.add(host)
+            yield HostDiscoveryResult(ip=host, alive=True, method=method, rtt=rtt)
+
+        if remaining[host] <= 0:
+            del remaining[host]
+            if host in decided:
+                decided.discard(host)
+            else:
+                yield HostDiscoveryResult(ip=host, alive=False)
@@ -0,0 +1,162 @@
+# scanner/incremental.py
+from __future__ import annotations
+
+from dataclasses import dataclass, asdict, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .result_store import HostResults, STATE_CODES
+from .service_fingerprints import top_ports
+from .targets import TargetSpace
+
+# 호스트별 이전 open 포트: ip → {(protocol, port): ports 테이블 행}
+KnownPorts = Dict[str, Dict[Tuple[str, int], Dict]]
+
+
+@dataclass
+class IncrementalPlan:
+    """
+    증분 스캔 계획 (호스트별).
+    - quick: 그 호스트의 이전 open 포트 재확인 + 프로토콜별 상위 N개 포트
+    - full: 위 + 지정한 전체 포트 범위 (full_sweep_hours 주기로만)
+    ports는 모든 호스트 계획의 합집합 (PortLayout용), 실제 작업은 wants()로 호스트별로 거름.
+    """
+    mode: str                 # "quick" / "full"
+    ports: List[int]
+    known_hosts: int          # DB에 open 포트가 있던 타겟 호스트 수
+    known_ports: int          # 재확인하는 (host, port, proto) 수
+    last_full_sweep: str | None = None
+    common: Dict[str, List[int]] = field(default_factory=dict)   # 프로토콜별 모든 호스트에 스캔하는 포트
+    known: KnownPorts = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        self._common: Dict[str, Set[int]] = {proto: set(ports) for proto, ports in self.common.items()}
+
+    def wants(self, task: Tuple[str, int, str]) -> bool:
+        """iter_scan(task_filter=...)용: 공통 포트이거나 그 호스트의 이전 open 포트면 스캔."""
+        host, port, proto = task
+        return port in self._common.get(proto, ()) or (proto, port) in self.known.get(host, ())
+
+    def to_dict(self) -> Dict:
+        d = asdict(self)
+        del d["known"]
+        return d
+
+
+@dataclass
+class PortChange:
+    ip: str
+    port: int
+    protocol: str
+    change: str                       # "new_open" / "closed" / "version_changed"
+    service: str | None = None
+    version: str | None = None
+    previous_version: str | None = None
+    previous_scan_id: str | None = None   # 비교 기준 (ports.last_scan_id)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def known_ports_by_host(rows: Iterable[Dict], targets: TargetSpace | None = None) -> KnownPorts:
+    """ports 테이블의 open 행 → 호스트별 dict (targets를 주면 타겟 공간 안의 호스트만)."""
+    known: KnownPorts = {}
+    for row in rows:
+        ip = row["host_ip"]
+        if targets is not None and ip not in targets:
+            continue
+        known.setdefault(ip, {})[(row["protocol"], row["port"])] = row
+    return known
+
+
+def full_sweep_due(last_full: datetime | None, interval_hours: float, now: datetime | None = None) -> bool:
+    if last_full is None:
+        return True
+    return (now or datetime.now()) - last_full >= timedelta(hours=interval_hours)
+
+
+def plan_incremental(
+    known: KnownPorts,
+    full_range: Iterable[int],
+    top_n: int = 100,
+    full_sweep: bool = False,
+    last_full_sweep: datetime | None = None,
+    protocols: Iterable[str] = ("tcp",),
+) -> IncrementalPlan:
+    """
+    호스트별 스캔 포트 결정: 프로토콜별 상위 N개 (+ full이면 전체 범위) + 그 호스트의 이전 open 포트.
+    이전 open 포트는 범위 밖이어도 포함 → 닫힘 여부를 확인할 수 있음.
+    다른 호스트의 open 포트는 스캔하지 않음 (호스트마다 전체 합집합을 스캔하지 않도록).
+    """
+    protocols = list(protocols)
+    full_range = list(full_range) if full_sweep else []
+    common = {proto: sorted(set(top_ports(top_n, proto)).union(full_range)) for proto in protocols}
+
+    # 이번 스캔 프로토콜의 이전 open 포트만 재확인 대상
+    known = {
+        ip: {key: row for key, row in host_ports.items() if key[0] in common}
+        for ip, host_ports in known.items()
+    }
+    known = {ip: host_ports for ip, host_ports in known.items() if host_ports}
+
+    ports = {port for proto_ports in common.values() for port in proto_ports}
+    ports.update(port for host_ports in known.values() for _, port in host_ports)
+
+    return IncrementalPlan(
+        mode="full" if full_sweep else "quick",
+        ports=sorted(ports),
+        known_hosts=len(known),
+        known_ports=sum(len(v) for v in known.values()),
+        last_full_sweep=last_full_sweep.strftime("%Y-%m-%d %H:%M:%S") if last_full_sweep else None,
+        common=common,
+        known=known,
+    )
+
+
+def diff_results(scan_result: Dict, known: KnownPorts) -> List[PortChange]:
+    """
+    이번 스캔 결과와 ports 테이블(이전 스캔)의 차이.
+    - new_open: 이전에 open이 아니던 포트가 open
+    - closed: 이전에 open이던 포트가 이번에 closed / filtered (스캔한 포트만)
+      UDP open|filtered는 응답이 없었다는 뜻일 뿐이므로 변경 없음으로 봄
+    - version_changed: 둘 다 open인데 버전 문자열이 다름 (어느 한쪽이라도 없으면 비교 안 함)
+    down 호스트는 포트를 보지 않았으므로 비교하지 않음.
+    """
+    changes: List[PortChange] = []
+    unchanged = {STATE_CODES["open"], STATE_CODES["open|filtered"]}
+
+    for entry in scan_result["targets"]:
+        results = entry.get("results")
+        if not isinstance(results, HostResults) or entry.get("status") == "down":
+            continue
+        ip = entry["ip"]
+        previous = known.get(ip, {})
+
+        for r in results.dicts(("open",)):
+            old = previous.get((r["protocol"], r["port"]))
+            if old is None:
+                changes.append(PortChange(
+                    ip, r["port"], r["protocol"], "new_open",
+                    service=r["service"], version=r["version"],
+                ))
+            elif old.get("version") and r["version"] and old["version"] != r["version"]:
+                changes.append(PortChange(
+                    ip, r["port"], r["protocol"], "version_changed",
+                    service=r["service"], version=r["version"],
+                    previous_version=old["version"], previous_scan_id=old.get("last_scan_id"),
+                ))
+
+        for (protocol, port), old in previous.items():
+            try:
+                code = results.states[results.layout.slot(protocol, port)]
+            except KeyError:
+                continue   # 이번 스캔에 없는 프로토콜
+            if code and code not in unchanged:
+                changes.append(PortChange(
+                    ip, port, protocol, "closed",
+                    service=old.get("service"),
+                    previous_version=old.get("version"), previous_scan_id=old.get("last_scan_id"),
+                ))
+
+    changes.sort(key=lambda c: (c.ip, c.protocol, c.port))
+    return changes
@@ -0,0 +1,277 @@
+# scanner/metrics.py
+"""
+스캐너 hot path 지표 (counter / gauge / histogram).
+- 프로세스 전역 REGISTRY, 라벨 값 tuple별 시계열
+- 내보내기: to_prometheus() (Prometheus text format 0.0.4) / snapshot() (JSON용 dict)
+- 기본값은 꺼짐: set_enabled(True)로 켜야 기록 (run_scan --metrics)
+  꺼져 있으면 기록 함수가 바로 반환 (켜도 기록 1회 = lock 1번 + dict 갱신 → connect 비용 대비 무시 가능)
+"""
+from __future__ import annotations
+
+import json
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+_enabled = False
+
+# 초 단위 latency 버킷 (loopback 수십 µs ~ WAN timeout 수 초)
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def set_enabled(enabled: bool) -> None:
+    global _enabled
+    _enabled = enabled
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def _label_str(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *labels: str, value: float = 1) -> None:
+        if not _enabled:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + value
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> List[Dict]:
+        with self._lock:
+            items = list(self._values.items())
+        return [{"labels": dict(zip(self.labelnames, k)), "value": v} for k, v in sorted(items)]
+
+    def prometheus(self) -> List[str]:
+        lines = self._header()
+        for s in self.samples():
+            lines.append(f"{self.name}{_label_str(self.labelnames, s['labels'].values())} {_fmt(s['value'])}")
+        return lines
+
+
+class Gauge(Counter):
+    """현재 값 (in-flight 작업 수 등). inc / dec / set."""
+    kind = "gauge"
+
+    def dec(self, *labels: str, value: float = 1) -> None:
+        self.inc(*labels, value=-value)
+
+    def set(self, *labels: str, value: float) -> None:
+        if not _enabled:
+            return
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    """
+    누적 버킷 histogram (Prometheus 방식).
+    snapshot에는 버킷 기준 p50 / p99 추정값도 포함 (버킷 상한값 기준).
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 → [버킷별 count..., +Inf count, sum]
+        self._values: Dict[Tuple, List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        if not _enabled:
+            return
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            row[idx] += 1
+            row[-1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def _quantile(self, counts: List[float], total: float, q: float) -> float | None:
+        if not total:
+            return None
+        rank = q * total
+        running = 0
+        for bound, c in zip(self.buckets + (math.inf,), counts):
+            running += c
+            if running >= rank:
+                return bound if bound != math.inf else self.buckets[-1]
+        return self.buckets[-1]
+
+    def samples(self) -> List[Dict]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        out = []
+        for key, row in sorted(items):
+            counts, total_sum = row[:-1], row[-1]
+            count = sum(counts)
+            cumulative, running = [], 0
+            for bound, c in zip(self.buckets + (math.inf,), counts):
+                running += c
+                cumulative.append([bound if bound != math.inf else "+Inf", running])
+            out.append({
+                "labels": dict(zip(self.labelnames, key)),
+                "count": count,
+                "sum": total_sum,
+                "p50": self._quantile(counts, count, 0.50),
+                "p99": self._quantile(counts, count, 0.99),
+                "buckets": cumulative,
+            })
+        return out
+
+    def prometheus(self) -> List[str]:
+        lines = self._header()
+        for s in self.samples():
+            values = s["labels"].values()
+            for bound, c in s["buckets"]:
+                le = 'le="%s"' % ("+Inf" if bound == "+Inf" else _fmt(float(bound)))
+                lines.append(f"{self.name}_bucket{_label_str(self.labelnames, values, le)} {c}")
+            lines.append(f"{self.name}_sum{_label_str(self.labelnames, values)} {_fmt(s['sum'])}")
+            lines.append(f"{self.name}_count{_label_str(self.labelnames, values)} {s['count']}")
+        return lines
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def reset(self) -> None:
+        for m in self._metrics.values():
+            m.reset()
+
+    def snapshot(self) -> Dict:
+        return {
+            "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "metrics": {
+                name: {"type": m.kind, "help": m.help, "samples": m.samples()}
+                for name, m in self._metrics.items()
+            },
+        }
+
+    def to_prometheus(self) -> str:
+        lines: List[str] = []
+        for m in self._metrics.values():
+            lines.extend(m.prometheus())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# ---- 스캐너 지표 ----
+CONNECT_SECONDS = REGISTRY.histogram(
+    "scanner_connect_seconds", "TCP connect / UDP probe latency", ("protocol", "outcome"),
+)
+CONNECT_TOTAL = REGISTRY.counter(
+    "scanner_connect_total", "TCP connects / UDP probes by outcome (open, refused, timeout, error)",
+    ("protocol", "outcome"),
+)
+BANNER_SECONDS = REGISTRY.histogram("scanner_banner_seconds", "Banner grab duration", ("outcome",))
+BANNER_TOTAL = REGISTRY.counter("scanner_banner_total", "Banner grabs by outcome (banner, empty, error)", ("outcome",))
+INFLIGHT = REGISTRY.gauge("scanner_inflight", "Operations currently in flight", ("op",))
+STAGE_SECONDS = REGISTRY.counter("scanner_stage_seconds_total", "Wall time spent per scan stage", ("stage",))
+DB_WRITE_SECONDS = REGISTRY.histogram("scanner_db_write_seconds", "DB write + commit duration", ("op",))
+
+
+def observe_connect(protocol: str, outcome: str, seconds: float) -> None:
+    CONNECT_TOTAL.inc(protocol, outcome)
+    CONNECT_SECONDS.observe(seconds, protocol, outcome)
+
+
+def observe_banner(outcome: str, seconds: float) -> None:
+    BANNER_TOTAL.inc(outcome)
+    BANNER_SECONDS.observe(seconds, outcome)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """with stage("tls"): ... 구간의 wall time을 scanner_stage_seconds_total{stage=name}에 누적."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.inc(name, value=time.perf_counter() - start)
+
+
+def write_metrics(path: str, fmt: str | None = None) -> str:
+    """
+    현재 지표를 파일로 저장. fmt 미지정 시 확장자로 결정 (.prom / .txt → Prometheus, 그 외 JSON).
+    반환: 사용한 형식 ("prometheus" / "json")
+    """
+    if fmt is None:
+        fmt = "prometheus" if path.endswith((".prom", ".txt")) else "json"
+    with open(path, "w", encoding="utf-8") as f:
+        if fmt == "prometheus":
+            f.write(REGISTRY.to_prometheus())
+        else:
+            json.dump(REGISTRY.snapshot(), f, ensure_ascii=False, indent=2)
+    return fmt
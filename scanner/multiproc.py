@@ -0,0 +1,130 @@
+# scanner/multiproc.py
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+from .checkpoint import decode_scan_data, dump_run
+from .discovery import discover_hosts, DEFAULT_DISCOVERY_PORTS
+from .scan_runner import KST, build_limiter, build_timing, generate_scan_id, iter_scan
+from .sharding import Shard, merge_shard_results
+from .targets import TargetSpace
+from .utils import parse_ports
+
+
+def _scan_worker(targets: TargetSpace, ports, shard: Shard, options: Dict) -> Dict:
+    """워커 프로세스: 자기 shard만 스캔하고 compact 형식(상태 배열 + open 포트)으로 반환."""
+    run = iter_scan(targets, ports, shard=shard, **options)
+    for _ in run:
+        pass
+    return dump_run(run)
+
+
+def worker_shards(processes: int, shard: Shard | None = None) -> List[Shard]:
+    """
+    워커별 shard 목록.
+    shard (i, N)가 주어지면 그 1/N을 다시 P개로 나눔: (i + N·j, N·P), j = 0..P-1
+    → key mod N·P ≡ i-1 + N·j 이면 key mod N ≡ i-1 이므로 노드 단위 shard와 호환
+    """
+    index, count = shard or (1, 1)
+    return [(index + count * j, count * processes) for j in range(processes)]
+
+
+def run_scan_multiprocess(
+    targets: Iterable[str],
+    ports: Iterable[int] | str = "20-1024",
+    processes: int | None = None,
+    shard: Shard | None = None,
+    **options,
+) -> Dict:
+    """
+    프로세스 N개로 나눠 스캔 (GIL 한계를 넘어 코어 수만큼 처리량 확보).
+    - 각 워커는 자기 shard의 (host, port, proto)만 자체 스캔 엔진(thread / async)으로 처리
+    - 결과는 호스트별 상태 배열(zlib) + open 포트 레코드만 pipe로 전달 → 부모에서 병합
+    - 타겟은 TargetSpace(구간 목록)로 워커에 전달 → 주소를 펼치지 않음
+    - host discovery는 부모에서 한 번만 실행 (단일 프로세스와 같은 rate limit / RTT timing)
+      살아있는 호스트만 워커에 전달하고 down 호스트는 flushed["down"] 카운터로만 남김
+    - 포트 스캔 전송 속도 제한은 워커 수로 나눠서 적용
+    반환 형식은 ScanRun.result()와 같음 (호스트별 results = HostResults).
+    """
+    processes = max(1, processes or os.cpu_count() or 1)
+    started_at = datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S")
+    space = targets if isinstance(targets, TargetSpace) else TargetSpace(targets)
+
+    # discovery는 부모 혼자 실행하므로 나누기 전 속도 제한 그대로
+    timeout = options.get("timeout", 1.0)
+    timing = build_timing(timeout, options.get("adaptive_timeout", False), options.get("min_timeout", 0.1))
+    limiter = build_limiter(
+        options.get("rate_limit", 0), options.get("host_rate_limit", 0), options.get("rate_burst")
+    )
+
+    for key in ("rate_limit", "host_rate_limit"):
+        if options.get(key):
+            options[key] = options[key] / processes
+    if options.get("rate_burst"):
+        options["rate_burst"] = max(1.0, options["rate_burst"] / processes)
+
+    # Host discovery (부모에서 1회)
+    discovered: Dict[str, Dict] = {}
+    discovery_info = None
+    if options.pop("discovery", False):
+        d_ports = options.pop("discovery_ports", None)
+        d_ports = parse_ports(d_ports) if d_ports else list(DEFAULT_DISCOVERY_PORTS)
+        icmp = options.pop("discovery_icmp", False)
+
+        hosts_down = 0
+        for d in discover_hosts(
+            iter(space),
+            d_ports,
+            timeout=timeout,
+            icmp=icmp,
+            max_workers=options.get("max_workers", 100),
+            timing=timing,
+            limiter=limiter,
+        ):
+            if d.alive:
+                discovered[d.ip] = d.to_dict()
+            else:
+                hosts_down += 1
+
+        discovery_info = {
+            "ports": d_ports,
+            "icmp": icmp,
+            "hosts_up": len(discovered),
+            "hosts_down": hosts_down,
+        }
+        space = TargetSpace(space.invalid + list(discovered))
+    else:
+        options.pop("discovery_ports", None)
+        options.pop("discovery_icmp", None)
+
+    shards = worker_shards(processes, shard)
+    if processes == 1:
+        dumps = [_scan_worker(space, ports, shards[0], options)]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [pool.submit(_scan_worker, space, ports, s, options) for s in shards]
+            dumps = [f.result() for f in futures]
+
+    result = merge_shard_results(
+        (decode_scan_data(d) for d in dumps),
+        scan_id=generate_scan_id(),
+    )
+    result.pop("shards", None)
+    result["started_at"] = started_at
+    result["processes"] = processes
+    if shard is not None:
+        result["shard"] = list(shard)
+
+    if discovery_info is not None:
+        # 워커는 살아있는 호스트만 스캔함 → down 호스트는 entry 없이 개수만 (flush_hosts와 같은 형식)
+        for t in result["targets"]:
+            if t["ip"] in discovered:
+                t["status"] = "up"
+                t["discovery"] = discovered[t["ip"]]
+        result["discovery"] = discovery_info
+        result["flushed"] = {"up": 0, "down": discovery_info["hosts_down"]}
+
+    return result
@@ -1,4 +1,5 @@
 # scanner/probes.py
+from __future__ import annotations
 
 PROBES = {
     "ftp": b"\r\n",
@@ -6,3 +7,36 @@ PROBES = {
     "telnet": b"\r\n",
     "http": b"GET / HTTP/1.0\r\n\r\n",
 }
+
+# 접속 직후 서버가 먼저 greeting을 보내는 서비스
+# → probe 전송 전에 수동(passive) 배너부터 읽는다
+PASSIVE_BANNER_SERVICES = {
+    "ftp",
+    "ssh",
+    "telnet",
+    "smtp",
+    "pop3",
+    "imap",
+    "mysql",
+}
+
+# 서비스를 모를 때(비표준 포트 등) 차례로 시도하는 probe 목록
+# (이름, payload, 이 probe가 먼저 나올 포트)
+# - 포트가 ports에 있으면 그 probe를 앞으로 당기고 나머지는 목록 순서대로
+# - "http"는 banner.http_probe.paths 설정으로 payload를 만들어 씀
+ESCALATION_PROBES = [
+    ("http", None, {80, 81, 591, 3000, 5000, 8000, 8008, 8080, 8081, 8088, 8443, 8888, 9000, 9090, 9200}),
+    ("generic-lines", b"\r\n\r\n", {21, 23, 25, 110, 143, 2121, 2323, 587}),
+    ("redis", b"INFO server\r\n", {6379, 6380}),
+    ("memcached", b"version\r\n", {11211}),
+    ("rtsp", b"OPTIONS / RTSP/1.0\r\nCSeq: 1\r\n\r\n", {554, 8554}),
+    ("help", b"HELP\r\n", set()),
+]
+
+
+def http_probe(path: str = "/", host: str | None = None) -> bytes:
+    """HTTP GET probe (Host 헤더가 없으면 가상 호스트 서버가 400을 주는 경우가 많음)."""
+    lines = [f"GET {path} HTTP/1.0"]
+    if host:
+        lines.append(f"Host: {host}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode()
@@ -0,0 +1,101 @@
+# scanner/rate_limit.py
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Dict
+
+from .transport import get_transport
+
+
+class TokenBucket:
+    """
+    토큰 버킷.
+    - rate  : 초당 토큰 충전량 (= 초당 허용 패킷 수)
+    - burst : 버킷 크기 (순간 최대 연속 전송 수)
+    토큰이 모자라면 음수(빚)로 예약하고, 예약 시점까지 기다릴 시간을 돌려준다.
+    → 대기 중인 호출자끼리도 순서대로 간격이 벌어짐
+    """
+
+    __slots__ = ("rate", "burst", "tokens", "last", "_lock")
+
+    def __init__(self, rate: float, burst: float | None = None):
+        self.rate = float(rate)
+        self.burst = float(burst) if burst else max(1.0, self.rate)
+        self.tokens = self.burst
+        self.last = get_transport().monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """토큰 1개 예약. 전송 전까지 기다려야 할 시간(초) 반환."""
+        with self._lock:
+            now = get_transport().monotonic()
+            # 가상 시간(simnet)에서는 스레드마다 시계가 달라 now < last일 수 있음
+            self.tokens = min(self.burst, self.tokens + max(0.0, now - self.last) * self.rate)
+            self.last = max(self.last, now)
+            self.tokens -= 1.0
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def idle(self) -> bool:
+        """버킷이 가득 찬 상태(최근 사용 없음)인지."""
+        return self.tokens + (get_transport().monotonic() - self.last) * self.rate >= self.burst
+
+
+class RateLimiter:
+    """
+    TCP/UDP 스캐너 공용 전송 속도 제한기 (전역 + 타겟 호스트별).
+    - rate / per_host_rate 가 0이면 해당 제한 없음
+    - 둘 다 0이면 enabled=False → 호출부에서 limiter 자체를 만들지 않는 것을 권장
+    """
+
+    # 호스트별 버킷이 이 수를 넘으면 idle 버킷 정리
+    _PRUNE_THRESHOLD = 4096
+
+    def __init__(
+        self,
+        rate: float = 0,
+        per_host_rate: float = 0,
+        burst: float | None = None,
+        per_host_burst: float | None = None,
+    ):
+        self._global = TokenBucket(rate, burst) if rate > 0 else None
+        self._per_host_rate = per_host_rate
+        self._per_host_burst = per_host_burst
+        self._hosts: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._global is not None or self._per_host_rate > 0
+
+    def _host_bucket(self, host: str) -> TokenBucket:
+        bucket = self._hosts.get(host)
+        if bucket is None:
+            with self._lock:
+                bucket = self._hosts.get(host)
+                if bucket is None:
+                    if len(self._hosts) >= self._PRUNE_THRESHOLD:
+                        self._hosts = {h: b for h, b in self._hosts.items() if not b.idle()}
+                    bucket = self._hosts[host] = TokenBucket(self._per_host_rate, self._per_host_burst)
+        return bucket
+
+    def reserve(self, host: str) -> float:
+        wait = 0.0
+        if self._global is not None:
+            wait = self._global.reserve()
+        if self._per_host_rate > 0:
+            wait = max(wait, self._host_bucket(host).reserve())
+        return wait
+
+    def acquire(self, host: str) -> None:
+        """전송 1회 허가를 받을 때까지 blocking 대기."""
+        wait = self.reserve(host)
+        if wait > 0:
+            get_transport().sleep(wait)
+
+    async def acquire_async(self, host: str) -> None:
+        wait = self.reserve(host)
+        if wait > 0:
+            await asyncio.sleep(wait)
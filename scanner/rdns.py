@@ -0,0 +1,165 @@
+# scanner/rdns.py
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Tuple
+
+from .config import load_scanner_config
+from .metrics import stage
+from .utils import resolve_hostname
+
+DNS_CACHE_PATH = "logs/dns_cache.json"
+
+
+class DNSCache:
+    """
+    DNS 결과 캐시 (프로세스 메모리 + JSON 파일).
+    - 결과 있음: ttl 동안 유지 / 결과 없음(None, 빈 목록): negative_ttl 동안 유지
+    - 파일은 save() 때 만료된 항목을 빼고 통째로 다시 씀
+    """
+
+    def __init__(self, path: str | None = DNS_CACHE_PATH, ttl: float = 86400, negative_ttl: float = 3600):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: Dict[str, Tuple[Any, float]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for key, (value, expires_at) in data.items():
+            if expires_at > now:
+                self._entries[key] = (value, expires_at)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """(캐시 hit 여부, 값)"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.time():
+            return False, None
+        return True, entry[0]
+
+    def put(self, key: str, value: Any) -> None:
+        ttl = self.ttl if value else self.negative_ttl
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self.path or not self._dirty:
+            return
+        now = time.time()
+        with self._lock:
+            data = {key: [value, exp] for key, (value, exp) in self._entries.items() if exp > now}
+            self._dirty = False
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@lru_cache(maxsize=1)
+def default_cache() -> DNSCache:
+    """설정(dns 섹션) 기반 기본 캐시 (프로세스당 1개)."""
+    cfg = load_scanner_config()["dns"]
+    return DNSCache(cfg["cache_path"], ttl=cfg["cache_ttl"], negative_ttl=cfg["negative_ttl"])
+
+
+class ReverseResolver:
+    """
+    역방향 DNS 조회를 스캔과 동시에 진행.
+    - submit(ip): 캐시에 없으면 백그라운드 조회 시작 (중복 submit은 무시)
+    - results(): 남은 조회를 timeout까지만 기다리고 {ip: 이름 | None} 반환
+    - 동시 조회 수는 concurrency로 제한 (gethostbyaddr가 blocking이라 스레드 풀 사용)
+    """
+
+    def __init__(self, concurrency: int | None = None, timeout: float | None = None, cache: DNSCache | None = None):
+        cfg = load_scanner_config()["dns"]
+        self.timeout = cfg["timeout"] if timeout is None else timeout
+        self.cache = cache if cache is not None else default_cache()
+        self._pool = ThreadPoolExecutor(max_workers=concurrency or cfg["max_concurrency"])
+        self._pending: Dict[str, Future] = {}
+        self._names: Dict[str, str | None] = {}
+
+    def submit(self, ip: str) -> None:
+        if ip in self._names or ip in self._pending:
+            return
+        hit, name = self.cache.get(ip)
+        if hit:
+            self._names[ip] = name
+            return
+        self._pending[ip] = self._pool.submit(resolve_hostname, ip)
+
+    def submit_many(self, ips: Iterable[str]) -> None:
+        for ip in ips:
+            self.submit(ip)
+
+    def results(self, timeout: float | None = None) -> Dict[str, str | None]:
+        """
+        조회 결과 모음. timeout(기본: 설정값) 안에 끝나지 않은 조회는 None
+        (캐시에 넣지 않으므로 다음 스캔에서 다시 시도).
+        """
+        if self._pending:
+            wait(self._pending.values(), timeout=self.timeout if timeout is None else timeout)
+            for ip, fut in list(self._pending.items()):
+                if fut.done():
+                    name = fut.result()
+                    self.cache.put(ip, name)
+                    self._names[ip] = name
+                    del self._pending[ip]
+                else:
+                    self._names.setdefault(ip, None)
+            self.cache.save()
+        return dict(self._names)
+
+    def close(self) -> None:
+        # 끝나지 않은 조회(응답 없는 DNS)는 기다리지 않음
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def attach_host_names(scan_result: Dict, resolver: ReverseResolver | None = None) -> None:
+    """
+    스캔 결과의 up 호스트 entry에 "host_name" 채우기 (이미 있으면 건너뜀).
+    resolver를 넘기면 스캔 중에 시작한 조회 결과를 이어서 사용.
+    """
+    entries = [
+        t for t in scan_result["targets"]
+        if "error" not in t and t.get("status") != "down" and "host_name" not in t
+    ]
+    if not entries:
+        return
+
+    own = resolver is None
+    if own:
+        resolver = ReverseResolver()
+    try:
+        with stage("rdns"):
+            resolver.submit_many(t["ip"] for t in entries)
+            names = resolver.results()
+    finally:
+        if own:
+            resolver.close()
+
+    for t in entries:
+        t["host_name"] = names.get(t["ip"])
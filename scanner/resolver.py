@@ -0,0 +1,137 @@
+# scanner/resolver.py
+from __future__ import annotations
+
+import re
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List
+
+from .config import load_scanner_config
+from .metrics import stage
+from .rdns import DNSCache
+from .targets import parse_target_spec
+
+# 호스트 이름 형식 (마지막 label에 영문자가 있어야 함 → "10.0.0.300" 같은 잘못된 IP는 제외)
+_HOSTNAME_RE = re.compile(
+    r"^(?=.{1,253}\.?$)(?:[A-Za-z0-9_](?:[A-Za-z0-9_-]{0,61}[A-Za-z0-9])?\.)*"
+    r"[A-Za-z0-9-]*[A-Za-z][A-Za-z0-9-]*\.?$"
+)
+
+
+def is_hostname(spec: str) -> bool:
+    return parse_target_spec(spec) is None and bool(_HOSTNAME_RE.match(spec.strip()))
+
+
+def resolve_addresses(name: str) -> List[str]:
+    """이름 → A / AAAA 주소 전체 (조회 순서 유지, 중복 제거). 실패하면 빈 목록."""
+    try:
+        infos = socket.getaddrinfo(name, None, proto=socket.IPPROTO_TCP)
+    except (OSError, UnicodeError):
+        return []
+    return list(dict.fromkeys(info[4][0] for info in infos))
+
+
+@lru_cache(maxsize=1)
+def default_forward_cache() -> DNSCache:
+    cfg = load_scanner_config()["dns"]
+    return DNSCache(cfg["forward_cache_path"], ttl=cfg["cache_ttl"], negative_ttl=cfg["negative_ttl"])
+
+
+def resolve_hostnames(
+    names: Iterable[str],
+    concurrency: int | None = None,
+    cache: DNSCache | None = None,
+) -> Dict[str, List[str]]:
+    """
+    호스트 이름 여러 개를 동시에 정방향 조회 → {이름: [주소, ...]}.
+    - 같은 이름은 한 번만 조회 (대소문자 / 끝의 '.' 무시)
+    - 캐시에 있는 이름은 조회하지 않음 (결과 없음도 negative_ttl 동안 캐시)
+    """
+    cfg = load_scanner_config()["dns"]
+    cache = cache if cache is not None else default_forward_cache()
+
+    resolved: Dict[str, List[str]] = {}
+    todo: List[str] = []
+    for name in dict.fromkeys(n.strip().rstrip(".").lower() for n in names):
+        hit, addrs = cache.get(name)
+        if hit:
+            resolved[name] = addrs
+        else:
+            todo.append(name)
+
+    if todo:
+        workers = max(1, min(concurrency or cfg["max_concurrency"], len(todo)))
+        with stage("dns_resolve"), ThreadPoolExecutor(max_workers=workers) as pool:
+            for name, addrs in zip(todo, pool.map(resolve_addresses, todo)):
+                cache.put(name, addrs)
+                resolved[name] = addrs
+        cache.save()
+
+    return resolved
+
+
+@dataclass
+class ResolvedTargets:
+    source: Iterable[str]                                        # 원래 타겟 스펙 (다시 순회 가능)
+    hostnames: Dict[str, List[str]] = field(default_factory=dict)  # 주소 → 그 주소로 풀린 이름들
+    unresolved: List[str] = field(default_factory=list)          # 주소가 없는 이름
+
+    @property
+    def specs(self) -> Iterator[str]:
+        """
+        이름을 주소로 바꾼 타겟 스펙 (접근할 때마다 source를 다시 순회하는 generator).
+        - IP / CIDR / 범위 스펙은 그대로 흘려보냄
+        - 풀린 이름은 빼고, 그 주소들을 마지막에 한 번씩 (타겟에 주소로 직접 적힌 것은 제외)
+        - 주소가 없는 이름은 원문 그대로 (스캔 결과에 error로 남음)
+        """
+        unresolved = set(self.unresolved)
+        literal = set()
+        for spec in self.source:
+            seg = parse_target_spec(spec)
+            if seg is None and _HOSTNAME_RE.match(spec.strip()):
+                if spec in unresolved:
+                    yield spec
+                continue
+            if seg is not None and seg[1] == 1 and spec.strip() in self.hostnames:
+                literal.add(spec.strip())
+            yield spec
+        for addr in self.hostnames:
+            if addr not in literal:
+                yield addr
+
+    def to_dict(self) -> Dict:
+        return {"specs": list(self.specs), "hostnames": self.hostnames, "unresolved": self.unresolved}
+
+
+def resolve_target_specs(specs: Iterable[str], concurrency: int | None = None) -> ResolvedTargets:
+    """
+    타겟 스펙 중 호스트 이름만 골라 한꺼번에 조회한 뒤 주소 스펙으로 교체.
+    - 이름 하나가 여러 주소(A / AAAA)로 풀리면 전부 스캔
+    - 여러 이름이 같은 주소로 풀리면 주소는 한 번만 (이름은 hostnames에 모두 기록)
+    - 주소가 없는 이름은 원문 그대로 두고 unresolved에 기록 (스캔 결과에 error로 남음)
+    specs는 이름 수집 때 한 번 순회하고, 결과의 .specs를 읽을 때 다시 순회
+    (targets.TargetSpecs면 -iL 파일을 다시 읽음 / 한 번만 순회되는 iterator는 목록으로 보관)
+    """
+    if iter(specs) is specs:
+        specs = list(specs)
+
+    # 이름 스펙만 모음 (나머지 스펙은 보관하지 않음)
+    names = [s for s in specs if is_hostname(s)]
+    addresses = resolve_hostnames(names, concurrency=concurrency)
+
+    hostnames: Dict[str, List[str]] = {}
+    unresolved: List[str] = []
+    for spec in names:
+        key = spec.strip().rstrip(".").lower()
+        addrs = addresses.get(key) or []
+        if not addrs:
+            unresolved.append(spec)
+            continue
+        for addr in addrs:
+            owners = hostnames.setdefault(addr, [])
+            if key not in owners:
+                owners.append(key)
+
+    return ResolvedTargets(source=specs, hostnames=hostnames, unresolved=unresolved)
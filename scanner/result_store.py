@@ -0,0 +1,208 @@
+# scanner/result_store.py
+from __future__ import annotations
+
+import bisect
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Tuple
+
+from .service_fingerprints import guess_service
+
+if TYPE_CHECKING:
+    from .targets import TargetSpace
+
+# 포트 상태 코드 (0 = 아직 스캔 안 됨)
+STATE_CODES: Dict[str, int] = {
+    "closed": 1,
+    "open": 2,
+    "filtered": 3,
+    "open|filtered": 4,
+}
+STATE_NAMES: Dict[int, str] = {v: k for k, v in STATE_CODES.items()}
+
+
+class PortLayout:
+    """
+    스캔 포트 목록 → slot 인덱스 매핑 (모든 호스트가 공유).
+    slot 순서: TCP 포트(오름차순) → UDP 포트(오름차순)
+    """
+
+    __slots__ = ("tcp", "udp")
+
+    def __init__(self, tcp_ports: Iterable[int] = (), udp_ports: Iterable[int] = ()):
+        self.tcp: List[int] = sorted(set(tcp_ports))
+        self.udp: List[int] = sorted(set(udp_ports))
+
+    def __len__(self) -> int:
+        return len(self.tcp) + len(self.udp)
+
+    def slot(self, protocol: str, port: int) -> int:
+        ports, base = (self.tcp, 0) if protocol == "tcp" else (self.udp, len(self.tcp))
+        i = bisect.bisect_left(ports, port)
+        if i == len(ports) or ports[i] != port:
+            raise KeyError((protocol, port))
+        return base + i
+
+    def port(self, slot: int) -> Tuple[str, int]:
+        n_tcp = len(self.tcp)
+        if slot < n_tcp:
+            return "tcp", self.tcp[slot]
+        return "udp", self.udp[slot - n_tcp]
+
+
+class PortRecord:
+    """open 포트 등 상세 정보가 있는 포트만 보관하는 레코드."""
+
+    __slots__ = ("port", "protocol", "state", "banner", "service", "version")
+
+    def __init__(self, port, protocol, state, banner=None, service=None, version=None):
+        self.port = port
+        self.protocol = protocol
+        self.state = state
+        self.banner = banner
+        self.service = service
+        self.version = version
+
+    @classmethod
+    def from_result(cls, res) -> "PortRecord":
+        return cls(res.port, res.protocol, res.state, res.banner, res.service, getattr(res, "version", None))
+
+    def to_dict(self) -> Dict:
+        return {
+            "port": self.port,
+            "protocol": self.protocol,
+            "state": self.state,
+            "banner": self.banner,
+            "service": self.service,
+            "version": self.version,
+        }
+
+
+class HostResults:
+    """
+    호스트 1개의 포트 스캔 결과.
+    - 상태: slot당 1바이트 bytearray (포트 수 N이면 N bytes)
+    - 상세 정보(banner / version): 상태가 open이거나 banner가 있는 포트만 PortRecord로 보관
+    - dict는 순회할 때 하나씩 만들어 반환 (기존 결과 리스트와 같은 형식, 포트 순서대로)
+    """
+
+    __slots__ = ("layout", "states", "records")
+
+    def __init__(self, layout: PortLayout):
+        self.layout = layout
+        self.states = bytearray(len(layout))
+        self.records: Dict[int, PortRecord] = {}
+
+    def add(self, res) -> None:
+        slot = self.layout.slot(res.protocol, res.port)
+        self.states[slot] = STATE_CODES.get(res.state, STATE_CODES["closed"])
+        if res.state == "open" or res.banner:
+            self.records[slot] = PortRecord.from_result(res)
+        else:
+            self.records.pop(slot, None)
+
+    @classmethod
+    def restore(cls, layout: PortLayout, states: bytes, records: Iterable[Dict] = ()) -> "HostResults":
+        """체크포인트에 저장된 상태 배열 / 레코드로 복원."""
+        hr = cls(layout)
+        hr.states[:] = states
+        for r in records:
+            hr.records[layout.slot(r["protocol"], r["port"])] = PortRecord(**r)
+        return hr
+
+    def pending(self, protocol: str, port: int) -> bool:
+        """아직 스캔하지 않은 포트인지."""
+        return self.states[self.layout.slot(protocol, port)] == 0
+
+    def complete(self) -> bool:
+        return 0 not in self.states
+
+    def count(self, state: str) -> int:
+        """상태별 포트 수 (bytearray.count라 포트 수와 무관하게 빠름)."""
+        return self.states.count(STATE_CODES[state])
+
+    def __len__(self) -> int:
+        return len(self.states) - self.states.count(0)
+
+    def _dict(self, slot: int, code: int) -> Dict:
+        record = self.records.get(slot)
+        if record is not None:
+            return record.to_dict()
+        protocol, port = self.layout.port(slot)
+        return {
+            "port": port,
+            "protocol": protocol,
+            "state": STATE_NAMES[code],
+            "banner": None,
+            "service": guess_service(port, protocol),
+            "version": None,
+        }
+
+    def dicts(self, states: Iterable[str] | None = None) -> Iterator[Dict]:
+        """스캔된 포트를 dict로 lazy 생성. states를 주면 해당 상태만."""
+        if states is None:
+            for slot, code in enumerate(self.states):
+                if code:
+                    yield self._dict(slot, code)
+            return
+
+        codes = {STATE_CODES[s] for s in states}
+        if codes == {STATE_CODES["open"]}:
+            # open 포트는 모두 records에 있음 → 전체 slot을 훑지 않음
+            for slot in sorted(self.records):
+                if self.states[slot] in codes:
+                    yield self.records[slot].to_dict()
+            return
+
+        for slot, code in enumerate(self.states):
+            if code in codes:
+                yield self._dict(slot, code)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return self.dicts()
+
+    def to_list(self) -> List[Dict]:
+        return list(self.dicts())
+
+    def __repr__(self) -> str:
+        counts = {name: self.count(name) for name in STATE_CODES if self.count(name)}
+        return f"HostResults({counts})"
+
+
+class SeenHosts:
+    """
+    결과를 내보내고 entry를 지운(flush) 호스트 표시.
+    - space(TargetSpace)가 있으면 공간 인덱스당 1비트 (/8 = 2 MiB, 호스트 entry 대신)
+    - 공간 밖 주소 / 공간이 너무 큰 경우(IPv6 대역)는 주소 집합
+    """
+
+    MAX_BITS = 1 << 32
+
+    __slots__ = ("space", "bits", "addrs")
+
+    def __init__(self, space: TargetSpace | None = None):
+        if space is not None and len(space) > self.MAX_BITS:
+            space = None
+        self.space = space
+        self.bits = bytearray((len(space) + 7) // 8) if space is not None else bytearray()
+        self.addrs: set = set()
+
+    def _index(self, ip: str) -> int | None:
+        return self.space.index(ip) if self.space is not None else None
+
+    def add(self, ip: str) -> None:
+        i = self._index(ip)
+        if i is None:
+            self.addrs.add(ip)
+        else:
+            self.bits[i >> 3] |= 1 << (i & 7)
+
+    def __contains__(self, ip: object) -> bool:
+        i = self._index(str(ip))
+        if i is None:
+            return ip in self.addrs
+        return bool(self.bits[i >> 3] & (1 << (i & 7)))
+
+    def load(self, bits: bytes, addrs: Iterable[str] = ()) -> None:
+        """체크포인트에 저장된 표시 복원 (비트는 같은 크기의 타겟 공간으로 재개할 때만 사용)."""
+        if len(bits) == len(self.bits):
+            self.bits[:] = bits
+        self.addrs.update(addrs)
@@ -1,21 +1,361 @@
 # scanner/scan_runner.py
 from __future__ import annotations
 import uuid
-from typing import List, Dict, Iterable
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
 from datetime import datetime, timedelta, timezone
-from .tcp_scanner import sequential_scan, threaded_scan          # TCP scanner
-from .udp_scanner import sequential_udp_scan, threaded_udp_scan  # UDP scanner
+import threading
+from functools import partial
+from collections import deque
+from itertools import islice
+from .tcp_scanner import scan_single_port, async_scan_single_port, _raise_nofile_limit  # TCP scanner
+from .udp_scanner import scan_single_udp_port, UDPBatchScanner                          # UDP scanner
+from .scheduler import ScanScheduler, ScanTask, merge_streams
+from .targets import TargetSpace, cyclic_permutation, iter_targets
+from .timing import TimingTable
+from .rate_limit import RateLimiter
+from .discovery import discover_hosts, DEFAULT_DISCOVERY_PORTS
 from .utils import is_valid_ip, parse_ports
+from .result_store import HostResults, PortLayout, SeenHosts
+from .service_fingerprints import load_services_db
+from .checkpoint import ScanCheckpoint
+from .sharding import Shard, shard_filter
+from .metrics import stage
 
 KST = timezone(timedelta(hours=9))
 
+# flush_hosts + randomize: 한 번에 순열로 섞는 호스트 수 (동시에 entry를 가진 호스트 상한)
+FLUSH_BLOCK_HOSTS = 4096
+
 def generate_scan_id() -> str:
     ts = datetime.utcnow().strftime("%Y%m%d%H%M%S")
     u = uuid.uuid4().hex[:8]
     return f"scan-{ts}-{u}"
 
 
-def run_scan(
+def _interleave_tasks(
+    hosts: Iterable[str],
+    tcp_ports: List[int],
+    udp_ports: List[int],
+    block_size: int = 256,
+) -> Iterable[ScanTask]:
+    """
+    (host, port, proto) 작업 생성.
+    - 호스트를 block_size 단위로 끊어서 읽고 (타겟 전체를 리스트로 만들지 않음)
+    - 블록 안에서는 포트 단위 round-robin → 한 호스트를 연달아 두드리지 않음
+    """
+    it = iter(hosts)
+    while True:
+        block = list(islice(it, block_size))
+        if not block:
+            return
+        for port in tcp_ports:
+            for host in block:
+                yield (host, port, "tcp")
+        for port in udp_ports:
+            for host in block:
+                yield (host, port, "udp")
+
+
+def _permuted_tasks(
+    space: TargetSpace,
+    tcp_ports: List[int],
+    udp_ports: List[int],
+    seed: int | None = None,
+    block_hosts: int | None = None,
+) -> Iterable[ScanTask]:
+    """
+    (host, port) 공간 전체를 순환군 순열 순서로 방문.
+    → 서브넷/호스트에 부하가 고르게 퍼지고, 메모리는 상수
+    block_hosts를 주면 호스트를 n_blocks개 블록(인덱스 mod n_blocks, 블록마다 전체 공간에 고르게 퍼짐)으로
+    나눠 블록 순서와 블록 안의 (host, port)를 각각 순열로 방문
+    → 한 호스트의 작업이 블록 안에서 끝나므로 진행 중인 호스트는 block_hosts개 이하
+    """
+    n_hosts = len(space)
+    n_tcp = len(tcp_ports)
+    n_slots = n_tcp + len(udp_ports)
+    if n_hosts == 0 or n_slots == 0:
+        return
+
+    n_blocks = 1 if not block_hosts else -(-n_hosts // block_hosts)
+    for b in cyclic_permutation(n_blocks, seed):
+        # 블록 b의 호스트: 인덱스 b, b + n_blocks, b + 2*n_blocks, ...
+        size = (n_hosts - b + n_blocks - 1) // n_blocks
+        block_seed = seed if seed is None or n_blocks == 1 else seed + b
+        for i in cyclic_permutation(size * n_slots, block_seed):
+            host = space[b + (i % size) * n_blocks]
+            slot = i // size
+            if slot < n_tcp:
+                yield (host, tcp_ports[slot], "tcp")
+            else:
+                yield (host, udp_ports[slot - n_tcp], "udp")
+
+
+def _locked_tee(hosts: Iterable[str], limit: int = 1024) -> tuple[Iterable[str], Iterable[str]]:
+    """
+    서로 다른 스레드에서 소비하는 호스트 스트림 2개 (TCP / batch UDP 엔진 공용).
+    - 앞선 쪽이 뒤처진 쪽보다 limit개 이상 앞서면 따라올 때까지 대기 → 버퍼는 최대 limit개
+      (itertools.tee는 두 엔진 속도 차이만큼 무제한으로 쌓임)
+    - 한쪽 소비가 끝나면(generator close) 다른 쪽은 더 기다리지 않고 버퍼도 쌓지 않음
+    """
+    cond = threading.Condition()
+    source = iter(hosts)
+    pending: deque = deque()     # 앞선 쪽이 꺼냈고 뒤처진 쪽은 아직 안 읽은 호스트
+    state = {"ahead": None, "exhausted": False}
+    detached = [False, False]
+
+    def consume(me: int) -> Iterator[str]:
+        other = 1 - me
+        try:
+            while True:
+                with cond:
+                    while True:
+                        if pending and state["ahead"] == other:
+                            item = pending.popleft()
+                            cond.notify_all()
+                            break
+                        if state["exhausted"]:
+                            return
+                        if detached[other] or len(pending) < limit:
+                            item = next(source, None)
+                            if item is None:
+                                state["exhausted"] = True
+                                cond.notify_all()
+                                return
+                            if not detached[other]:
+                                pending.append(item)
+                                state["ahead"] = me
+                            break
+                        cond.wait()
+                yield item
+        finally:
+            with cond:
+                detached[me] = True
+                if state["ahead"] == other:
+                    pending.clear()
+                cond.notify_all()
+
+    return consume(0), consume(1)
+
+
+def _both(
+    first: Callable[[ScanTask], bool], second: Callable[[ScanTask], bool]
+) -> Callable[[ScanTask], bool]:
+    return lambda task: first(task) and second(task)
+
+
+def _now() -> str:
+    return datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def build_timing(timeout: float, adaptive_timeout: bool, min_timeout: float) -> TimingTable | None:
+    """adaptive_timeout이면 호스트별 RTT 테이블 (timeout은 상한)."""
+    return TimingTable(min_timeout=min_timeout, max_timeout=timeout) if adaptive_timeout else None
+
+
+def build_limiter(rate_limit: float, host_rate_limit: float, rate_burst: float | None = None) -> RateLimiter | None:
+    """제한이 없으면 limiter 자체를 만들지 않음 → hot path 비용 0."""
+    if rate_limit > 0 or host_rate_limit > 0:
+        return RateLimiter(rate=rate_limit, per_host_rate=host_rate_limit, burst=rate_burst)
+    return None
+
+
+class ScanRun:
+    """
+    iter_scan()의 반환값.
+    - 순회하면 포트 결과를 완료 순서대로 (host, result)로 yield
+    - targets / hosts 의 호스트별 entry는 순회하면서 채워짐
+      (entry["results"]는 포트 상태 배열 기반 HostResults)
+    - result()는 최종 dict (호스트별 results = HostResults, compact 저장소 그대로)
+    - to_dict()는 results를 포트별 dict 목록으로 바꾼 JSON 직렬화 가능한 dict (run_scan 반환값)
+    - checkpoint를 지정하면 순회 중 주기적으로 진행 상황을 파일에 저장
+    - flush_hosts면 호스트의 마지막 작업이 끝나는 즉시 entry를 정리 (긴 스윕에서 메모리 일정)
+      보고할 포트(open / banner)가 있거나 retain(ip)이 참인 호스트만 남기고,
+      나머지는 seen(타겟 공간 인덱스당 1비트)과 flushed 카운터에만 기록
+    """
+
+    def __init__(
+        self,
+        scan_type: str,
+        port_range: Iterable[int] | str,
+        layout: PortLayout,
+        scan_id: str | None = None,
+        started_at: str | None = None,
+    ):
+        self.scan_id = scan_id or generate_scan_id()
+        self.scan_type = scan_type
+        self.port_range = port_range
+        self.layout = layout
+        self.started_at = started_at or _now()
+        self.finished_at: str | None = None
+        self.hosts: Dict[str, Dict] = {}
+        self.flush_hosts = False
+        self.retain: Callable[[str], bool] | None = None
+        self.flushed: Dict[str, int] = {"up": 0, "down": 0}   # 정리된 호스트 수 (up: 보고할 포트 없음)
+        self.seen: SeenHosts | None = None          # flush_hosts: 정리된 호스트 (재등록 / 재개 시 건너뜀)
+        self._entries: Dict[object, Dict] = {}      # 등록 순서 그대로의 entry (targets)
+        self._remaining: Dict[str, int] = {}        # flush_hosts: 호스트별 남은 작업 수
+        self._task_filter: Callable[[ScanTask], bool] | None = None   # shard / task_filter (남은 작업 수 계산용)
+        self._seen_state: Dict | None = None
+        self.discovery: Dict | None = None
+        self.checkpoint: ScanCheckpoint | None = None
+        self.shard: Shard | None = None
+        self.target: str | None = None              # 타겟 스펙 라벨 (DB scans.target, 지정 시 result()["target"])
+        self.hostnames: Dict[str, List[str]] = {}   # 주소 → 타겟에 적힌 호스트 이름 (정방향 조회 결과)
+        self.unresolved: set = set()                # 주소로 풀리지 않은 호스트 이름
+        self._restored: Dict[str, Dict] = {}
+        self._register_lock = threading.Lock()
+        self._stream: Iterator[Tuple[str, Any]] = iter(())
+
+    @property
+    def targets(self) -> List[Dict]:
+        return list(self._entries.values())
+
+    def restore(self, state: Dict) -> None:
+        """체크포인트(load_checkpoint 결과)의 호스트별 진행 상황을 불러옴."""
+        if "flushed" in state:
+            self.flushed = dict(state["flushed"])
+            self._seen_state = state.get("seen")
+        for t in state["targets"]:
+            if "states" not in t:
+                continue
+            entry = {k: v for k, v in t.items() if k not in ("states", "records")}
+            entry["results"] = HostResults.restore(self.layout, t["states"], t.get("records", ()))
+            self._restored[t["ip"]] = entry
+
+    def register(self, ip: str) -> bool:
+        """타겟 entry 등록. 스캔 대상이면 True (잘못된 IP / 중복이면 False)."""
+        if not is_valid_ip(ip):
+            entry = {
+                "ip": ip,
+                "error": "unresolved" if ip in self.unresolved else "invalid_ip",
+                "results": [],
+            }
+            self._entries[id(entry)] = entry
+            return False
+
+        if ip in self.hosts or (self.seen is not None and ip in self.seen):
+            return False
+
+        entry = self._restored.pop(ip, None)
+        if entry is None:
+            entry = {"ip": ip, "results": HostResults(self.layout)}
+            if ip in self.hostnames:
+                entry["hostnames"] = self.hostnames[ip]
+        self._entries[ip] = entry
+        self.hosts[ip] = entry
+
+        # 재개한 스캔에서 이미 끝난 호스트 / down 호스트는 다시 스캔하지 않음
+        if not self.flush_hosts:
+            return entry.get("status") != "down" and not entry["results"].complete()
+
+        remaining = 0 if entry.get("status") == "down" else self._expected(ip, entry["results"])
+        if remaining == 0:
+            self.retire(ip)
+            return False
+        self._remaining[ip] = remaining
+        return True
+
+    def track_seen(self, space: TargetSpace | None) -> None:
+        """flush_hosts: 정리된 호스트 표시 시작 (재개한 스캔이면 체크포인트의 표시를 이어받음)."""
+        self.seen = SeenHosts(space)
+        if self._seen_state:
+            self.seen.load(self._seen_state["bits"], self._seen_state["addrs"])
+
+    def _expected(self, ip: str, results: HostResults) -> int:
+        """이 호스트에 남은 작업 수 (아직 상태가 없고 shard / task_filter를 통과하는 slot)."""
+        if self._task_filter is None:
+            return results.states.count(0)
+        n = 0
+        for slot, code in enumerate(results.states):
+            if code == 0:
+                proto, port = self.layout.port(slot)
+                n += self._task_filter((ip, port, proto))
+        return n
+
+    def retire(self, ip: str) -> None:
+        """
+        flush_hosts: 더 스캔할 작업이 없는 호스트 정리.
+        보고할 포트가 없으면 entry를 지우고 seen / flushed 카운터에만 남김.
+        """
+        self._remaining.pop(ip, None)
+        entry = self.hosts[ip]
+        if entry["results"].records or (self.retain is not None and self.retain(ip)):
+            return
+        del self.hosts[ip]
+        del self._entries[ip]
+        if self.seen is None:
+            self.seen = SeenHosts()
+        self.seen.add(ip)
+        self.flushed["down" if entry.get("status") == "down" else "up"] += 1
+
+    def register_tasks(self, tasks: Iterable[ScanTask]) -> Iterator[ScanTask]:
+        """
+        randomize 모드용: 순열이 호스트를 처음 꺼낼 때 등록 (전체 호스트 목록을 미리 만들지 않음).
+        down 호스트의 작업은 건너뜀. TCP / batch UDP 스트림이 다른 스레드에서 호출해도 안전.
+        """
+        for task in tasks:
+            host = task[0]
+            entry = self.hosts.get(host)
+            if entry is None:
+                with self._register_lock:
+                    if host not in self.hosts:
+                        self.register(host)
+                # flush_hosts: 이미 정리된 호스트(작업이 남지 않은 호스트)는 entry가 없음
+                entry = self.hosts.get(host)
+            if entry is not None and entry.get("status") != "down":
+                yield task
+
+    def pending(self, task: ScanTask) -> bool:
+        host, port, proto = task
+        entry = self.hosts.get(host)
+        return entry is not None and entry["results"].pending(proto, port)
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        # stage "scan": 순회 시작 ~ 끝 (스트리밍 소비자의 처리 시간 포함)
+        with stage("scan"):
+            for host, res in self._stream:
+                self.hosts[host]["results"].add(res)
+                if self.flush_hosts:
+                    remaining = self._remaining[host] - 1
+                    if remaining:
+                        self._remaining[host] = remaining
+                    else:
+                        self.retire(host)
+                if self.checkpoint is not None:
+                    self.checkpoint.maybe_save(self)
+                yield host, res
+        self.finished_at = _now()
+
+    def result(self) -> Dict:
+        # 호스트별 "results"는 HostResults 그대로 (순회 시 TCP 먼저, 포트 번호 순으로 dict 생성)
+        result = {
+            "scan_id": self.scan_id,
+            "scan_type": self.scan_type,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at or _now(),
+            "targets": self.targets,
+            "port_range": self.port_range,
+        }
+        if self.discovery is not None:
+            result["discovery"] = self.discovery
+        if self.shard is not None:
+            result["shard"] = list(self.shard)
+        if self.target is not None:
+            result["target"] = self.target
+        if self.flush_hosts:
+            result["flushed"] = dict(self.flushed)
+        return result
+
+    def to_dict(self) -> Dict:
+        result = self.result()
+        result["targets"] = [
+            {**t, "results": t["results"].to_list()} if isinstance(t["results"], HostResults) else t
+            for t in self.targets
+        ]
+        return result
+
+
+def iter_scan(
     targets: Iterable[str],
     ports: Iterable[int] | str = "20-1024",
     timeout: float = 1.0,
@@ -24,74 +364,300 @@ def run_scan(
     enable_udp: bool = False,   # TCP + UDP
     udp_only: bool = False, 
     scan_type: str = "tcp",     # UDP only
-) -> Dict:
-    started_at = datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S")
-    
-    scan_id = generate_scan_id()
+    *,
+    engine: str | None = None,  # "sequential" / "threaded" / "async"
+    concurrency: int = 1000,    # async 엔진 동시 connect 수
+    per_host_limit: int | None = None,  # 호스트별 동시 작업 상한 (None이면 전역 상한과 동일)
+    randomize: bool = False,    # (host, port) 공간을 무작위 순열 순서로 스캔
+    seed: int | None = None,    # randomize 순열 시드 (재현용)
+    adaptive_timeout: bool = False,  # 호스트별 RTT 기반 동적 timeout (timeout은 상한으로 사용)
+    min_timeout: float = 0.1,        # 동적 timeout 하한
+    rate_limit: float = 0,           # 초당 전송 상한 (전체, TCP+UDP 공용 / 0이면 제한 없음)
+    host_rate_limit: float = 0,      # 타겟 호스트별 초당 전송 상한 (0이면 제한 없음)
+    rate_burst: float | None = None, # 순간 최대 연속 전송 수
+    discovery: bool = False,         # 포트 스캔 전 host discovery로 죽은 호스트 제외
+    discovery_ports: Iterable[int] | str | None = None,  # discovery용 TCP 포트 (기본: DEFAULT_DISCOVERY_PORTS)
+    discovery_icmp: bool = False,    # 권한이 있으면 ICMP echo도 사용
+    udp_engine: str = "threaded",    # "threaded": 포트별 probe / "batch": 단일 소켓 배치 엔진
+    udp_window: int = 512,           # batch 엔진 동시 대기 probe 수
+    udp_retries: int = 1,            # 응답 없는 UDP probe 재전송 횟수
+    resume: Dict | None = None,      # load_checkpoint() 결과 → 기록된 포트는 건너뛰고 이어서 스캔
+    shard: Shard | None = None,      # (i, N): (host, port, proto) 공간 중 i번째 1/N만 스캔
+    top_ports: int | None = None,    # 지정 시 ports 대신 프로토콜별 빈도 상위 N개 포트
+    port_order: str = "frequency",   # "frequency": 열려 있을 가능성 높은 포트부터 / "numeric": 포트 번호 순
+    hostnames: Dict[str, List[str]] | None = None,  # resolve_target_specs 결과 (주소 → 이름)
+    unresolved: Iterable[str] = (),  # 주소로 풀리지 않은 이름 (error: unresolved)
+    flush_hosts: bool = False,       # 끝난 호스트 entry 정리 (보고할 포트 없는 호스트는 카운터만, ScanRun 참고)
+    task_filter: Callable[[ScanTask], bool] | None = None,  # (host, port, proto) → 스캔 여부 (호스트별 포트 계획)
+) -> "ScanRun":
+    """
+    스캔을 준비하고 ScanRun을 반환 (순회를 시작해야 실제 스캔 진행).
+    포트 결과는 완료되는 즉시 (host, PortScanResult | UDPPortScanResult)로 yield 되므로
+    긴 스윕에서도 스캔 도중 출력 / 파일 기록 / DB 저장이 가능하다.
+    """
+    # engine 미지정 시 기존 threaded 플래그로 결정
+    if engine is None:
+        engine = "threaded" if threaded else "sequential"
 
-    # 사용자 포트 범위
-    port_list = parse_ports(ports)
+    # 포트 목록: 사용자 포트 범위 또는 프로토콜별 빈도 상위 N개
+    services = load_services_db()
+    if top_ports:
+        tcp_port_list = [] if udp_only else services.top_ports(top_ports, "tcp")
+        udp_port_list = services.top_ports(top_ports, "udp") if (enable_udp or udp_only) else []
+        ports = f"top {top_ports}"
+    else:
+        port_list = parse_ports(ports)
+        tcp_port_list = [] if udp_only else port_list
+        udp_port_list = port_list if (enable_udp or udp_only) else []
 
-    tcp_port_list = port_list
-    udp_port_list = port_list
+    # 스캔 순서만 바꿈 (PortLayout / 결과 순서는 포트 번호 순 그대로)
+    if port_order == "frequency":
+        tcp_port_list = services.order_by_frequency(tcp_port_list, "tcp")
+        udp_port_list = services.order_by_frequency(udp_port_list, "udp")
 
-    targets_results: List[Dict] = []
+    run = ScanRun(
+        scan_type=scan_type,
+        port_range=ports,
+        layout=PortLayout(tcp_port_list, udp_port_list),
+        scan_id=resume["scan_id"] if resume else None,
+        started_at=resume["started_at"] if resume else None,
+    )
+    run.shard = shard
+    run.hostnames = dict(hostnames or {})
+    run.unresolved = set(unresolved)
+    run.flush_hosts = flush_hosts
+    if resume:
+        run.restore(resume)
 
-    for ip in targets:
-        if not is_valid_ip(ip):
-            targets_results.append({
-                "ip": ip,
-                "error": "invalid_ip",
-                "results": [],
-            })
-            continue
+    timing = build_timing(timeout, adaptive_timeout, min_timeout)
+    limiter = build_limiter(rate_limit, host_rate_limit, rate_burst)
 
+    def stream() -> Iterator[Tuple[str, Any]]:
         # =====================================================
-        # TCP 스캔
+        # 타겟 스펙(CIDR/범위/파일)은 generator로 lazy 전개
+        # randomize는 인덱스 접근이 필요하므로 TargetSpace 사용
         # =====================================================
-        if udp_only:
-            tcp_results = []
+        # shard와 task_filter(호스트별 포트 계획)를 함께 적용
+        # 걸러진 slot은 상태 0으로 남고 결과 / 비교에서 빠짐
+        wanted = shard_filter(run.layout, shard) if shard else None
+        if task_filter is not None:
+            wanted = task_filter if wanted is None else _both(wanted, task_filter)
+        run._task_filter = wanted
+
+        space = None
+        if randomize:
+            space = targets if isinstance(targets, TargetSpace) else TargetSpace(targets)
+            if flush_hosts:
+                run.track_seen(space)
+            for spec in space.invalid:
+                run.register(spec)
+            # 재개한 스캔의 호스트는 바로 등록 (아직 순열에 안 나온 호스트도 체크포인트에 남도록)
+            for ip in list(run._restored):
+                run.register(ip)
+            # 나머지는 discovery면 probe할 때, 아니면 run.register_tasks에서 순열 순서대로 등록
+            hosts: Iterable[str] = (ip for ip in space if run.register(ip)) if discovery else space
         else:
-            if threaded:
-                tcp_results = threaded_scan(
-                    ip, tcp_port_list, timeout=timeout, max_workers=max_workers
-                )
+            if isinstance(targets, TargetSpace):
+                if flush_hosts:
+                    run.track_seen(targets)
+                for spec in targets.invalid:
+                    run.register(spec)
+                target_iter = iter(targets)
             else:
-                tcp_results = sequential_scan(
-                    ip, tcp_port_list, timeout=timeout
-                )
+                if flush_hosts:
+                    run.track_seen(None)
+                target_iter = iter_targets(targets)
+            hosts = (ip for ip in target_iter if run.register(ip))
 
         # =====================================================
-        # UDP 스캔
+        # Host discovery: 살아있는 호스트만 포트 스캔 대상으로
+        # (RTT 샘플은 timing에 쌓여 포트 스캔 timeout에도 반영)
         # =====================================================
-        if enable_udp or udp_only:
-            if threaded:
-                udp_results = threaded_udp_scan(
-                    ip, udp_port_list, timeout=timeout, max_workers=max_workers
+        if discovery:
+            d_ports = parse_ports(discovery_ports) if discovery_ports else list(DEFAULT_DISCOVERY_PORTS)
+            live: List[str] = []
+
+            def undiscovered() -> Iterator[str]:
+                # 재개한 스캔에서 이미 up으로 판정된 호스트는 다시 probe하지 않음
+                for h in hosts:
+                    if run.hosts[h].get("status") == "up":
+                        live.append(h)
+                    else:
+                        yield h
+
+            for d in discover_hosts(
+                undiscovered(),
+                d_ports,
+                timeout=timeout,
+                icmp=discovery_icmp,
+                max_workers=max_workers,
+                timing=timing,
+                limiter=limiter,
+            ):
+                entry = run.hosts[d.ip]
+                entry["status"] = "up" if d.alive else "down"
+                entry["discovery"] = d.to_dict()
+                if d.alive:
+                    live.append(d.ip)
+                elif flush_hosts:
+                    run.retire(d.ip)
+
+            # 정리된 호스트: down은 discovery에서, up은 (재개 전) 포트 스캔이 끝나서 정리된 것
+            hosts_up = sum(1 for e in run.hosts.values() if e.get("status") == "up") + run.flushed["up"]
+            run.discovery = {
+                "ports": d_ports,
+                "icmp": discovery_icmp,
+                "hosts_up": hosts_up,
+                "hosts_down": len(run.hosts) + sum(run.flushed.values()) - hosts_up,
+            }
+            hosts = live
+            if randomize:
+                space = TargetSpace(live)
+
+        # =====================================================
+        # 전체 호스트 × 포트 × 프로토콜 작업을 하나의 pool에서 스케줄링
+        # batch UDP 엔진은 TCP 스케줄러와 병렬로 자체 소켓에서 진행
+        # =====================================================
+        udp_batch = udp_engine == "batch" and bool(udp_port_list)
+        sched_udp_ports = [] if udp_batch else udp_port_list
+
+        if randomize:
+            block = FLUSH_BLOCK_HOSTS if flush_hosts else None
+            tasks = run.register_tasks(_permuted_tasks(space, tcp_port_list, sched_udp_ports, seed, block))
+            if udp_batch:
+                udp_tasks = (
+                    (h, p) for h, p, _ in run.register_tasks(_permuted_tasks(space, [], udp_port_list, seed, block))
+                )
+        else:
+            if udp_batch:
+                hosts, udp_hosts = _locked_tee(hosts)
+                udp_tasks = ((h, p) for h, p, _ in _interleave_tasks(udp_hosts, [], udp_port_list))
+            tasks = _interleave_tasks(hosts, tcp_port_list, sched_udp_ports)
+
+        if wanted is not None:
+            tasks = filter(wanted, tasks)
+            if udp_batch:
+                udp_tasks = ((h, p) for h, p in udp_tasks if wanted((h, p, "udp")))
+
+        if resume:
+            tasks = filter(run.pending, tasks)
+            if udp_batch:
+                udp_tasks = ((h, p) for h, p in udp_tasks if run.pending((h, p, "udp")))
+
+        probes = {
+            "tcp": partial(scan_single_port, timeout=timeout, timing=timing, limiter=limiter),
+            "udp": partial(
+                scan_single_udp_port, timeout=timeout, timing=timing, limiter=limiter, retries=udp_retries
+            ),
+        }
+
+        if engine == "sequential":
+            completed = (
+                (host, probes[proto](host, port)) for host, port, proto in tasks
+            )
+        else:
+            if engine == "async":
+                _raise_nofile_limit(concurrency)
+                scheduler = ScanScheduler(
+                    probes,
+                    async_probes={"tcp": partial(
+                        async_scan_single_port, timeout=timeout, timing=timing, limiter=limiter
+                    )},
+                    max_workers=concurrency,
+                    per_host_limit=per_host_limit,
+                    backend="async",
                 )
             else:
-                udp_results = sequential_udp_scan(
-                    ip, udp_port_list, timeout=timeout
+                scheduler = ScanScheduler(
+                    probes,
+                    max_workers=max_workers,
+                    per_host_limit=per_host_limit,
+                    backend="thread",
                 )
-        else:
-            udp_results = []
-
-        # TCP + UDP 결과 병합
-        merged = tcp_results + udp_results
-
-        targets_results.append({
-            "ip": ip,
-            "results": merged,
-        })
-
-    finished_at = datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S")
-    return {
-        "scan_id": scan_id,
-        "scan_type": scan_type, 
-        "started_at": started_at,
-        "finished_at": finished_at,
-        "targets": targets_results,
-        "port_range": ports,
-    }
- 
+            completed = scheduler.run(tasks)
+
+        if udp_batch:
+            udp_scanner = UDPBatchScanner(
+                timeout=timeout,
+                window=udp_window,
+                timing=timing,
+                limiter=limiter,
+                max_retries=udp_retries,
+            )
+            completed = merge_streams(completed, udp_scanner.scan(udp_tasks))
+
+        yield from completed
+
+    run._stream = stream()
+    return run
+
 
+def run_scan(
+    targets: Iterable[str],
+    ports: Iterable[int] | str = "20-1024",
+    timeout: float = 1.0,
+    threaded: bool = True,
+    max_workers: int = 100,
+    enable_udp: bool = False,   # TCP + UDP
+    udp_only: bool = False,
+    scan_type: str = "tcp",     # UDP only
+    *,
+    on_result: Callable[[str, Any], None] | None = None,  # 포트 결과가 나올 때마다 on_result(host, result)
+    engine: str | None = None,  # "sequential" / "threaded" / "async"
+    concurrency: int = 1000,    # async 엔진 동시 connect 수
+    per_host_limit: int | None = None,  # 호스트별 동시 작업 상한 (None이면 전역 상한과 동일)
+    randomize: bool = False,    # (host, port) 공간을 무작위 순열 순서로 스캔
+    seed: int | None = None,    # randomize 순열 시드 (재현용)
+    adaptive_timeout: bool = False,  # 호스트별 RTT 기반 동적 timeout (timeout은 상한으로 사용)
+    min_timeout: float = 0.1,        # 동적 timeout 하한
+    rate_limit: float = 0,           # 초당 전송 상한 (전체, TCP+UDP 공용 / 0이면 제한 없음)
+    host_rate_limit: float = 0,      # 타겟 호스트별 초당 전송 상한 (0이면 제한 없음)
+    rate_burst: float | None = None, # 순간 최대 연속 전송 수
+    discovery: bool = False,         # 포트 스캔 전 host discovery로 죽은 호스트 제외
+    discovery_ports: Iterable[int] | str | None = None,  # discovery용 TCP 포트 (기본: DEFAULT_DISCOVERY_PORTS)
+    discovery_icmp: bool = False,    # 권한이 있으면 ICMP echo도 사용
+    udp_engine: str = "threaded",    # "threaded": 포트별 probe / "batch": 단일 소켓 배치 엔진
+    udp_window: int = 512,           # batch 엔진 동시 대기 probe 수
+    udp_retries: int = 1,            # 응답 없는 UDP probe 재전송 횟수
+    resume: Dict | None = None,      # load_checkpoint() 결과 → 기록된 포트는 건너뛰고 이어서 스캔
+    shard: Shard | None = None,      # (i, N): (host, port, proto) 공간 중 i번째 1/N만 스캔
+    top_ports: int | None = None,    # 지정 시 ports 대신 프로토콜별 빈도 상위 N개 포트
+    port_order: str = "frequency",   # "frequency": 열려 있을 가능성 높은 포트부터 / "numeric": 포트 번호 순
+    hostnames: Dict[str, List[str]] | None = None,  # resolve_target_specs 결과 (주소 → 이름)
+    unresolved: Iterable[str] = (),  # 주소로 풀리지 않은 이름 (error: unresolved)
+) -> Dict:
+    """
+    전체 스캔 후 결과 dict 반환 (iter_scan 래퍼, 옵션 의미는 iter_scan과 동일).
+    - 기존 위치 인자(timeout ~ scan_type) 순서 유지, 추가 옵션은 keyword 전용
+    - 호스트별 results는 스캔한 포트 전체의 dict 목록 (JSON 직렬화 가능)
+      compact 상태 배열(HostResults)이 필요하면 iter_scan()의 ScanRun.result() 사용
+    """
+    run = iter_scan(
+        targets, ports, timeout, threaded, max_workers, enable_udp, udp_only, scan_type,
+        engine=engine,
+        concurrency=concurrency,
+        per_host_limit=per_host_limit,
+        randomize=randomize,
+        seed=seed,
+        adaptive_timeout=adaptive_timeout,
+        min_timeout=min_timeout,
+        rate_limit=rate_limit,
+        host_rate_limit=host_rate_limit,
+        rate_burst=rate_burst,
+        discovery=discovery,
+        discovery_ports=discovery_ports,
+        discovery_icmp=discovery_icmp,
+        udp_engine=udp_engine,
+        udp_window=udp_window,
+        udp_retries=udp_retries,
+        resume=resume,
+        shard=shard,
+        top_ports=top_ports,
+        port_order=port_order,
+        hostnames=hostnames,
+        unresolved=unresolved,
+    )
+    for host, res in run:
+        if on_result is not None:
+            on_result(host, res)
+    return run.to_dict()
@@ -0,0 +1,255 @@
+# scanner/scheduler.py
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, Iterator, Tuple
+
+# (host, port, proto)
+ScanTask = Tuple[str, int, str]
+
+SyncProbe = Callable[[str, int], Any]
+AsyncProbe = Callable[[str, int], Awaitable[Any]]
+
+_DONE = object()
+
+
+class _TaskSource:
+    """
+    작업 iterator에서 호스트별 in-flight 상한을 지키며 다음 작업을 꺼낸다.
+    - 상한에 걸린 호스트의 작업은 호스트별 대기열로 미뤄두고 다른 호스트 작업을 먼저 꺼냄
+    - 대기열 총량은 max_deferred로 제한 (iterator를 끝까지 당겨오지 않도록)
+    단일 스레드(디스패처)에서만 호출된다.
+    """
+
+    def __init__(self, tasks: Iterable[ScanTask], per_host_limit: int, max_deferred: int):
+        self._it = iter(tasks)
+        self._per_host_limit = per_host_limit
+        self._max_deferred = max_deferred
+        self._inflight: Dict[str, int] = defaultdict(int)
+        self._deferred: Dict[str, Deque[ScanTask]] = {}
+        self._deferred_count = 0
+        self._exhausted = False
+
+    def next(self) -> ScanTask | None:
+        # 1) 상한이 풀린 호스트의 미뤄둔 작업 우선
+        for host, q in self._deferred.items():
+            if self._inflight[host] < self._per_host_limit:
+                task = q.popleft()
+                if not q:
+                    del self._deferred[host]
+                self._deferred_count -= 1
+                self._inflight[host] += 1
+                return task
+
+        # 2) iterator에서 새 작업
+        while not self._exhausted and self._deferred_count < self._max_deferred:
+            task = next(self._it, None)
+            if task is None:
+                self._exhausted = True
+                break
+
+            host = task[0]
+            if self._inflight[host] < self._per_host_limit:
+                self._inflight[host] += 1
+                return task
+
+            self._deferred.setdefault(host, deque()).append(task)
+            self._deferred_count += 1
+
+        return None
+
+    def done(self, host: str) -> None:
+        self._inflight[host] -= 1
+        if self._inflight[host] <= 0:
+            del self._inflight[host]
+
+    def empty(self) -> bool:
+        return self._exhausted and self._deferred_count == 0
+
+
+class ScanScheduler:
+    """
+    전체 타겟의 (host, port, proto) 작업을 하나의 공유 pool에서 처리하는 스케줄러.
+    - max_workers     : 전역 in-flight 상한
+    - per_host_limit  : 호스트별 in-flight 상한 (느린 호스트가 pool을 독점하지 않도록)
+    - backend         : "thread" (ThreadPoolExecutor) / "async" (asyncio 이벤트 루프)
+    run()은 작업이 끝나는 순서대로 (host, result)를 yield 한다.
+    """
+
+    def __init__(
+        self,
+        probes: Dict[str, SyncProbe],
+        async_probes: Dict[str, AsyncProbe] | None = None,
+        max_workers: int = 100,
+        per_host_limit: int | None = None,
+        backend: str = "thread",
+    ):
+        self.probes = probes
+        self.async_probes = async_probes or {}
+        self.max_workers = max(1, max_workers)
+        self.per_host_limit = max(1, per_host_limit or self.max_workers)
+        self.backend = backend
+
+    def _source(self, tasks: Iterable[ScanTask]) -> _TaskSource:
+        return _TaskSource(tasks, self.per_host_limit, max_deferred=self.max_workers * 4)
+
+    def run(self, tasks: Iterable[ScanTask]) -> Iterator[Tuple[str, Any]]:
+        if self.backend == "async":
+            return self._run_async(tasks)
+        return self._run_threaded(tasks)
+
+    # =====================================================
+    # ThreadPoolExecutor backend
+    # =====================================================
+    def _run_threaded(self, tasks: Iterable[ScanTask]) -> Iterator[Tuple[str, Any]]:
+        source = self._source(tasks)
+        completed: "queue.SimpleQueue" = queue.SimpleQueue()
+        inflight = 0
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            while True:
+                while inflight < self.max_workers:
+                    task = source.next()
+                    if task is None:
+                        break
+                    host, port, proto = task
+                    fut = executor.submit(self.probes[proto], host, port)
+                    fut.add_done_callback(lambda f, h=host: completed.put((h, f)))
+                    inflight += 1
+
+                if inflight == 0 and source.empty():
+                    break
+
+                host, fut = completed.get()
+                inflight -= 1
+                source.done(host)
+                yield host, fut.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    # =====================================================
+    # asyncio backend (이벤트 루프는 별도 스레드에서 실행)
+    # =====================================================
+    def _run_async(self, tasks: Iterable[ScanTask]) -> Iterator[Tuple[str, Any]]:
+        out: "queue.SimpleQueue" = queue.SimpleQueue()
+        stop = threading.Event()
+
+        def runner() -> None:
+            try:
+                asyncio.run(self._async_main(tasks, out, stop))
+                out.put(_DONE)
+            except BaseException as e:  # 디스패처 예외는 소비자 스레드로 전달
+                out.put(e)
+
+        t = threading.Thread(target=runner, name="scan-scheduler", daemon=True)
+        t.start()
+        try:
+            while True:
+                item = out.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            t.join()
+
+    async def _async_main(self, tasks: Iterable[ScanTask], out: "queue.SimpleQueue", stop: threading.Event) -> None:
+        loop = asyncio.get_running_loop()
+        source = self._source(tasks)
+        slot_free = asyncio.Event()
+        running: set = set()
+        inflight = 0
+        errors: list = []
+
+        # async probe가 없는 프로토콜은 전용 스레드 풀에서 sync probe 실행
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        async def run_one(task: ScanTask) -> None:
+            nonlocal inflight
+            host, port, proto = task
+            try:
+                probe = self.async_probes.get(proto)
+                if probe is not None:
+                    res = await probe(host, port)
+                else:
+                    res = await loop.run_in_executor(executor, self.probes[proto], host, port)
+                out.put((host, res))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                inflight -= 1
+                source.done(host)
+                slot_free.set()
+
+        try:
+            while not errors and not stop.is_set():
+                task = source.next() if inflight < self.max_workers else None
+                if task is not None:
+                    inflight += 1
+                    t = loop.create_task(run_one(task))
+                    running.add(t)
+                    t.add_done_callback(running.discard)
+                    continue
+
+                if inflight == 0 and source.empty():
+                    break
+
+                slot_free.clear()
+                await slot_free.wait()
+
+            if running:
+                if stop.is_set():
+                    for t in running:
+                        t.cancel()
+                await asyncio.gather(*running, return_exceptions=True)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if errors:
+            raise errors[0]
+
+
+def merge_streams(*streams: Iterable[Any]) -> Iterator[Any]:
+    """
+    여러 결과 iterator를 각각 별도 스레드에서 소비하며 도착 순서대로 합쳐 yield.
+    (예: TCP 스케줄러 + 배치 UDP 엔진을 동시에 진행)
+    """
+    out: "queue.SimpleQueue" = queue.SimpleQueue()
+    stop = threading.Event()
+
+    def pump(stream: Iterable[Any]) -> None:
+        try:
+            for item in stream:
+                out.put(("item", item))
+                if stop.is_set():
+                    break
+            out.put(("done", None))
+        except BaseException as e:
+            out.put(("error", e))
+
+    threads = [
+        threading.Thread(target=pump, args=(s,), name="scan-merge", daemon=True)
+        for s in streams
+    ]
+    for t in threads:
+        t.start()
+
+    try:
+        alive = len(threads)
+        while alive:
+            kind, value = out.get()
+            if kind == "item":
+                yield value
+            elif kind == "done":
+                alive -= 1
+            else:
+                raise value
+    finally:
+        stop.set()
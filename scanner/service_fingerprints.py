@@ -1,7 +1,16 @@
 # scanner/service_fingerprints.py
+from __future__ import annotations
+
+import os
+from array import array
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterable, List, Tuple
 
 # (protocol, service_name)
 # protocol: "tcp", "udp", "both"
+# services.txt를 만들 때 우선 적용한 항목 (UDP payload / 시그니처에서 쓰는 내부 서비스 이름)
+# 조회는 guess_service() → services DB 사용
 PORT_SERVICE_MAP: dict[int, tuple[str, str]] = {
 
     # TCP 
@@ -48,13 +57,89 @@ PORT_SERVICE_MAP: dict[int, tuple[str, str]] = {
     11211: ("udp", "memcached"),
 }
 
+SERVICES_PATH = os.path.join(os.path.dirname(__file__), "services.txt")
+
+
+class ServicesDB:
+    """
+    (protocol, port) → 서비스 이름 / open 빈도 (services.txt, nmap-services 형식).
+    - 프로토콜별로 65536칸 array 2개 (이름 번호 'H', 빈도 'f') → 조회 O(1), 약 0.8MB
+    - 이름 번호 0은 미등록 포트("unknown")
+    """
+
+    PROTOCOLS = ("tcp", "udp")
+
+    def __init__(self, entries: Iterable[Tuple[str, int, str, float]]):
+        self.names: List[str] = ["unknown"]
+        name_ids: Dict[str, int] = {"unknown": 0}
+        self._name_idx = {p: array("H", bytes(2 * 65536)) for p in self.PROTOCOLS}
+        self._freq = {p: array("f", bytes(4 * 65536)) for p in self.PROTOCOLS}
+        registered: Dict[str, List[int]] = {p: [] for p in self.PROTOCOLS}
+
+        for name, port, protocol, freq in entries:
+            if protocol not in self._name_idx or not 0 < port <= 65535:
+                continue
+            idx = name_ids.get(name)
+            if idx is None:
+                idx = name_ids[name] = len(self.names)
+                self.names.append(name)
+            self._name_idx[protocol][port] = idx
+            self._freq[protocol][port] = freq
+            registered[protocol].append(port)
+
+        # 빈도 순위 (빈도 있는 포트 → 빈도 없는 등록 포트 순)
+        self._ranked = {p: self.order_by_frequency(set(ports), p) for p, ports in registered.items()}
+
+    @classmethod
+    def load(cls, path: str = SERVICES_PATH) -> "ServicesDB":
+        def entries():
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.split("#", 1)[0].strip()
+                    if not line:
+                        continue
+                    name, port_proto, freq = line.split()[:3]
+                    port, protocol = port_proto.split("/")
+                    yield name, int(port), protocol, float(freq)
+        return cls(entries())
+
+    def name(self, protocol: str, port: int) -> str:
+        return self.names[self._name_idx[protocol][port]] if 0 < port <= 65535 else "unknown"
+
+    def frequency(self, protocol: str, port: int) -> float:
+        return self._freq[protocol][port] if 0 < port <= 65535 else 0.0
+
+    def order_by_frequency(self, ports: Iterable[int], protocol: str = "tcp") -> List[int]:
+        """열려 있을 가능성이 높은 포트부터 (빈도 같으면 포트 번호 순)."""
+        freq = self._freq[protocol]
+        return sorted(ports, key=lambda p: (-freq[p], p))
+
+    def top_ports(self, n: int, protocol: str = "tcp") -> List[int]:
+        """빈도 상위 n개 포트 (등록 포트보다 많이 요청하면 나머지는 포트 번호 순으로 채움)."""
+        ranked = self._ranked[protocol]
+        if n <= len(ranked):
+            return ranked[:n]
+        seen = set(ranked)
+        rest = (p for p in range(1, 65536) if p not in seen)
+        return ranked + list(islice(rest, n - len(ranked)))
+
+
+@lru_cache(maxsize=1)
+def load_services_db() -> ServicesDB:
+    """기본 services DB (프로세스당 한 번만 로드)."""
+    return ServicesDB.load()
+
+
+def top_ports(n: int, protocol: str = "tcp") -> List[int]:
+    return load_services_db().top_ports(n, protocol)
+
+
+def order_by_frequency(ports: Iterable[int], protocol: str = "tcp") -> List[int]:
+    return load_services_db().order_by_frequency(ports, protocol)
 
 
-def guess_service(port: int) -> str | None:
-    """포트 번호로 기본 서비스 이름 추정."""
-    entry = PORT_SERVICE_MAP.get(port)
-    if entry is None:
-        return "unknown"
-    return entry[1]   # 서비스 이름
+def guess_service(port: int, protocol: str = "tcp") -> str | None:
+    """(포트, 프로토콜)로 기본 서비스 이름 추정 (services DB에 없으면 "unknown")."""
+    return load_services_db().name(protocol, port)
 
 
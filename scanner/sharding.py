@@ -0,0 +1,116 @@
+# scanner/sharding.py
+from __future__ import annotations
+
+import ipaddress
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from .result_store import HostResults, PortLayout
+from .scheduler import ScanTask
+
+# (shard 번호 1..N, 전체 shard 수 N)
+Shard = Tuple[int, int]
+
+
+def parse_shard(spec: str) -> Shard:
+    """'i/N' 형식 파싱 (1 <= i <= N)."""
+    try:
+        index_str, count_str = spec.split("/", 1)
+        index, count = int(index_str), int(count_str)
+    except ValueError:
+        raise ValueError(f"invalid shard spec: {spec!r} (expected i/N)")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"invalid shard spec: {spec!r} (expected 1 <= i <= N)")
+    return index, count
+
+
+def shard_filter(layout: PortLayout, shard: Shard) -> Callable[[ScanTask], bool]:
+    """
+    (host, port, proto) 작업이 이 shard 담당인지 판정하는 함수.
+    - key = 주소 정수값 × slot 수 + slot → key mod N == i-1
+    - 호스트 순서 / 스캔 순서(randomize, discovery 결과 순서)와 무관하게 결정적
+    - 연속된 주소 × 포트 공간을 N개로 고르게 나눔
+    """
+    index, count = shard
+    n_slots = max(1, len(layout))
+    cache: Dict[str, int] = {}
+
+    def keep(task: ScanTask) -> bool:
+        host, port, proto = task
+        base = cache.get(host)
+        if base is None:
+            if len(cache) > 4096:
+                cache.clear()
+            base = cache[host] = int(ipaddress.ip_address(host)) * n_slots
+        return (base + layout.slot(proto, port)) % count == index - 1
+
+    return keep
+
+
+def merge_shard_results(shards: Iterable[Dict], scan_id: str | None = None) -> Dict:
+    """
+    shard 출력(checkpoint.load_scan_file 형식) 여러 개를 하나의 스캔 결과로 병합.
+    - shard끼리는 담당 포트가 겹치지 않으므로 상태 배열을 OR로 합침
+    - 반환값은 ScanRun.result()와 같은 형식 (호스트별 results = HostResults)
+    """
+    shards = list(shards)
+    if not shards:
+        raise ValueError("no shard results to merge")
+
+    first = shards[0]
+    for s in shards[1:]:
+        if s["layout"] != first["layout"] or s["scan_type"] != first["scan_type"]:
+            raise ValueError(f"shard {s['scan_id']} was run with different ports / scan type")
+
+    layout = PortLayout(first["layout"]["tcp"], first["layout"]["udp"])
+    n_bytes = len(layout)
+
+    targets: List[Dict] = []
+    hosts: Dict[str, Dict] = {}
+    errors: set = set()
+
+    for s in shards:
+        for t in s["targets"]:
+            ip = t["ip"]
+            if "states" not in t:
+                if ip not in errors:
+                    errors.add(ip)
+                    targets.append({**t, "results": []})
+                continue
+
+            merged = hosts.get(ip)
+            if merged is None:
+                merged = hosts[ip] = {k: v for k, v in t.items() if k not in ("states", "records")}
+                merged["results"] = HostResults.restore(layout, t["states"], t.get("records", ()))
+                targets.append(merged)
+                continue
+
+            results = merged["results"]
+            combined = int.from_bytes(results.states, "big") | int.from_bytes(t["states"], "big")
+            results.states[:] = combined.to_bytes(n_bytes, "big")
+            results.records.update(HostResults.restore(layout, t["states"], t.get("records", ())).records)
+
+            # discovery 판정은 shard마다 따로 하므로 한 곳이라도 up이면 up
+            if t.get("status") == "up":
+                merged["status"] = "up"
+                merged["discovery"] = t.get("discovery")
+
+    result = {
+        "scan_id": scan_id or first["scan_id"],
+        "scan_type": first["scan_type"],
+        "started_at": min(s["started_at"] for s in shards),
+        "finished_at": max(s.get("finished_at") or s["saved_at"] for s in shards),
+        "targets": targets,
+        "port_range": first["port_range"],
+        "shards": len(shards),
+    }
+    if first.get("target"):
+        result["target"] = first["target"]
+    flushed = [s["flushed"] for s in shards if s.get("flushed")]
+    if flushed:
+        # flush_hosts로 정리된 호스트 수 (shard마다 따로 세므로 같은 호스트가 여러 번 들어갈 수 있음)
+        result["flushed"] = {k: sum(f.get(k, 0) for f in flushed) for k in ("up", "down")}
+    discoveries = [s["discovery"] for s in shards if s.get("discovery")]
+    if discoveries:
+        hosts_up = sum(1 for e in hosts.values() if e.get("status") == "up")
+        result["discovery"] = {**discoveries[0], "hosts_up": hosts_up, "hosts_down": len(hosts) - hosts_up}
+    return result
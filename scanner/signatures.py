@@ -0,0 +1,109 @@
+# scanner/signatures.py
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from typing import Dict, List
+
+SIGNATURES_PATH = os.path.join(os.path.dirname(__file__), "signatures.json")
+
+# 배너 토큰 분리 (영숫자 연속 구간 단위)
+_TOKEN_SPLIT = re.compile(r"[^a-z0-9]+")
+
+
+@dataclass
+class ServiceMatch:
+    product: str
+    version: str | None
+    service: str        # 시그니처가 속한 서비스 (포트 기반 추정과 다를 수 있음)
+    signature_id: str
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class _Signature:
+    __slots__ = ("id", "service", "product", "keyword", "regex", "priority")
+
+    def __init__(self, raw: Dict, priority: int):
+        self.id = raw["id"]
+        self.service = raw.get("service", "*")
+        self.product = raw["product"]
+        self.keyword = (raw.get("keyword") or "").lower() or None
+        if self.keyword and _TOKEN_SPLIT.search(self.keyword):
+            # 배너는 영숫자 구간 단위로 색인하므로 구분자가 들어간 keyword는 절대 매칭되지 않음
+            raise ValueError(f"signature {self.id}: keyword {self.keyword!r} is not a single [a-z0-9] token")
+        self.regex = re.compile(raw["pattern"], re.IGNORECASE | re.MULTILINE)
+        self.priority = priority
+
+
+class SignatureDB:
+    """
+    배너 → (product, version) 시그니처 DB.
+    - 패턴은 로드 시 한 번만 컴파일
+    - 시그니처마다 keyword(배너에 반드시 나오는 토큰) 지정
+      → 배너를 토큰으로 나눠 keyword 색인에서 후보만 골라 regex 실행
+      (시그니처 수가 늘어도 배너당 비용은 토큰 수 + 후보 수에 비례)
+    - keyword가 없는 시그니처는 해당 서비스 배너에 항상 시도
+    - 후보는 포트 기반 서비스와 같은 시그니처 → 파일 순서 우선
+    """
+
+    def __init__(self, signatures: List[Dict]):
+        self.signatures = [_Signature(raw, i) for i, raw in enumerate(signatures)]
+        self._by_keyword: Dict[str, List[_Signature]] = {}
+        self._unindexed: Dict[str, List[_Signature]] = {}
+
+        for sig in self.signatures:
+            if sig.keyword:
+                self._by_keyword.setdefault(sig.keyword, []).append(sig)
+            else:
+                self._unindexed.setdefault(sig.service, []).append(sig)
+
+    @classmethod
+    def load(cls, path: str = SIGNATURES_PATH) -> "SignatureDB":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["signatures"])
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def candidates(self, banner: str, service: str | None = None) -> List[_Signature]:
+        found: Dict[str, _Signature] = {}
+        for token in set(_TOKEN_SPLIT.split(banner.lower())):
+            for sig in self._by_keyword.get(token, ()):
+                found[sig.id] = sig
+        for sig in self._unindexed.get(service or "", ()):
+            found[sig.id] = sig
+        for sig in self._unindexed.get("*", ()):
+            found[sig.id] = sig
+        return sorted(found.values(), key=lambda s: (s.service not in (service, "*"), s.priority))
+
+    def match(self, banner: str | None, service: str | None = None) -> ServiceMatch | None:
+        if not banner:
+            return None
+        for sig in self.candidates(banner, service):
+            m = sig.regex.search(banner)
+            if m is None:
+                continue
+            version = m.groupdict().get("version")
+            return ServiceMatch(
+                product=sig.product,
+                version=version.strip() if version else None,
+                service=sig.service,
+                signature_id=sig.id,
+            )
+        return None
+
+
+@lru_cache(maxsize=1)
+def load_signature_db() -> SignatureDB:
+    """기본 시그니처 DB (프로세스당 한 번만 로드)."""
+    return SignatureDB.load()
+
+
+def match_banner(banner: str | None, service: str | None = None) -> ServiceMatch | None:
+    return load_signature_db().match(banner, service)
@@ -0,0 +1,356 @@
+# scanner/simnet.py
+"""
+프로세스 내부 가상 네트워크 (transport.py 교체용).
+실제 소켓 없이 timeout / filtering / 재전송 / tarpit 동작을 가상 시간으로 재현한다.
+
+    net = SimNetwork(seed=1)
+    net.add_host("10.0.0.1", SimHost(
+        tcp={22: SimService(banner=b"SSH-2.0-OpenSSH_8.9\\r\\n"), 25: "filtered"},
+        udp={53: b"\\x00" * 12, 161: "filtered"},
+        latency=0.02, jitter=0.01, loss=0.05, icmp_rate=1,
+    ))
+    with use_transport(net):
+        results = threaded_scan("10.0.0.1", "1-1024", timeout=1.0)
+    net.clock.elapsed()   # 가상 시간으로 걸린 시간 (실제로는 수 ms)
+
+- 시간: 스레드마다 가상 타임라인 (blocking 호출이 자기 스레드 시계만 진행)
+  → worker pool은 병렬로 계산되고, elapsed()는 가장 늦은 스레드 기준
+  새 스레드는 clock.floor에서 시작 (단계 사이에 clock.sync()로 floor를 당김)
+- 손실 / 지연 난수는 (종류, 호스트, 포트, 시도 번호)로 시드 → 스레드 실행 순서와 무관하게 재현됨
+  (호스트 단위 ICMP rate limit만 여러 스레드가 공유하는 상태라 순차 스캔에서만 완전히 결정적)
+- 네트워크에 없는 호스트 / down 호스트는 모든 패킷 drop
+"""
+from __future__ import annotations
+
+import random
+import socket
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple, Union
+
+ECONNREFUSED = 111
+
+# RTT 분포: 고정값(초) 또는 rng → RTT 함수
+Latency = Union[float, Callable[[random.Random], float]]
+
+
+class VirtualClock:
+    """스레드별 가상 시계 (transport.monotonic / sleep 구현)."""
+
+    def __init__(self, start: float = 0.0):
+        self.start = start
+        self.floor = start
+        self._max = start
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        t = getattr(self._local, "t", None)
+        if t is None:
+            t = self._local.t = self.floor
+        return t
+
+    def advance(self, seconds: float) -> float:
+        return self.advance_to(self.now() + max(0.0, seconds))
+
+    def advance_to(self, t: float) -> float:
+        t = max(self.now(), t)
+        self._local.t = t
+        with self._lock:
+            if t > self._max:
+                self._max = t
+        return t
+
+    def sync(self) -> float:
+        """지금까지의 가장 늦은 시각으로 floor와 현재 스레드 시계를 맞춤 (단계 구분용)."""
+        with self._lock:
+            self.floor = self._max
+        self._local.t = self.floor
+        return self.floor
+
+    def elapsed(self) -> float:
+        return max(self._max, self.now()) - self.start
+
+
+@dataclass
+class SimService:
+    """
+    open TCP 포트의 동작.
+    - banner: 연결 직후 보내는 배너 (banner_delay 후)
+    - drip > 0: 배너를 drip 바이트씩 drip_interval 간격으로 전송 (slow-drip / tarpit)
+    - responses: 요청 prefix → 응답 (가장 긴 prefix 우선, b""는 모든 요청에 매칭)
+    - close_after: 배너 / 응답을 다 보낸 뒤 연결 종료 (EOF)
+    """
+    banner: bytes = b""
+    banner_delay: float = 0.0
+    drip: int = 0
+    drip_interval: float = 0.0
+    responses: Dict[bytes, bytes] = field(default_factory=dict)
+    close_after: bool = False
+
+    def respond(self, request: bytes) -> bytes | None:
+        for prefix in sorted(self.responses, key=len, reverse=True):
+            if request.startswith(prefix):
+                return self.responses[prefix]
+        return None
+
+
+@dataclass
+class SimHost:
+    """
+    가상 호스트.
+    - tcp: 포트 → SimService(open) / "closed"(RST) / "filtered"(drop)
+    - udp: 포트 → 응답 bytes(open) / "echo" / "closed"(ICMP unreachable) / "filtered"(drop)
+    - latency(+ 균등분포 jitter): 왕복 시간 / loss: 방향마다 패킷 손실 확률
+    - icmp_rate / icmp_burst: ICMP unreachable 초당 상한 (0이면 제한 없음, Linux 기본은 약 1000/s)
+    """
+    tcp: Dict[int, SimService | str] = field(default_factory=dict)
+    udp: Dict[int, bytes | str] = field(default_factory=dict)
+    default_tcp: str = "closed"
+    default_udp: str = "closed"
+    latency: Latency = 0.001
+    jitter: float = 0.0
+    loss: float = 0.0
+    icmp_rate: float = 0.0
+    icmp_burst: float = 1.0
+    up: bool = True
+    _icmp_tokens: float | None = field(default=None, init=False, repr=False)
+    _icmp_last: float = field(default=0.0, init=False, repr=False)
+
+    def rtt(self, rng: random.Random) -> float:
+        base = self.latency(rng) if callable(self.latency) else self.latency
+        return max(0.0, base + (rng.uniform(0, self.jitter) if self.jitter else 0.0))
+
+    def lost(self, rng: random.Random) -> bool:
+        return self.loss > 0 and rng.random() < self.loss
+
+    def icmp_allowed(self, now: float) -> bool:
+        if self.icmp_rate <= 0:
+            return True
+        if self._icmp_tokens is None:
+            self._icmp_tokens, self._icmp_last = self.icmp_burst, now
+        self._icmp_tokens = min(self.icmp_burst, self._icmp_tokens + max(0.0, now - self._icmp_last) * self.icmp_rate)
+        self._icmp_last = max(self._icmp_last, now)
+        if self._icmp_tokens < 1.0:
+            return False
+        self._icmp_tokens -= 1.0
+        return True
+
+
+# 수신 큐 항목: (도착 시각, 데이터 | None(EOF) | OSError)
+_Arrival = Tuple[float, "bytes | OSError | None"]
+
+
+class _SimSocket:
+    """socket.socket 중 스캐너가 쓰는 부분만 흉내 냄."""
+
+    def __init__(self, net: "SimNetwork", family: int, type_: int):
+        self.net = net
+        self.family = family
+        self.type = type_
+        self.timeout: float | None = None
+        self.peer: Tuple[str, int] | None = None
+        self.closed = False
+        self._queue: List[_Arrival] = []
+
+    def settimeout(self, timeout: float | None) -> None:
+        self.timeout = timeout
+
+    def setblocking(self, flag: bool) -> None:
+        self.timeout = None if flag else 0.0
+
+    def getpeername(self) -> Tuple[str, int]:
+        if self.peer is None:
+            raise OSError(107, "Transport endpoint is not connected")
+        return self.peer
+
+    def close(self) -> None:
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _arrive(self, at: float, item) -> None:
+        self._queue.append((at, item))
+        self._queue.sort(key=lambda a: a[0])
+
+    def recv(self, bufsize: int) -> bytes:
+        clock = self.net.clock
+        now = clock.now()
+        deadline = now + self.timeout if self.timeout is not None else float("inf")
+
+        if not self._queue or self._queue[0][0] > deadline:
+            if deadline == float("inf"):
+                raise socket.timeout("timed out (simnet: blocking recv with nothing scheduled)")
+            clock.advance_to(deadline)
+            raise socket.timeout("timed out")
+
+        at, item = self._queue[0]
+        clock.advance_to(at)
+        if isinstance(item, OSError):
+            self._queue.pop(0)
+            raise item
+        if item is None:
+            return b""   # EOF는 큐에 남겨 둠 (이후 recv도 b"")
+
+        # 이미 도착한 연속 데이터는 한 번에 반환
+        out = bytearray()
+        while self._queue and len(out) < bufsize:
+            at, item = self._queue[0]
+            if at > clock.now() or not isinstance(item, bytes):
+                break
+            take = item[: bufsize - len(out)]
+            out += take
+            if len(take) < len(item):
+                self._queue[0] = (at, item[len(take):])
+            else:
+                self._queue.pop(0)
+        return bytes(out)
+
+
+class SimTCPSocket(_SimSocket):
+
+    def __init__(self, net: "SimNetwork", host: SimHost, service: SimService, peer: Tuple[str, int]):
+        super().__init__(net, socket.AF_INET6 if ":" in peer[0] else socket.AF_INET, socket.SOCK_STREAM)
+        self.host = host
+        self.service = service
+        self.peer = peer
+        self._schedule(service.banner, net.clock.now() + service.banner_delay)
+
+    def _schedule(self, data: bytes, at: float) -> None:
+        svc = self.service
+        if data:
+            step = svc.drip if svc.drip > 0 else len(data)
+            for i in range(0, len(data), step):
+                self._arrive(at + (i // step) * svc.drip_interval, data[i:i + step])
+            at += ((len(data) - 1) // step) * svc.drip_interval
+        if data and svc.close_after:
+            self._arrive(at, None)
+
+    def sendall(self, data: bytes) -> None:
+        if self.closed:
+            raise OSError(9, "Bad file descriptor")
+        if self._queue and self._queue[-1][1] is None and self._queue[-1][0] <= self.net.clock.now():
+            raise BrokenPipeError(32, "Broken pipe")
+        response = self.service.respond(bytes(data))
+        if response is not None:
+            rng = self.net.rng("tcp-data", self.peer[0], self.peer[1])
+            self._schedule(response, self.net.clock.now() + self.host.rtt(rng))
+
+    def send(self, data: bytes) -> int:
+        self.sendall(data)
+        return len(data)
+
+
+class SimUDPSocket(_SimSocket):
+
+    def __init__(self, net: "SimNetwork", family: int):
+        super().__init__(net, family, socket.SOCK_DGRAM)
+
+    def connect(self, address: Tuple[str, int]) -> None:
+        self.peer = (address[0], address[1])
+
+    def send(self, data: bytes) -> int:
+        if self.peer is None:
+            raise OSError(89, "Destination address required")
+        net = self.net
+        ip, port = self.peer
+        host = net.hosts.get(ip)
+        rng = net.rng("udp", ip, port)
+        net.count("udp_sent")
+
+        if host is None or not host.up or host.lost(rng):
+            return len(data)
+        spec = host.udp.get(port, host.default_udp)
+        if spec == "filtered":
+            return len(data)
+
+        at = net.clock.now() + host.rtt(rng)
+        if spec == "closed":
+            if net.icmp_allowed(host) and not host.lost(rng):
+                net.count("icmp_sent")
+                self._arrive(at, ConnectionRefusedError(ECONNREFUSED, "Connection refused"))
+            return len(data)
+        if not host.lost(rng):
+            self._arrive(at, bytes(data) if spec == "echo" else spec)
+        return len(data)
+
+    def sendto(self, data: bytes, address: Tuple[str, int]) -> int:
+        self.connect(address)
+        return self.send(data)
+
+
+class SimNetwork:
+    """
+    가상 네트워크 transport (transport.SocketTransport와 같은 인터페이스).
+    stats: connect / udp 전송 / ICMP 응답 수 (재전송·rate limit 검증용)
+    """
+
+    def __init__(self, hosts: Dict[str, SimHost] | None = None, seed: int = 0, clock: VirtualClock | None = None):
+        self.hosts: Dict[str, SimHost] = dict(hosts or {})
+        self.seed = seed
+        self.clock = clock or VirtualClock()
+        self.stats: Dict[str, int] = {"tcp_connects": 0, "udp_sent": 0, "icmp_sent": 0}
+        self._attempts: Dict[tuple, int] = {}
+        self._lock = threading.Lock()
+
+    def add_host(self, ip: str, host: SimHost) -> SimHost:
+        self.hosts[ip] = host
+        return host
+
+    def rng(self, kind: str, ip: str, port: int) -> random.Random:
+        """(종류, 호스트, 포트)별 n번째 시도의 난수 생성기."""
+        key = (kind, ip, port)
+        with self._lock:
+            n = self._attempts.get(key, 0)
+            self._attempts[key] = n + 1
+        return random.Random(f"{self.seed}|{kind}|{ip}|{port}|{n}")
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def icmp_allowed(self, host: SimHost) -> bool:
+        with self._lock:
+            return host.icmp_allowed(self.clock.now())
+
+    # ---- transport 인터페이스 ----
+
+    def create_connection(self, address: Tuple[str, int], timeout: float | None = None) -> SimTCPSocket:
+        ip, port = address[0], address[1]
+        host = self.hosts.get(ip)
+        rng = self.rng("tcp", ip, port)
+        wait = float("inf") if timeout is None else timeout
+        self.count("tcp_connects")
+
+        spec = host.tcp.get(port, host.default_tcp) if host is not None and host.up else "filtered"
+        # SYN 또는 응답(SYN-ACK / RST) 손실은 drop과 같음
+        if spec != "filtered" and (host.lost(rng) or host.lost(rng)):
+            spec = "filtered"
+        rtt = host.rtt(rng) if spec != "filtered" else wait
+
+        if spec == "filtered" or rtt > wait:
+            if wait == float("inf"):
+                raise socket.timeout("timed out (simnet: blocking connect to a dropping port)")
+            self.clock.advance(wait)
+            raise socket.timeout("timed out")
+
+        self.clock.advance(rtt)
+        if spec == "closed" or not isinstance(spec, SimService):
+            raise ConnectionRefusedError(ECONNREFUSED, "Connection refused")
+
+        sock = SimTCPSocket(self, host, spec, (ip, port))
+        sock.settimeout(timeout)
+        return sock
+
+    def udp_socket(self, family: int = socket.AF_INET) -> SimUDPSocket:
+        return SimUDPSocket(self, family)
+
+    def monotonic(self) -> float:
+        return self.clock.now()
+
+    def sleep(self, seconds: float) -> None:
+        self.clock.advance(seconds)
@@ -0,0 +1,284 @@
+# scanner/targets.py
+from __future__ import annotations
+
+import bisect
+import ipaddress
+import math
+import random
+from typing import Iterable, Iterator, List, Tuple
+
+# (첫 주소 정수값, 주소 개수, IP 버전)
+Segment = Tuple[int, int, int]
+
+
+# =====================================================
+# 타겟 스펙 파싱
+#   - "10.0.0.1"               단일 IP
+#   - "10.0.0.0/16"            CIDR
+#   - "10.0.1.5-10.0.1.200"    범위 (전체 주소)
+#   - "10.0.1.5-200"           범위 (마지막 옥텟만)
+# =====================================================
+
+def parse_target_spec(spec: str) -> Segment | None:
+    """타겟 스펙을 (시작 주소, 개수, 버전) 구간으로 변환. IP 형식이 아니면 None."""
+    spec = spec.strip()
+    if not spec:
+        return None
+
+    try:
+        if "/" in spec:
+            net = ipaddress.ip_network(spec, strict=False)
+            first, count = int(net.network_address), net.num_addresses
+            # IPv4 /31 미만 네트워크는 network/broadcast 주소 제외 (ip_network.hosts()와 동일)
+            if net.version == 4 and net.prefixlen < 31:
+                first, count = first + 1, count - 2
+            elif net.version == 6 and net.prefixlen < 127:
+                first, count = first + 1, count - 1
+            return (first, count, net.version)
+
+        if "-" in spec:
+            start_str, end_str = spec.split("-", 1)
+            start = ipaddress.ip_address(start_str.strip())
+            end_str = end_str.strip()
+            if start.version == 4 and end_str.isdigit():
+                # "10.0.1.5-200" → 마지막 옥텟만 지정
+                end = ipaddress.ip_address(".".join(str(start).split(".")[:3] + [end_str]))
+            else:
+                end = ipaddress.ip_address(end_str)
+            if start.version != end.version:
+                return None
+            lo, hi = sorted((int(start), int(end)))
+            return (lo, hi - lo + 1, start.version)
+
+        addr = ipaddress.ip_address(spec)
+        return (int(addr), 1, addr.version)
+
+    except ValueError:
+        return None
+
+
+def _segment_addr(seg: Segment, offset: int) -> str:
+    first, _, version = seg
+    if version == 4:
+        return str(ipaddress.IPv4Address(first + offset))
+    return str(ipaddress.IPv6Address(first + offset))
+
+
+def expand_target(spec: str) -> Iterator[str]:
+    """
+    타겟 스펙 하나를 주소 문자열로 lazy 전개.
+    IP/CIDR/범위가 아니면(도메인 등) 원문 그대로 yield.
+    """
+    seg = parse_target_spec(spec)
+    if seg is None:
+        spec = spec.strip()
+        if spec:
+            yield spec
+        return
+
+    for i in range(seg[1]):
+        yield _segment_addr(seg, i)
+
+
+def iter_target_file(path: str) -> Iterator[str]:
+    """
+    -iL 타겟 파일을 한 줄씩 읽어 스펙 단위로 yield.
+    - 빈 줄 / '#' 주석 무시
+    - 한 줄에 공백·쉼표로 구분된 여러 스펙 허용
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0]
+            for spec in line.replace(",", " ").split():
+                yield spec
+
+
+def iter_target_specs(specs: Iterable[str] = (), input_file: str | None = None) -> Iterator[str]:
+    for spec in specs:
+        # "--target 10.0.0.1,10.0.0.0/24" 형식 지원
+        for part in spec.split(","):
+            if part.strip():
+                yield part.strip()
+    if input_file:
+        yield from iter_target_file(input_file)
+
+
+def iter_targets(specs: Iterable[str] = (), input_file: str | None = None) -> Iterator[str]:
+    """스펙 목록 + 타겟 파일을 주소 단위로 lazy 전개 (리스트로 만들지 않음)."""
+    for spec in iter_target_specs(specs, input_file):
+        yield from expand_target(spec)
+
+
+class TargetSpecs:
+    """
+    iter_target_specs를 여러 번 순회할 수 있게 감싼 것.
+    -iL 파일은 순회할 때마다 다시 읽음 (파일 전체를 메모리에 올리지 않음).
+    """
+
+    def __init__(self, specs: Iterable[str] = (), input_file: str | None = None):
+        self.specs = list(specs)
+        self.input_file = input_file
+
+    def __iter__(self) -> Iterator[str]:
+        return iter_target_specs(self.specs, self.input_file)
+
+
+class TargetSpace:
+    """
+    인덱스로 접근 가능한 타겟 주소 공간.
+    주소를 펼치지 않고 구간(Segment) 목록만 보관하므로 /8도 상수 메모리.
+    겹치거나 이어지는 구간은 합쳐서 (버전, 주소) 순으로 정렬 → 같은 주소는 한 번만 나옴
+    """
+
+    def __init__(self, specs: Iterable[str] = (), input_file: str | None = None):
+        self.invalid: List[str] = []    # IP로 해석되지 않은 스펙 (도메인 등)
+        segments: List[Segment] = []
+        for spec in iter_target_specs(specs, input_file):
+            seg = parse_target_spec(spec)
+            if seg is None:
+                self.invalid.append(spec)
+            elif seg[1] > 0:
+                segments.append(seg)
+
+        self._segments: List[Segment] = []
+        self._offsets: List[int] = []   # 각 구간의 시작 인덱스 (누적)
+        self._keys: List[Tuple[int, int]] = []   # 각 구간의 (버전, 시작 주소) → 주소 탐색용
+        self._size = 0
+        for first, count, version in sorted(segments, key=lambda s: (s[2], s[0])):
+            if self._segments:
+                p_first, p_count, p_version = self._segments[-1]
+                if p_version == version and first <= p_first + p_count:
+                    end = max(p_first + p_count, first + count)
+                    self._size += end - (p_first + p_count)
+                    self._segments[-1] = (p_first, end - p_first, version)
+                    continue
+            self._segments.append((first, count, version))
+            self._offsets.append(self._size)
+            self._keys.append((version, first))
+            self._size += count
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[str]:
+        for seg in self._segments:
+            for i in range(seg[1]):
+                yield _segment_addr(seg, i)
+
+    def index(self, ip: object) -> int | None:
+        """주소의 인덱스 (space[i] == ip). 타겟 공간에 없으면 None."""
+        try:
+            addr = ipaddress.ip_address(str(ip))
+        except ValueError:
+            return None
+        value = int(addr)
+        k = bisect.bisect_right(self._keys, (addr.version, value)) - 1
+        if k < 0:
+            return None
+        first, count, version = self._segments[k]
+        if version != addr.version or not first <= value < first + count:
+            return None
+        return self._offsets[k] + value - first
+
+    def __contains__(self, ip: object) -> bool:
+        return self.index(ip) is not None
+
+    def __getitem__(self, index: int) -> str:
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        k = bisect.bisect_right(self._offsets, index) - 1
+        return _segment_addr(self._segments[k], index - self._offsets[k])
+
+
+# =====================================================
+# 순환군(Z_p^*) 기반 순열
+#   - p: n보다 큰 소수, g: 원시근
+#   - x → x·g mod p 를 p-1번 반복하면 1..p-1을 한 번씩 방문
+#   - 상태는 정수 몇 개뿐이므로 공간 크기와 무관하게 상수 메모리
+# =====================================================
+
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+
+def _is_prime(n: int) -> bool:
+    """결정적 Miller-Rabin (n < 3.3e24 범위에서 정확)."""
+    if n < 2:
+        return False
+    for p in _MR_BASES:
+        if n % p == 0:
+            return n == p
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+    for a in _MR_BASES:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(r - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _next_prime(n: int) -> int:
+    while not _is_prime(n):
+        n += 1
+    return n
+
+
+def _pollard_rho(n: int, rng: random.Random) -> int:
+    if n % 2 == 0:
+        return 2
+    while True:
+        c = rng.randrange(1, n)
+        f = lambda v: (v * v + c) % n
+        x = y = rng.randrange(2, n)
+        d = 1
+        while d == 1:
+            x = f(x)
+            y = f(f(y))
+            d = math.gcd(abs(x - y), n)
+        if d != n:
+            return d
+
+
+def _prime_factors(n: int, rng: random.Random) -> set[int]:
+    factors: set[int] = set()
+    stack = [n]
+    while stack:
+        m = stack.pop()
+        if m == 1:
+            continue
+        if _is_prime(m):
+            factors.add(m)
+            continue
+        d = _pollard_rho(m, rng)
+        stack.extend((d, m // d))
+    return factors
+
+
+def cyclic_permutation(n: int, seed: int | None = None) -> Iterator[int]:
+    """0..n-1을 한 번씩, 무작위 순서로 yield (상수 메모리)."""
+    if n <= 1:
+        yield from range(n)
+        return
+
+    rng = random.Random(seed)
+    p = _next_prime(n + 1)
+    factors = _prime_factors(p - 1, rng)
+
+    # 원시근 g 탐색: 모든 소인수 q에 대해 g^((p-1)/q) != 1
+    while True:
+        g = rng.randrange(2, p)
+        if all(pow(g, (p - 1) // q, p) != 1 for q in factors):
+            break
+
+    x = rng.randrange(1, p)
+    for _ in range(p - 1):
+        if x <= n:
+            yield x - 1
+        x = x * g % p
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+import ipaddress
+import socket
 from dataclasses import dataclass, asdict
 from typing import List, Dict, Iterable
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from .utils import tcp_connect, parse_ports
-from .banner_grabber import grab_banner
+from .utils import tcp_connect, async_tcp_connect, parse_ports
+from .banner_grabber import grab_banner_from_socket, async_grab_banner_from_socket
 from .version_parser import parse_version
-from .service_fingerprints import guess_service
+from .signatures import match_banner
+from .service_fingerprints import guess_service, order_by_frequency
+from .timing import TimingTable
+from .rate_limit import RateLimiter
 
 
 @dataclass
@@ -23,9 +29,29 @@ class PortScanResult:
         return asdict(self)
 
 
-def scan_single_port(host: str, port: int, timeout: float = 1.0) -> PortScanResult:
-    # 1) TCP 연결 시도
-    sock = tcp_connect(host, port, timeout=timeout)
+def identify_service(service: str | None, banner: str | None) -> tuple:
+    """
+    포트 기반 서비스를 모를 때(비표준 포트) 배너 시그니처로 서비스를 정하고 버전 파싱.
+    반환: (service, version)
+    """
+    if banner and service in (None, "unknown"):
+        match = match_banner(banner)
+        if match is not None:
+            service = match.service
+        elif banner.startswith("HTTP/"):
+            service = "http"
+    return service, parse_version(service, banner)
+
+
+def scan_single_port(
+    host: str,
+    port: int,
+    timeout: float = 1.0,
+    timing: TimingTable | None = None,
+    limiter: RateLimiter | None = None,
+) -> PortScanResult:
+    # 1) TCP 연결 시도 (timing 지정 시 connect timeout은 호스트 RTT 기반)
+    sock = tcp_connect(host, port, timeout=timeout, timing=timing, limiter=limiter)
 
     if sock is None:
         return PortScanResult(
@@ -37,19 +63,19 @@ def scan_single_port(host: str, port: int, timeout: float = 1.0) -> PortScanResu
             version=None
         )
 
-    # 연결 성공 → 바로 소켓 닫기
-    try:
-        sock.close()
-    except:
-        pass
-
     service = guess_service(port)
 
-    # 2) 프로토콜별 banner grab
-    banner = grab_banner(host, port, service, timeout)
+    # 2) open 판정에 쓴 소켓 그대로 배너 그랩 (추가 handshake 없음)
+    try:
+        banner = grab_banner_from_socket(sock, service, timeout, timing, limiter)
+    finally:
+        try:
+            sock.close()
+        except:
+            pass
 
-    # 3) 배너 기반 버전 파싱
-    version = parse_version(service, banner)
+    # 3) 배너 기반 서비스 / 버전 판정
+    service, version = identify_service(service, banner)
 
     return PortScanResult(
         port=port,
@@ -65,16 +91,16 @@ from .utils import parse_ports
 
 def sequential_scan(host: str, ports: Iterable[int] | str, timeout: float = 1.0) -> List[Dict]:
     """
-    단일 IP에 대해 순차 TCP 스캔.
+    단일 IP에 대해 순차 TCP 스캔 (열려 있을 가능성이 높은 포트부터, 결과는 포트 번호 순).
     """
-    port_list = parse_ports(ports)
-    results: List[Dict] = []
+    port_list = order_by_frequency(parse_ports(ports), "tcp")
+    results: List[PortScanResult] = []
 
     for p in port_list:
-        res = scan_single_port(host, p, timeout=timeout)
-        results.append(res.to_dict())
+        results.append(scan_single_port(host, p, timeout=timeout))
 
-    return results
+    results.sort(key=lambda r: r.port)
+    return [r.to_dict() for r in results]
 
 
 def threaded_scan(
@@ -83,7 +109,7 @@ def threaded_scan(
     timeout: float = 1.0,
     max_workers: int = 100,
 ) -> List[Dict]:
-    port_list = parse_ports(ports)
+    port_list = order_by_frequency(parse_ports(ports), "tcp")
     results: List[PortScanResult] = []
 
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
@@ -97,3 +123,118 @@ def threaded_scan(
 
     results.sort(key=lambda r: r.port)
     return [r.to_dict() for r in results]
+
+
+# =====================================================
+# asyncio 기반 connect 스캔 엔진
+# =====================================================
+
+def _socket_family(host: str) -> int:
+    try:
+        if ipaddress.ip_address(host).version == 6:
+            return socket.AF_INET6
+    except ValueError:
+        pass
+    return socket.AF_INET
+
+
+def _raise_nofile_limit(wanted: int) -> None:
+    """동시 connect 수만큼 fd 한도(soft limit)를 hard limit 범위 내에서 올린다."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    need = wanted + 64
+    if soft == resource.RLIM_INFINITY or soft >= need:
+        return
+    new_soft = need if hard == resource.RLIM_INFINITY else min(need, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (new_soft, hard))
+    except (ValueError, OSError):
+        pass
+
+
+async def async_scan_single_port(
+    host: str,
+    port: int,
+    timeout: float = 1.0,
+    timing: TimingTable | None = None,
+    limiter: RateLimiter | None = None,
+) -> PortScanResult:
+    """
+    non-blocking 소켓으로 단일 포트 connect 후, 같은 소켓으로 배너 그랩.
+    """
+    service = guess_service(port)
+
+    sock = socket.socket(_socket_family(host), socket.SOCK_STREAM)
+    sock.setblocking(False)
+    try:
+        if not await async_tcp_connect(sock, (host, port), timeout, timing, limiter):
+            return PortScanResult(
+                port=port,
+                protocol="tcp",
+                state="closed",
+                banner=None,
+                service=service,
+                version=None
+            )
+
+        # connect에 쓴 소켓으로 바로 배너 그랩 (추가 handshake 없음)
+        banner = await async_grab_banner_from_socket(sock, service, timeout, timing, limiter)
+    finally:
+        sock.close()
+
+    service, version = identify_service(service, banner)
+
+    return PortScanResult(
+        port=port,
+        protocol="tcp",
+        state="open",
+        banner=banner,
+        service=service,
+        version=version
+    )
+
+
+async def _async_scan_ports(
+    host: str,
+    port_list: List[int],
+    timeout: float,
+    concurrency: int,
+) -> List[PortScanResult]:
+    """
+    포트마다 Task를 만들지 않고, concurrency 개의 worker가
+    공유 iterator에서 포트를 하나씩 꺼내 처리한다.
+    """
+    port_iter = iter(port_list)
+    results: List[PortScanResult] = []
+
+    async def worker() -> None:
+        for p in port_iter:
+            results.append(await async_scan_single_port(host, p, timeout))
+
+    n_workers = max(1, min(concurrency, len(port_list)))
+    await asyncio.gather(*(worker() for _ in range(n_workers)))
+    return results
+
+
+def async_scan(
+    host: str,
+    ports: Iterable[int] | str,
+    timeout: float = 1.0,
+    concurrency: int = 1000,
+) -> List[Dict]:
+    """
+    단일 IP에 대해 asyncio 기반 TCP connect 스캔.
+    - 스레드 대신 이벤트 루프 하나로 최대 concurrency 개의 connect를 동시에 유지
+    - 결과 형식은 threaded_scan과 동일 (포트 번호 기준 정렬된 dict 리스트)
+    """
+    port_list = order_by_frequency(parse_ports(ports), "tcp")
+    _raise_nofile_limit(concurrency)
+
+    results = asyncio.run(_async_scan_ports(host, port_list, timeout, concurrency))
+
+    results.sort(key=lambda r: r.port)
+    return [r.to_dict() for r in results]
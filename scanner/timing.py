@@ -0,0 +1,76 @@
+# scanner/timing.py
+from __future__ import annotations
+
+import threading
+from typing import Dict
+
+
+class RttEstimator:
+    """
+    RFC 6298 / nmap 방식 RTT 추정기.
+    - 첫 샘플: srtt = R, rttvar = R/2
+    - 이후   : rttvar = 3/4·rttvar + 1/4·|srtt - R|,  srtt = 7/8·srtt + 1/8·R
+    - timeout = srtt + 4·rttvar
+    """
+
+    __slots__ = ("srtt", "rttvar", "samples")
+
+    def __init__(self):
+        self.srtt: float | None = None
+        self.rttvar: float = 0.0
+        self.samples = 0
+
+    def observe(self, rtt: float) -> None:
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self.samples += 1
+
+    def timeout(self) -> float | None:
+        if self.srtt is None:
+            return None
+        return self.srtt + 4 * self.rttvar
+
+
+class TimingTable:
+    """
+    호스트별 RTT 추정값으로 connect/recv timeout을 동적으로 계산.
+    - 완료된 connect / RST(refused) / UDP 응답 시간을 샘플로 사용
+    - 샘플이 없는 호스트는 max_timeout (느린 WAN 호스트를 LAN 기준 timeout으로 놓치지 않도록)
+    - 결과는 [min_timeout, max_timeout] 범위로 clamp
+    """
+
+    def __init__(self, min_timeout: float = 0.1, max_timeout: float = 1.0):
+        self.min_timeout = min(min_timeout, max_timeout)
+        self.max_timeout = max_timeout
+        self._hosts: Dict[str, RttEstimator] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, host: str, rtt: float) -> None:
+        with self._lock:
+            est = self._hosts.get(host)
+            if est is None:
+                est = self._hosts[host] = RttEstimator()
+            est.observe(rtt)
+
+    def timeout(self, host: str) -> float:
+        est = self._hosts.get(host)
+        t = est.timeout() if est is not None else None
+        if t is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, t))
+
+    def forget(self, host: str) -> None:
+        """스캔이 끝난 호스트의 추정값 제거 (대규모 스윕 메모리 관리용)."""
+        with self._lock:
+            self._hosts.pop(host, None)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                h: {"srtt": e.srtt, "rttvar": e.rttvar, "samples": e.samples}
+                for h, e in self._hosts.items()
+            }
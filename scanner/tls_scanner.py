@@ -0,0 +1,385 @@
+# scanner/tls_scanner.py
+from __future__ import annotations
+
+import ipaddress
+import socket
+import ssl
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, asdict, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Tuple, TYPE_CHECKING
+
+from .probes import http_probe
+from .result_store import HostResults, PortRecord
+from .signatures import match_banner
+from .version_parser import parse_version
+from .metrics import stage
+from .transport import get_transport
+
+if TYPE_CHECKING:
+    from .rate_limit import RateLimiter
+
+# TLS로 감싼 서비스가 흔한 포트
+TLS_PORTS = {443, 465, 636, 853, 990, 992, 993, 994, 995, 2376, 3269, 5061, 5986, 6443, 8443, 9443}
+
+# 핸드셰이크 뒤 서버가 먼저 greeting을 보내는 포트 (나머지는 HTTP probe)
+TLS_GREETING_PORTS = {465, 990, 992, 993, 995}
+
+# 주요 Name 속성 OID (DER 인코딩) → 약어
+_NAME_OIDS = {
+    b"\x55\x04\x03": "CN",
+    b"\x55\x04\x06": "C",
+    b"\x55\x04\x0a": "O",
+    b"\x55\x04\x0b": "OU",
+}
+_SAN_OID = b"\x55\x1d\x11"
+
+
+@dataclass
+class TLSInfo:
+    host: str
+    port: int
+    server_name: str | None = None    # 보낸 SNI
+    tls_version: str | None = None
+    cipher: str | None = None
+    subject: str | None = None
+    issuer: str | None = None
+    san: List[str] = field(default_factory=list)
+    not_after: str | None = None      # 만료 시각 (UTC, "YYYY-MM-DD HH:MM:SS")
+    expired: bool | None = None
+    session_reused: bool = False
+    banner: str | None = None         # 터널 안에서 받은 응답 (HTTP 헤더 / greeting)
+    error: str | None = None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+# -------------------------
+# 인증서 (DER) 파싱
+# - 검증을 끄면 getpeercert()가 빈 dict를 주므로 DER에서 직접 필요한 필드만 꺼냄
+# -------------------------
+def _der_header(data: bytes, pos: int) -> Tuple[int, int, int]:
+    """(tag, 내용 시작, 내용 끝)"""
+    tag = data[pos]
+    length = data[pos + 1]
+    pos += 2
+    if length & 0x80:
+        n = length & 0x7F
+        length = int.from_bytes(data[pos:pos + n], "big")
+        pos += n
+    return tag, pos, pos + length
+
+
+def _der_children(data: bytes, start: int, end: int) -> Iterator[Tuple[int, int, int]]:
+    pos = start
+    while pos < end:
+        tag, s, e = _der_header(data, pos)
+        yield tag, s, e
+        pos = e
+
+
+def _der_string(tag: int, raw: bytes) -> str:
+    if tag == 0x1E:   # BMPString
+        return raw.decode("utf-16-be", errors="replace")
+    if tag == 0x14:   # TeletexString
+        return raw.decode("latin-1")
+    return raw.decode("utf-8", errors="replace")
+
+
+def _der_time(tag: int, raw: bytes) -> datetime:
+    text = raw.decode("ascii").rstrip("Z")
+    if tag == 0x17:   # UTCTime (YY)
+        year = int(text[:2])
+        text = str(2000 + year if year < 50 else 1900 + year) + text[2:]
+    return datetime.strptime(text[:14], "%Y%m%d%H%M%S").replace(tzinfo=timezone.utc)
+
+
+def _der_name(data: bytes, start: int, end: int) -> str:
+    parts = []
+    for _, s1, e1 in _der_children(data, start, end):           # SET
+        for _, s2, e2 in _der_children(data, s1, e1):           # SEQUENCE
+            (_, os_, oe), (vtag, vs, ve) = list(_der_children(data, s2, e2))[:2]
+            key = _NAME_OIDS.get(data[os_:oe])
+            if key:
+                parts.append(f"{key}={_der_string(vtag, data[vs:ve])}")
+    return ", ".join(parts)
+
+
+def _der_san(data: bytes, start: int, end: int) -> List[str]:
+    names = []
+    _, s, e = _der_header(data, start)                            # SEQUENCE OF GeneralName
+    for tag, gs, ge in _der_children(data, s, e):
+        if tag == 0x82:       # dNSName
+            names.append(data[gs:ge].decode("ascii", errors="replace"))
+        elif tag == 0x87:     # iPAddress
+            names.append(str(ipaddress.ip_address(data[gs:ge])))
+    return names
+
+
+def parse_certificate(der: bytes) -> Dict:
+    """X.509 DER → subject / issuer / SAN / 만료 시각."""
+    _, s, e = _der_header(der, 0)
+    _, ts, te = next(_der_children(der, s, e))                   # tbsCertificate
+    fields = list(_der_children(der, ts, te))
+    if fields and fields[0][0] == 0xA0:                           # [0] version
+        fields = fields[1:]
+    # serial, signature, issuer, validity, subject, spki, ...
+    issuer, validity, subject = fields[2], fields[3], fields[4]
+
+    not_after_tag, ns, ne = list(_der_children(der, validity[1], validity[2]))[1]
+    info = {
+        "subject": _der_name(der, subject[1], subject[2]),
+        "issuer": _der_name(der, issuer[1], issuer[2]),
+        "not_after": _der_time(not_after_tag, der[ns:ne]),
+        "san": [],
+    }
+
+    for tag, xs, xe in fields[5:]:
+        if tag != 0xA3:                                           # [3] extensions
+            continue
+        _, ls, le = _der_header(der, xs)
+        for _, es, ee in _der_children(der, ls, le):
+            parts = list(_der_children(der, es, ee))
+            oid = der[parts[0][1]:parts[0][2]]
+            if oid == _SAN_OID:
+                _, vs, ve = parts[-1]                             # OCTET STRING
+                info["san"] = _der_san(der, vs, ve)
+    return info
+
+
+# -------------------------
+# TLS 세션 캐시 (같은 프로세스 안에서 같은 endpoint를 다시 probe할 때 resumption)
+# -------------------------
+class TLSSessionCache:
+    """
+    (host, port, SNI) → ssl.SSLSession, 최근 사용 순 LRU.
+    메모리에만 있으므로 효과는 한 프로세스 안으로 한정 (ssl.SSLSession은 직렬화 불가).
+    CLI 실행 한 번은 endpoint마다 핸드셰이크 1번이라 재사용이 없음 →
+    같은 프로세스에서 tls_probe / run_tls_stage를 반복 호출하는 경우(라이브러리 사용 등)에만 의미 있음.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._sessions: "OrderedDict[tuple, ssl.SSLSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> ssl.SSLSession | None:
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None:
+                self._sessions.move_to_end(key)
+            return session
+
+    def put(self, key: tuple, session: ssl.SSLSession | None) -> None:
+        if session is None:
+            return
+        with self._lock:
+            self._sessions[key] = session
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self.max_entries:
+                self._sessions.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+SESSION_CACHE = TLSSessionCache()
+
+_context: ssl.SSLContext | None = None
+_context_lock = threading.Lock()
+
+
+def client_context() -> ssl.SSLContext:
+    """
+    스캔용 TLS 클라이언트 컨텍스트 (프로세스당 1개).
+    세션은 만든 컨텍스트에서만 재사용 가능하므로 공유해서 씀.
+    """
+    global _context
+    with _context_lock:
+        if _context is None:
+            ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+            ctx.check_hostname = False
+            ctx.verify_mode = ssl.CERT_NONE
+            try:
+                # 오래된 서버도 인증서는 받아오도록 최대한 허용
+                ctx.minimum_version = ssl.TLSVersion.MINIMUM_SUPPORTED
+                ctx.set_ciphers("ALL:@SECLEVEL=0")
+            except (ValueError, ssl.SSLError):
+                pass
+            _context = ctx
+        return _context
+
+
+def _read_response(sock: ssl.SSLSocket, max_bytes: int) -> bytes:
+    """HTTP 헤더 끝 / max_bytes / timeout / 연결 종료까지 읽기."""
+    buf = bytearray()
+    while len(buf) < max_bytes and b"\r\n\r\n" not in buf:
+        try:
+            chunk = sock.recv(max_bytes - len(buf))
+        except (socket.timeout, ssl.SSLError, OSError):
+            break
+        if not chunk:
+            break
+        buf += chunk
+        if not buf.startswith(b"HTTP/"):
+            break   # greeting 등 HTTP가 아닌 응답은 첫 조각만
+    return bytes(buf[:max_bytes])
+
+
+def tls_probe(
+    host: str,
+    port: int,
+    timeout: float = 3.0,
+    server_name: str | None = None,
+    http_path: str = "/",
+    max_bytes: int = 1024,
+    cache: TLSSessionCache | None = SESSION_CACHE,
+    limiter: RateLimiter | None = None,
+) -> TLSInfo:
+    """
+    TLS 핸드셰이크(SNI) → 인증서 정보 추출 → 터널 안에서 HTTP GET (Server 헤더) 또는 greeting 읽기.
+    cache가 있으면 같은 프로세스에서 저장한 이전 세션으로 resumption 시도.
+    limiter 지정 시 connect 전에 스캔과 같은 전역/호스트별 토큰 확보.
+    """
+    info = TLSInfo(host=host, port=port, server_name=server_name)
+    key = (host, port, server_name)
+    session = cache.get(key) if cache is not None else None
+
+    if limiter is not None:
+        limiter.acquire(host)
+    try:
+        raw = get_transport().create_connection((host, port), timeout=timeout)
+    except OSError as e:
+        info.error = f"connect: {e}"
+        return info
+
+    try:
+        with client_context().wrap_socket(raw, server_hostname=server_name, session=session) as sock:
+            info.tls_version = sock.version()
+            cipher = sock.cipher()
+            info.cipher = cipher[0] if cipher else None
+            info.session_reused = sock.session_reused
+
+            der = sock.getpeercert(binary_form=True)
+            if der:
+                try:
+                    cert = parse_certificate(der)
+                    info.subject = cert["subject"]
+                    info.issuer = cert["issuer"]
+                    info.san = cert["san"]
+                    info.not_after = cert["not_after"].strftime("%Y-%m-%d %H:%M:%S")
+                    info.expired = cert["not_after"] < datetime.now(timezone.utc)
+                except (IndexError, ValueError, StopIteration):
+                    info.error = "certificate parse failed"
+
+            if port not in TLS_GREETING_PORTS:
+                sock.sendall(http_probe(http_path, server_name or host))
+            data = _read_response(sock, max_bytes)
+            info.banner = data.decode(errors="ignore") or None
+
+            # TLS 1.3은 세션 티켓이 핸드셰이크 뒤에 오므로 응답을 읽은 뒤 저장
+            if cache is not None:
+                cache.put(key, sock.session)
+    except (ssl.SSLError, OSError) as e:
+        info.error = f"handshake: {e}"
+    finally:
+        raw.close()
+
+    return info
+
+
+def tls_scan(
+    endpoints: Iterable[Tuple[str, int, str | None]],
+    timeout: float = 3.0,
+    concurrency: int = 50,
+    **probe_options,
+) -> Iterator[TLSInfo]:
+    """
+    (host, port, SNI) 목록을 동시에 TLS probe.
+    동시에 진행하는 핸드셰이크 수는 concurrency로 제한, 끝난 순서대로 yield.
+    """
+    endpoints = list(endpoints)
+    if not endpoints:
+        return
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(endpoints)))) as pool:
+        futures = [
+            pool.submit(tls_probe, host, port, timeout, server_name, **probe_options)
+            for host, port, server_name in endpoints
+        ]
+        for fut in as_completed(futures):
+            yield fut.result()
+
+
+def is_tls_candidate(record: PortRecord) -> bool:
+    """open TCP 포트 중 TLS stage 대상 (https로 추정 / TLS 포트 / 평문 probe에 TLS 응답)."""
+    if record.protocol != "tcp" or record.state != "open":
+        return False
+    if record.service == "https" or record.port in TLS_PORTS:
+        return True
+    banner = record.banner or ""
+    return banner.startswith(("\x15\x03", "\x16\x03")) or "HTTPS port" in banner
+
+
+def _apply(record: PortRecord, info: TLSInfo) -> None:
+    """TLS 결과로 포트 레코드의 banner / service / version 갱신."""
+    banner = info.banner
+    if banner and banner.startswith("HTTP/"):
+        record.service = "https"
+        record.banner = banner
+        record.version = parse_version("http", banner)
+        return
+
+    match = match_banner(banner) if banner else None
+    if match is not None:
+        record.service = f"ssl/{match.service}"
+        record.version = match.version
+    elif record.service in (None, "unknown"):
+        record.service = "ssl"
+    if banner:
+        record.banner = banner
+
+
+def run_tls_stage(
+    scan_result: Dict,
+    timeout: float = 3.0,
+    concurrency: int = 50,
+    limiter: RateLimiter | None = None,
+    **probe_options,
+) -> List[Tuple[str, PortRecord]]:
+    """
+    스캔 결과에서 TLS 후보 포트만 골라 동시에 TLS probe 후 결과 반영.
+    - 포트 레코드(banner / service / version)는 제자리에서 갱신
+    - 인증서 정보는 호스트 entry["tls"]에 포트별 dict로 추가
+    - limiter: 스캔과 같은 RateLimiter (핸드셰이크 connect도 전송 속도 제한에 포함)
+    반환: 갱신된 (host, PortRecord) 목록 (DB 재저장용)
+    """
+    records: Dict[Tuple[str, int], Tuple[Dict, PortRecord]] = {}
+    endpoints = []
+    for entry in scan_result["targets"]:
+        results = entry.get("results")
+        if not isinstance(results, HostResults) or entry.get("status") == "down":
+            continue
+        # SNI는 타겟에 적힌 호스트 이름 (IP로 직접 지정한 타겟은 SNI 없음)
+        server_name = (entry.get("hostnames") or [None])[0]
+        for record in results.records.values():
+            if is_tls_candidate(record):
+                records[(entry["ip"], record.port)] = (entry, record)
+                endpoints.append((entry["ip"], record.port, server_name))
+
+    updated = []
+    with stage("tls"):
+        for info in tls_scan(endpoints, timeout=timeout, concurrency=concurrency, limiter=limiter, **probe_options):
+            entry, record = records[(info.host, info.port)]
+            entry.setdefault("tls", []).append(info.to_dict())
+            if info.error and info.tls_version is None:
+                continue   # TLS가 아닌 포트
+            _apply(record, info)
+            updated.append((entry["ip"], record))
+
+    for entry, _ in records.values():
+        if "tls" in entry:
+            entry["tls"].sort(key=lambda d: d["port"])
+    return updated
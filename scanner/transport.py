@@ -0,0 +1,59 @@
+# scanner/transport.py
+"""
+스캐너 네트워크 I/O 교체 지점.
+utils.tcp_connect / tcp_ping / udp_probe, banner_grabber(sync 경로), rate_limit은
+socket / time 모듈 대신 현재 transport를 통해 연결·시계·대기를 사용한다.
+- 기본값: SocketTransport (실제 네트워크)
+- 테스트: simnet.SimNetwork (프로세스 내부 가상 네트워크 + 가상 시간)
+transport는 프로세스 전역 (worker 스레드도 같은 transport를 봐야 하므로 thread-local 아님).
+배치 UDP 엔진(udp_scanner.UDPBatchScanner)은 selectors + MSG_ERRQUEUE로 커널 소켓을 직접 다루므로
+transport를 거치지 않음 (테스트는 _BatchRun의 공유 소켓 / _now / _poll만 바꿔 가상 시간으로 실행,
+실제 소켓 경로는 benchmarks/farm.py loopback farm으로 검증).
+"""
+from __future__ import annotations
+
+import socket
+import time
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+
+class SocketTransport:
+    """socket / time 모듈을 그대로 사용하는 기본 transport."""
+
+    def create_connection(self, address: Tuple[str, int], timeout: float | None = None) -> socket.socket:
+        return socket.create_connection(address, timeout=timeout)
+
+    def udp_socket(self, family: int = socket.AF_INET) -> socket.socket:
+        return socket.socket(family, socket.SOCK_DGRAM)
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+_transport = SocketTransport()
+
+
+def get_transport():
+    return _transport
+
+
+def set_transport(transport) -> object:
+    """transport 교체 후 이전 transport 반환 (None이면 기본 SocketTransport)."""
+    global _transport
+    previous = _transport
+    _transport = transport if transport is not None else SocketTransport()
+    return previous
+
+
+@contextmanager
+def use_transport(transport) -> Iterator[object]:
+    """with use_transport(SimNetwork(...)) as net: ... 블록 안에서만 transport 교체."""
+    previous = set_transport(transport)
+    try:
+        yield transport
+    finally:
+        set_transport(previous)
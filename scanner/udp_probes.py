@@ -0,0 +1,256 @@
+# scanner/udp_probes.py
+from __future__ import annotations
+
+import re
+import struct
+from typing import Callable, Dict, Tuple
+
+from .service_fingerprints import guess_service
+
+# =====================================================
+# UDP 서비스별 요청 payload
+#   - 빈 데이터그램에는 대부분의 UDP 서비스가 응답하지 않으므로
+#     프로토콜에 맞는 요청을 보내 응답(open)을 바로 받는다
+#   - key: services DB의 UDP 서비스 이름 (guess_service(port, "udp"))
+# =====================================================
+
+def _dns_name(name: str) -> bytes:
+    out = b""
+    for label in name.split("."):
+        out += bytes([len(label)]) + label.encode()
+    return out + b"\x00"
+
+
+def _dns_query(name: str, qtype: int, qclass: int, txid: int = 0x1234, flags: int = 0x0100) -> bytes:
+    # header: id, flags, qdcount=1, ancount, nscount, arcount
+    return struct.pack(">HHHHHH", txid, flags, 1, 0, 0, 0) + _dns_name(name) + struct.pack(">HH", qtype, qclass)
+
+
+def _snmp_get_sysdescr(community: bytes = b"public") -> bytes:
+    # SNMPv1 GetRequest 1.3.6.1.2.1.1.1.0 (sysDescr.0)
+    oid = b"\x06\x08\x2b\x06\x01\x02\x01\x01\x01\x00"
+    varbind = b"\x30" + bytes([len(oid) + 2]) + oid + b"\x05\x00"
+    varbinds = b"\x30" + bytes([len(varbind)]) + varbind
+    pdu_body = b"\x02\x01\x01" + b"\x02\x01\x00" + b"\x02\x01\x00" + varbinds   # request-id, error, index
+    pdu = b"\xa0" + bytes([len(pdu_body)]) + pdu_body
+    body = b"\x02\x01\x00" + b"\x04" + bytes([len(community)]) + community + pdu     # version=1(0)
+    return b"\x30" + bytes([len(body)]) + body
+
+
+UDP_PROBES: Dict[str, bytes] = {
+    # version.bind CHAOS TXT (BIND 등은 버전 문자열로 응답)
+    "dns": _dns_query("version.bind", 16, 3),
+    # NTP v4 client 요청 (mode 3)
+    "ntp": b"\xe3" + b"\x00" * 47,
+    # NetBIOS NBSTAT 질의 (이름 "*")
+    "netbios-ns": struct.pack(">HHHHHH", 0x1234, 0, 1, 0, 0, 0)
+                  + b"\x20" + b"CKAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA" + b"\x00"
+                  + struct.pack(">HH", 0x21, 1),
+    "snmp": _snmp_get_sysdescr(),
+    # TFTP RRQ (존재하지 않는 파일 → 서버가 ERROR 패킷으로 응답)
+    "tftp": b"\x00\x01" + b"portscan-probe.txt\x00" + b"octet\x00",
+    # RIPv2 전체 라우팅 테이블 요청
+    "rip": b"\x01\x02\x00\x00" + b"\x00" * 16 + b"\x00\x00\x00\x10",
+    # SSDP M-SEARCH (unicast)
+    "upnp": (
+        b"M-SEARCH * HTTP/1.1\r\n"
+        b"HOST: 239.255.255.250:1900\r\n"
+        b'MAN: "ssdp:discover"\r\n'
+        b"MX: 1\r\n"
+        b"ST: ssdp:all\r\n\r\n"
+    ),
+    # mDNS DNS-SD 서비스 목록 (unicast 응답 요청: QU 비트)
+    "zeroconf": _dns_query("_services._dns-sd._udp.local", 12, 0x8001, txid=0, flags=0),
+    # LLMNR 질의
+    "llmnr": _dns_query("localhost", 1, 1, flags=0),
+    # memcached UDP frame header(request id, seq, total, reserved) + 텍스트 명령
+    "memcached": b"\x00\x01\x00\x00\x00\x01\x00\x00version\r\n",
+}
+
+
+def udp_payload(port: int) -> bytes:
+    """포트에 맞는 UDP 요청 payload (payload가 없는 서비스면 빈 데이터그램)."""
+    return UDP_PROBES.get(guess_service(port, "udp"), b"")
+
+
+# =====================================================
+# 응답 파싱 → (banner, version)
+# =====================================================
+
+def _printable(data: bytes, limit: int = 200) -> str | None:
+    text = "".join(chr(c) if 32 <= c < 127 else " " for c in data[:limit])
+    text = " ".join(text.split())
+    return text or None
+
+
+# ports.version 컬럼 길이 (db/schema.sql VARCHAR(100))
+VERSION_MAX_LEN = 100
+
+# "Version 15.2(4)M3," / "9.16.1-Ubuntu" / "5.4.0-42-generic" 같은 버전 토큰
+_VERSION_KEYWORD_RE = re.compile(r"\bversion\s+([0-9][^\s,;]*)", re.IGNORECASE)
+_VERSION_TOKEN_RE = re.compile(r"\d+(?:\.\d+)+[\w.()+~-]*")
+
+
+def _version_token(text: str) -> str | None:
+    """자유 형식 문자열(version.bind, sysDescr)에서 버전 토큰만 추출 (없으면 None)."""
+    m = _VERSION_KEYWORD_RE.search(text) or _VERSION_TOKEN_RE.search(text)
+    if not m:
+        return None
+    token = m.group(1) if m.re is _VERSION_KEYWORD_RE else m.group(0)
+    return token[:VERSION_MAX_LEN]
+
+
+def _skip_dns_name(data: bytes, off: int) -> int:
+    while off < len(data):
+        n = data[off]
+        if n == 0:
+            return off + 1
+        if n & 0xC0 == 0xC0:   # 압축 포인터
+            return off + 2
+        off += n + 1
+    return off
+
+
+def _parse_dns(data: bytes) -> Tuple[str | None, str | None]:
+    if len(data) < 12:
+        return _printable(data), None
+    _, flags, qd, an, _, _ = struct.unpack_from(">HHHHHH", data)
+    rcode = flags & 0x0F
+
+    off = 12
+    for _ in range(qd):
+        off = _skip_dns_name(data, off) + 4
+
+    # 첫 TXT 응답 (version.bind)
+    for _ in range(an):
+        off = _skip_dns_name(data, off)
+        if off + 10 > len(data):
+            break
+        rtype, _, _, rdlen = struct.unpack_from(">HHIH", data, off)
+        off += 10
+        if rtype == 16 and rdlen > 0:
+            txt = data[off + 1: off + 1 + data[off]].decode(errors="replace")
+            return f"DNS version.bind: {txt}", _version_token(txt)
+        off += rdlen
+
+    return f"DNS response (rcode={rcode}, answers={an})", None
+
+
+def _parse_ntp(data: bytes) -> Tuple[str | None, str | None]:
+    if len(data) < 48:
+        return _printable(data), None
+    vn = (data[0] >> 3) & 0x07
+    stratum = data[1]
+    refid = data[12:16]
+    if stratum <= 1:
+        ref = refid.rstrip(b"\x00").decode(errors="replace")
+    else:
+        ref = ".".join(str(b) for b in refid)
+    return f"NTP v{vn} stratum {stratum} refid {ref}", f"v{vn}"
+
+
+def _parse_netbios_ns(data: bytes) -> Tuple[str | None, str | None]:
+    # header(12) + name(34) + type/class/ttl/rdlength(10) + num_names(1)
+    off = 12 + 34 + 10
+    if len(data) <= off:
+        return _printable(data), None
+    names = []
+    for i in range(data[off]):
+        entry = data[off + 1 + i * 18: off + 1 + (i + 1) * 18]
+        if len(entry) < 18:
+            break
+        name = entry[:15].decode(errors="replace").strip()
+        if name and name not in names:
+            names.append(name)
+    if not names:
+        return "NetBIOS name service", None
+    return "NetBIOS names: " + ", ".join(names), None
+
+
+def _parse_snmp(data: bytes) -> Tuple[str | None, str | None]:
+    # sysDescr.0 OID 다음 OCTET STRING 추출
+    oid = b"\x2b\x06\x01\x02\x01\x01\x01\x00"
+    i = data.find(oid)
+    if i < 0:
+        return _printable(data), None
+    off = i + len(oid)
+    if off + 2 > len(data) or data[off] != 0x04:
+        return "SNMP response", None
+    n = data[off + 1]
+    off += 2
+    if n & 0x80:   # 긴 길이 형식
+        k = n & 0x7F
+        n = int.from_bytes(data[off: off + k], "big")
+        off += k
+    descr = data[off: off + n].decode(errors="replace").strip()
+    return descr or "SNMP response", _version_token(descr)
+
+
+def _parse_tftp(data: bytes) -> Tuple[str | None, str | None]:
+    if len(data) < 4:
+        return _printable(data), None
+    opcode = struct.unpack_from(">H", data)[0]
+    if opcode == 5:
+        msg = data[4:].split(b"\x00", 1)[0].decode(errors="replace")
+        return f"TFTP error: {msg}", None
+    return f"TFTP opcode {opcode}", None
+
+
+def _parse_rip(data: bytes) -> Tuple[str | None, str | None]:
+    if len(data) < 4 or data[0] != 2:
+        return _printable(data), None
+    routes = (len(data) - 4) // 20
+    return f"RIPv{data[1]} response ({routes} routes)", f"v{data[1]}"
+
+
+def _parse_http_like(data: bytes) -> Tuple[str | None, str | None]:
+    text = data.decode(errors="replace")
+    m = re.search(r"^server:\s*(.+)$", text, re.IGNORECASE | re.MULTILINE)
+    if m:
+        server = m.group(1).strip()
+        return server, server
+    return _printable(data), None
+
+
+def _parse_memcached(data: bytes) -> Tuple[str | None, str | None]:
+    text = data[8:].decode(errors="replace").strip()   # UDP frame header 제외
+    m = re.match(r"VERSION (\S+)", text)
+    if m:
+        return text, m.group(1)
+    return _printable(data[8:]), None
+
+
+def _parse_mdns(data: bytes) -> Tuple[str | None, str | None]:
+    banner, _ = _parse_dns(data)
+    return banner and banner.replace("DNS", "mDNS", 1), None
+
+
+UDP_PARSERS: Dict[str, Callable[[bytes], Tuple[str | None, str | None]]] = {
+    "dns": _parse_dns,
+    "ntp": _parse_ntp,
+    "netbios-ns": _parse_netbios_ns,
+    "snmp": _parse_snmp,
+    "tftp": _parse_tftp,
+    "rip": _parse_rip,
+    "upnp": _parse_http_like,
+    "zeroconf": _parse_mdns,
+    "llmnr": _parse_dns,
+    "memcached": _parse_memcached,
+}
+
+
+def parse_udp_response(service: str | None, data: bytes | None) -> Tuple[str | None, str | None]:
+    """
+    UDP 응답 데이터 → (banner, version). 파서가 없는 서비스는 출력 가능한 문자만 banner로.
+    전체 응답 문자열은 banner에, version은 VERSION_MAX_LEN 이하로 자름.
+    """
+    if not data:
+        return None, None
+    parser = UDP_PARSERS.get(service or "")
+    try:
+        if parser is not None:
+            banner, version = parser(data)
+            return banner, version[:VERSION_MAX_LEN] if version else None
+    except (struct.error, IndexError, ValueError):
+        pass
+    return _printable(data), None
@@ -1,58 +1,83 @@
 # scanner/udp_scanner.py
 from __future__ import annotations
 
+import heapq
+import ipaddress
+import selectors
+import socket
+import struct
+import sys
+import time
+from collections import deque
 from dataclasses import dataclass, asdict
-from typing import List, Dict, Iterable
+from typing import List, Dict, Iterable, Iterator, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from .utils import udp_connect, parse_ports
-from .service_fingerprints import guess_service
+from .utils import udp_probe, parse_ports
+from .service_fingerprints import guess_service, order_by_frequency
+from .udp_probes import udp_payload, parse_udp_response
+from .timing import TimingTable
+from .rate_limit import RateLimiter
 
 
 @dataclass
 class UDPPortScanResult:
     port: int
     protocol: str   # "udp"
-    state: str      # "open" / "closed" / "open|filtered"
-    banner: str | None = None   # UDP는 일반적으로 배너 없음
+    state: str      # "open" / "closed" / "filtered" / "open|filtered"
+    banner: str | None = None   # 서비스별 UDP payload 응답에서 추출
     service: str | None = None
+    version: str | None = None
 
     def to_dict(self) -> Dict:
         return asdict(self)
 
 
-def scan_single_udp_port(host: str, port: int, timeout: float = 1.0) -> UDPPortScanResult:
+def scan_single_udp_port(
+    host: str,
+    port: int,
+    timeout: float = 1.0,
+    timing: TimingTable | None = None,
+    limiter: RateLimiter | None = None,
+    retries: int = 0,
+) -> UDPPortScanResult:
     """
     단일 UDP 포트 스캔.
-    - 응답 수신       → open
+    - 서비스별 요청 payload 전송 (udp_probes.UDP_PROBES)
+    - 응답 수신       → open (응답에서 banner / version 추출)
     - ICMP unreachable → closed
-    - 응답 없음       → open|filtered
+    - 응답 없음       → open|filtered (retries 만큼 재전송 후)
     """
-    state = udp_connect(host, port, timeout)
-    service = guess_service(port)
+    state, data = udp_probe(
+        host, port, udp_payload(port), timeout, timing=timing, limiter=limiter, retries=retries
+    )
+    service = guess_service(port, "udp")
+    banner, version = parse_udp_response(service, data)
 
     return UDPPortScanResult(
         port=port,
         protocol="udp",
         state=state,
-        banner=None,
+        banner=banner,
         service=service,
+        version=version,
     )
 
 
 def sequential_udp_scan(host: str, ports: Iterable[int] | str, timeout: float = 1.0) -> List[Dict]:
     """
     단일 IP에 대해 순차 UDP 스캔.
-    - 출력: [{port, protocol, state, banner, service}, ...]
+    - 출력: [{port, protocol, state, banner, service}, ...] (포트 번호 순)
+    - 열려 있을 가능성이 높은 포트부터 probe
     """
-    port_list = parse_ports(ports)
-    results: List[Dict] = []
+    port_list = order_by_frequency(parse_ports(ports), "udp")
+    results: List[UDPPortScanResult] = []
 
     for p in port_list:
-        res = scan_single_udp_port(host, p, timeout=timeout)
-        results.append(res.to_dict())
+        results.append(scan_single_udp_port(host, p, timeout=timeout))
 
-    return results
+    results.sort(key=lambda r: r.port)
+    return [r.to_dict() for r in results]
 
 
 def threaded_udp_scan(
@@ -66,7 +91,7 @@ def threaded_udp_scan(
     - ThreadPoolExecutor 사용
     - 결과는 포트 번호 기준 정렬
     """
-    port_list = parse_ports(ports)
+    port_list = order_by_frequency(parse_ports(ports), "udp")
     results: List[UDPPortScanResult] = []
 
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
@@ -80,3 +105,509 @@ def threaded_udp_scan(
 
     results.sort(key=lambda r: r.port)
     return [r.to_dict() for r in results]
+
+
+# =====================================================
+# 단일 소켓 배치 UDP 엔진
+#   - 소켓 하나(주소 체계별)로 여러 포트에 probe를 연달아 전송
+#   - 응답 / ICMP 에러를 selector로 비동기 수집해 (host, port)로 매핑
+#   - Linux: IP_RECVERR + MSG_ERRQUEUE 로 unconnected 소켓에서도 ICMP 에러의
+#            원래 목적지(host, port)를 알 수 있음
+#   - 그 외 OS: probe마다 connected 소켓을 만들어 같은 selector로 다중화
+#              (connected UDP 소켓은 ICMP port unreachable을 ECONNREFUSED로 받음)
+# =====================================================
+
+_IP_RECVERR = getattr(socket, "IP_RECVERR", 11)
+_IPV6_RECVERR = getattr(socket, "IPV6_RECVERR", 25)
+_MSG_ERRQUEUE = getattr(socket, "MSG_ERRQUEUE", 0x2000)
+_SO_EE_ORIGIN_ICMP = 2
+_SO_EE_ORIGIN_ICMP6 = 3
+# struct sock_extended_err { u32 ee_errno; u8 ee_origin, ee_type, ee_code, ee_pad; u32 ee_info, ee_data; }
+_SOCK_EE = struct.Struct("=IBBBBII")
+
+_REFUSED_ERRNOS = (111, 10054, 10061)  # ECONNREFUSED / WSAECONNRESET / WSAECONNREFUSED
+
+
+def _icmp_error_state(origin: int, icmp_type: int, code: int) -> str | None:
+    """ICMP(v6) destination unreachable → 포트 상태."""
+    if origin == _SO_EE_ORIGIN_ICMP and icmp_type == 3:
+        return "closed" if code == 3 else "filtered"      # code 3 = port unreachable
+    if origin == _SO_EE_ORIGIN_ICMP6 and icmp_type == 1:
+        return "closed" if code == 4 else "filtered"      # code 4 = port unreachable
+    return None
+
+
+def _norm_ip(host: str) -> str:
+    if ":" in host:
+        return ipaddress.ip_address(host.split("%", 1)[0]).compressed
+    return host
+
+
+class UDPBatchScanner:
+    """
+    (host, port) 작업을 소수의 소켓으로 처리하는 배치 UDP 스캐너.
+    - window      : 동시에 응답을 기다리는 probe 수 상한
+    - timing      : 호스트별 RTT 기반 대기 시간 (없으면 timeout 고정)
+    - limiter     : 전송 속도 제한 (블로킹 sleep 대신 다음 전송 시각으로 예약)
+    - max_retries : 응답도 ICMP 에러도 없는 probe의 재전송 횟수
+    - rate_limit_retries : ICMP rate limit이 의심되는 호스트의 probe에 추가로 주는 재전송 횟수
+    ICMP rate limit(Linux 기본 1초당 1개 수준) 판정:
+      - 재전송에만 ICMP 에러가 돌아옴 (첫 응답이 버려짐)
+      - 최근 ICMP 에러를 보낸 호스트의 다른 probe가 timeout (에러를 보내다가 조용해짐)
+    판정된 호스트만 전송 간격을 늘리고 (min_delay부터 2배씩, max_delay까지) 응답 없는 probe는
+    max_retries를 다 써도 늘어난 간격으로 rate_limit_retries번 더 재전송한 뒤 open|filtered로 확정.
+    다른 호스트의 전송 속도는 그대로 유지.
+    scan()은 포트 상태가 확정되는 순서대로 (host, UDPPortScanResult)를 yield 한다.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 1.0,
+        window: int = 512,
+        timing: TimingTable | None = None,
+        limiter: RateLimiter | None = None,
+        max_retries: int = 1,
+        min_delay: float = 0.05,
+        max_delay: float = 1.0,
+        use_errqueue: bool | None = None,
+        rate_limit_retries: int = 3,
+    ):
+        self.timeout = timeout
+        self.window = max(1, window)
+        self.timing = timing
+        self.limiter = limiter
+        self.max_retries = max(0, max_retries)
+        self.rate_limit_retries = max(0, rate_limit_retries)
+        self.min_delay = min_delay
+        self.max_delay = max(min_delay, max_delay)
+        self.use_errqueue = sys.platform.startswith("linux") if use_errqueue is None else use_errqueue
+        self.stats: Dict[str, int] = {}
+
+    def _payload(self, port: int) -> bytes:
+        return udp_payload(port)
+
+    def scan(self, tasks: Iterable[Tuple[str, int]]) -> Iterator[Tuple[str, UDPPortScanResult]]:
+        return _BatchRun(self, tasks).run()
+
+
+class _HostPace:
+    """호스트별 ICMP rate limit 대응 상태."""
+
+    __slots__ = ("delay", "next_send", "last_backoff", "queue", "scheduled", "reserved")
+
+    def __init__(self):
+        self.delay = 0.0             # 이 호스트로의 probe 간 최소 간격
+        self.next_send = 0.0
+        self.last_backoff = 0.0
+        self.queue: deque = deque()  # (port, 시도 횟수) — 간격을 두고 보낼 probe
+        self.scheduled = False
+        self.reserved: float | None = None   # limiter로 예약한 전송 시각 (queue[0]용)
+
+
+class _BatchRun:
+    """UDPBatchScanner.scan() 1회 실행 상태."""
+
+    def __init__(self, scanner: UDPBatchScanner, tasks: Iterable[Tuple[str, int]]):
+        self.sc = scanner
+        self.tasks = iter(tasks)
+        self.sel = selectors.DefaultSelector()
+        self.socks: Dict[int, socket.socket] = {}          # family → 공유 소켓 (errqueue 모드)
+        # (정규화 ip, port) → [host, port, 전송 시각, deadline, 소켓(fallback 모드), 시도 횟수]
+        self.outstanding: Dict[Tuple[str, int], list] = {}
+        # timeout 후 재전송 대기 중인 probe (window에 세지 않음, 늦은 응답이 오면 재전송 취소)
+        self.waiting: Dict[Tuple[str, int], list] = {}
+        self.deadlines: list = []
+        self.results: deque = deque()
+        self.held: Tuple[str, int] | None = None            # rate limit으로 전송 대기 중인 작업
+        self.held_at = 0.0
+        self.pace: Dict[str, _HostPace] = {}
+        self.paced: list = []                               # (다음 전송 시각, seq, host) heap
+        self.paced_count = 0
+        self.max_paced = scanner.window * 8
+        self.seq = 0
+        self.icmp_seen: Dict[str, float] = {}               # 호스트 → 마지막 ICMP 에러 수신 시각 (최근 것만)
+        self.stats = scanner.stats
+        self.stats.update(sent=0, retransmits=0, rate_limited_hosts=0)
+
+    # -------------------------------------------------
+    # 결과 기록
+    # -------------------------------------------------
+    def _resolve(self, key: Tuple[str, int], state: str, data: bytes | None = None) -> None:
+        entry = self.outstanding.pop(key, None)
+        if entry is None:
+            entry = self.waiting.pop(key, None)
+            if entry is None:
+                return
+        host, port, sent_at, _, sock, tries = entry
+
+        if state != "open|filtered" and self.sc.timing is not None:
+            self.sc.timing.observe(host, self._now() - sent_at)
+        if state in ("closed", "filtered"):
+            self._icmp_error(host)
+            if tries:
+                # 재전송한 probe에만 ICMP 에러가 옴 → 앞선 에러는 rate limit으로 버려진 것
+                self._back_off(host)
+        if sock is not None:
+            self.sel.unregister(sock)
+            sock.close()
+
+        service = guess_service(port, "udp")
+        banner, version = parse_udp_response(service, data)
+        self.results.append((host, UDPPortScanResult(
+            port=port,
+            protocol="udp",
+            state=state,
+            banner=banner,
+            service=service,
+            version=version,
+        )))
+
+    # -------------------------------------------------
+    # ICMP rate limit 대응
+    # -------------------------------------------------
+    def _host_pace(self, host: str) -> _HostPace:
+        pace = self.pace.get(host)
+        if pace is None:
+            pace = self.pace[host] = _HostPace()
+        return pace
+
+    def _enqueue(self, host: str, port: int, tries: int) -> None:
+        pace = self._host_pace(host)
+        pace.queue.append((port, tries))
+        self.paced_count += 1
+        if not pace.scheduled:
+            pace.scheduled = True
+            self.seq += 1
+            heapq.heappush(self.paced, (max(self._now(), pace.next_send), self.seq, host))
+
+    def _back_off(self, host: str) -> None:
+        """호스트의 probe 간격을 2배로 (min_delay부터 max_delay까지)."""
+        pace = self._host_pace(host)
+        now = self._now()
+        # 같은 timeout 구간에 몰려 오는 응답으로 여러 번 늘리지 않도록 간격 확인
+        if now - pace.last_backoff < self._wait_for(host):
+            return
+        if pace.delay == 0:
+            self.stats["rate_limited_hosts"] += 1
+        pace.delay = min(self.sc.max_delay, max(self.sc.min_delay, pace.delay * 2))
+        pace.last_backoff = now
+
+    def _icmp_error(self, host: str) -> None:
+        now = self._now()
+        self.icmp_seen[host] = now
+        if len(self.icmp_seen) > 4 * self.sc.window:
+            # timeout 몇 번 이상 지난 기록은 버림 (긴 스윕에서 호스트 수만큼 쌓이지 않게)
+            horizon = now - 4 * self.sc.timeout
+            self.icmp_seen = {h: t for h, t in self.icmp_seen.items() if t >= horizon}
+
+    def _rate_limited(self, host: str) -> bool:
+        """이미 간격을 늘린 호스트 / 최근 ICMP 에러를 보냈는데 다른 probe에는 조용한 호스트."""
+        pace = self.pace.get(host)
+        if pace is not None and pace.delay > 0:
+            return True
+        seen = self.icmp_seen.get(host)
+        return seen is not None and self._now() - seen <= 4 * self.sc.timeout
+
+    def _on_timeout(self, key: Tuple[str, int], entry: list) -> bool:
+        """
+        응답 없는 probe를 재전송 대기열에 넣는다. 재시도가 남아 있지 않으면 False.
+        rate limit이 의심되는 호스트는 간격을 늘리고 rate_limit_retries번 더 재시도.
+        대기 중인 probe는 outstanding에서 빼서 window를 비워 둠 (안 그러면 window 개가
+        한꺼번에 timeout 났을 때 재전송할 자리가 없어 멈춤).
+        """
+        host, port, _, _, _, tries = entry
+        retries = self.sc.max_retries
+        if self._rate_limited(host):
+            self._back_off(host)
+            retries += self.sc.rate_limit_retries
+        if tries >= retries:
+            return False
+        self.stats["retransmits"] += 1
+        del self.outstanding[key]
+        self.waiting[key] = entry
+        self._enqueue(host, port, tries + 1)
+        return True
+
+    def _wait_for(self, host: str) -> float:
+        return self.sc.timing.timeout(host) if self.sc.timing is not None else self.sc.timeout
+
+    # -------------------------------------------------
+    # 전송
+    # -------------------------------------------------
+    def _shared_socket(self, family: int) -> socket.socket:
+        sock = self.socks.get(family)
+        if sock is None:
+            sock = socket.socket(family, socket.SOCK_DGRAM)
+            sock.setblocking(False)
+            if family == socket.AF_INET6:
+                sock.setsockopt(socket.IPPROTO_IPV6, _IPV6_RECVERR, 1)
+            else:
+                sock.setsockopt(socket.SOL_IP, _IP_RECVERR, 1)
+            self.sel.register(sock, selectors.EVENT_READ)
+            self.socks[family] = sock
+        return sock
+
+    def _send(self, host: str, port: int, tries: int = 0) -> bool:
+        """probe 1개 전송. 소켓 버퍼가 가득 차면 False (잠시 후 재시도)."""
+        key = (_norm_ip(host), port)
+        prev = self.outstanding.get(key)
+        if prev is not None and prev[5] >= tries:
+            return True   # 중복 작업
+        if prev is None:
+            prev = self.waiting.get(key)
+
+        family = socket.AF_INET6 if ":" in host else socket.AF_INET
+        payload = self.sc._payload(port)
+        probe_sock = prev[4] if prev is not None else None
+
+        if self.sc.use_errqueue:
+            sock = self._shared_socket(family)
+            for _ in range(3):
+                try:
+                    sock.sendto(payload, (host, port))
+                    break
+                except BlockingIOError:
+                    return False
+                except OSError as e:
+                    # 이전 ICMP 에러가 sk_err로 남아 있으면 sendto가 그 에러를 대신 돌려줌
+                    if e.errno not in _REFUSED_ERRNOS and e.errno != 113:
+                        raise
+                    self._drain_errqueue(sock)
+            else:
+                return False   # 3번 모두 이전 에러를 돌려받음 → 보내지 못했으니 잠시 후 재시도
+        elif probe_sock is not None:
+            # 재전송: 기존 connected 소켓 재사용
+            try:
+                probe_sock.send(payload)
+            except BlockingIOError:
+                return False
+            except OSError:
+                pass
+        else:
+            probe_sock = socket.socket(family, socket.SOCK_DGRAM)
+            probe_sock.setblocking(False)
+            try:
+                probe_sock.connect((host, port))
+                probe_sock.send(payload)
+            except BlockingIOError:
+                probe_sock.close()
+                return False
+            except OSError:
+                probe_sock.close()
+                self.waiting.pop(key, None)
+                self.outstanding[key] = [host, port, self._now(), 0.0, None, tries]
+                self._resolve(key, "closed")
+                return True
+            self.sel.register(probe_sock, selectors.EVENT_READ, key)
+
+        now = self._now()
+        deadline = now + self._wait_for(host)
+        self.waiting.pop(key, None)
+        self.outstanding[key] = [host, port, now, deadline, probe_sock, tries]
+        heapq.heappush(self.deadlines, (deadline, key))
+        self.stats["sent"] += 1
+        return True
+
+    # -------------------------------------------------
+    # 수신
+    # -------------------------------------------------
+    def _drain_errqueue(self, sock: socket.socket) -> None:
+        while True:
+            try:
+                _, ancdata, _, addr = sock.recvmsg(512, 512, _MSG_ERRQUEUE)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            if not addr:
+                continue
+            for level, ctype, cdata in ancdata:
+                if ctype not in (_IP_RECVERR, _IPV6_RECVERR) or len(cdata) < _SOCK_EE.size:
+                    continue
+                _, origin, icmp_type, code, _, _, _ = _SOCK_EE.unpack_from(cdata)
+                state = _icmp_error_state(origin, icmp_type, code)
+                if state is not None:
+                    self._resolve((_norm_ip(addr[0]), addr[1]), state)
+
+    def _drain_replies(self, sock: socket.socket) -> None:
+        errors = 0
+        while True:
+            try:
+                data, addr = sock.recvfrom(4096)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                # 대기 중인 ICMP 에러(sk_err) 보고 → errqueue에서 처리
+                # 같은 에러가 계속 나면 다음 select까지 미룸 (busy loop 방지)
+                self._drain_errqueue(sock)
+                errors += 1
+                if errors >= 3:
+                    return
+                continue
+            self._resolve((_norm_ip(addr[0]), addr[1]), "open", data)
+
+    def _on_ready(self, sel_key: selectors.SelectorKey) -> None:
+        sock = sel_key.fileobj
+        if self.sc.use_errqueue:
+            self._drain_errqueue(sock)
+            self._drain_replies(sock)
+            return
+
+        # fallback: probe별 connected 소켓
+        key = sel_key.data
+        try:
+            data = sock.recv(4096)
+            self._resolve(key, "open", data)
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError as e:
+            self._resolve(key, "closed" if e.errno in _REFUSED_ERRNOS else "filtered")
+
+    def _expire(self) -> None:
+        now = self._now()
+        while self.deadlines and self.deadlines[0][0] <= now:
+            deadline, key = heapq.heappop(self.deadlines)
+            entry = self.outstanding.get(key)
+            if entry is None or entry[3] != deadline:
+                continue
+            if not self._on_timeout(key, entry):
+                self._resolve(key, "open|filtered")
+
+    # -------------------------------------------------
+    # 메인 루프
+    # -------------------------------------------------
+    def _now(self) -> float:
+        return time.monotonic()
+
+    def _poll(self, wait: float) -> None:
+        """wait초까지 응답 / ICMP 에러 수신 대기."""
+        for sel_key, _ in self.sel.select(wait):
+            self._on_ready(sel_key)
+
+    def _send_paced(self, now: float) -> bool:
+        """간격 조절 대기열에서 보낼 차례가 된 probe 1개 전송. 보낸 게 없으면 False."""
+        if not self.paced or self.paced[0][0] > now:
+            return False
+
+        _, _, host = heapq.heappop(self.paced)
+        pace = self.pace[host]
+        port, tries = pace.queue[0]
+
+        if tries and (_norm_ip(host), port) not in self.waiting:
+            # 재전송 대기 중에 늦은 응답 / ICMP 에러로 이미 확정됨 → 재전송 취소
+            self._next_paced(pace, host, now, delay=0.0)
+            return True
+
+        # limiter: 블로킹 대기 대신 예약한 시각으로 다시 스케줄
+        if self.sc.limiter is not None and pace.reserved is None:
+            pace.reserved = now + self.sc.limiter.reserve(host)
+        if pace.reserved is not None and pace.reserved > now:
+            self.seq += 1
+            heapq.heappush(self.paced, (pace.reserved, self.seq, host))
+            return False
+
+        if not self._send(host, port, tries):
+            self.seq += 1
+            heapq.heappush(self.paced, (now + 0.001, self.seq, host))
+            return False
+
+        pace.reserved = None
+        self._next_paced(pace, host, now, delay=pace.delay)
+        return True
+
+    def _next_paced(self, pace: _HostPace, host: str, now: float, delay: float) -> None:
+        """대기열 맨 앞 probe를 처리 완료로 빼고 다음 probe 전송 시각 예약."""
+        pace.queue.popleft()
+        self.paced_count -= 1
+        if delay:
+            pace.next_send = now + delay
+        if pace.queue:
+            self.seq += 1
+            heapq.heappush(self.paced, (max(now, pace.next_send), self.seq, host))
+        else:
+            pace.scheduled = False
+
+    def _fill(self) -> bool:
+        """window가 허용하는 만큼 전송. 새 작업이 더 없으면 False."""
+        limiter = self.sc.limiter
+        more = True
+        while len(self.outstanding) < self.sc.window:
+            now = self._now()
+            if self._send_paced(now):
+                continue
+
+            if self.held is None:
+                if self.paced_count >= self.max_paced:
+                    break
+                task = next(self.tasks, None)
+                if task is None:
+                    more = False
+                    break
+
+                pace = self.pace.get(task[0])
+                if pace is not None and (pace.delay > 0 or pace.queue):
+                    # rate limit 걸린 호스트 → 간격 조절 대기열로
+                    self._enqueue(task[0], task[1], 0)
+                    continue
+
+                self.held = task
+                self.held_at = now
+                if limiter is not None:
+                    self.held_at += limiter.reserve(task[0])
+
+            if self.held_at > now:
+                break
+            if not self._send(*self.held):
+                break
+            self.held = None
+        return more
+
+    def run(self) -> Iterator[Tuple[str, UDPPortScanResult]]:
+        try:
+            more = True
+            while True:
+                more = self._fill() and more
+
+                while self.results:
+                    yield self.results.popleft()
+
+                if not more and self.held is None and not self.outstanding and not self.paced:
+                    return
+
+                now = self._now()
+                wake = [d for d in (
+                    self.deadlines[0][0] if self.deadlines else None,
+                    self.held_at if self.held is not None else None,
+                    self.paced[0][0] if self.paced else None,
+                ) if d is not None]
+                wait = max(0.0, min(wake) - now) if wake else 0.001
+                if self.held is not None and self.held_at <= now:
+                    wait = 0.001   # 소켓 버퍼가 비기를 잠깐 대기
+
+                self._poll(wait)
+                self._expire()
+        finally:
+            for entry in (*self.outstanding.values(), *self.waiting.values()):
+                if entry[4] is not None:
+                    entry[4].close()
+            for sock in self.socks.values():
+                sock.close()
+            self.sel.close()
+
+
+def batch_udp_scan(
+    host: str,
+    ports: Iterable[int] | str,
+    timeout: float = 1.0,
+    window: int = 512,
+    max_retries: int = 1,
+) -> List[Dict]:
+    """
+    단일 IP에 대해 배치 UDP 스캔 (threaded_udp_scan과 같은 결과 형식).
+    - 스레드 없이 소켓 하나로 window 개 probe를 동시에 유지
+    """
+    port_list = order_by_frequency(parse_ports(ports), "udp")
+    scanner = UDPBatchScanner(timeout=timeout, window=window, max_retries=max_retries)
+    results = [res for _, res in scanner.scan((host, p) for p in port_list)]
+    results.sort(key=lambda r: r.port)
+    return [r.to_dict() for r in results]
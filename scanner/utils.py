@@ -1,8 +1,19 @@
 # scanner/utils.py
+from __future__ import annotations
+import asyncio
+import errno
 import ipaddress
-from typing import List, Iterable
+import time
+from typing import List, Iterable, Tuple, TYPE_CHECKING
 import socket
 
+from .transport import get_transport
+from .metrics import INFLIGHT, observe_connect
+
+if TYPE_CHECKING:
+    from .rate_limit import RateLimiter
+    from .timing import TimingTable
+
 
 def is_valid_ip(ip: str) -> bool:
     """IPv4/IPv6 형식 검증."""
@@ -16,8 +27,8 @@ def resolve_hostname(ip: str) -> str | None:
     try:
         host, aliases, _ = socket.gethostbyaddr(ip)
         return host              # 문자열만 반환
-    except socket.herror:
-        return None              # 역방향 DNS 없으면 None
+    except OSError:
+        return None              # 역방향 DNS 없으면 None (herror / gaierror)
 
 def parse_ports(ports: str | Iterable[int]) -> List[int]:
     """
@@ -51,44 +62,235 @@ def parse_ports(ports: str | Iterable[int]) -> List[int]:
     return sorted(result)
 
 
-def tcp_connect(host: str, port: int, timeout: float = 1.0) -> socket.socket | None:
+def tcp_connect(
+    host: str,
+    port: int,
+    timeout: float = 1.0,
+    timing: TimingTable | None = None,
+    limiter: RateLimiter | None = None,
+) -> socket.socket | None:
     """
     단순 TCP connect 함수.
     - 성공: 연결된 socket 반환
     - 실패: None
+    - timing 지정 시: 호스트 RTT 기반 timeout 사용, connect 성공/RST 시간을 RTT 샘플로 기록
+    - limiter 지정 시: SYN 전송 전 전역/호스트별 토큰 확보
     """
+    if timing is not None:
+        timeout = timing.timeout(host)
+    if limiter is not None:
+        limiter.acquire(host)
+
+    transport = get_transport()
+    outcome = "error"
+    INFLIGHT.inc("tcp_connect")
+    start = transport.monotonic()
     try:
-        sock = socket.create_connection((host, port), timeout=timeout)
+        sock = transport.create_connection((host, port), timeout=timeout)
+        outcome = "open"
+        if timing is not None:
+            timing.observe(host, transport.monotonic() - start)
         return sock
+    except ConnectionRefusedError:
+        # RST 응답도 왕복 시간 샘플로 사용
+        outcome = "refused"
+        if timing is not None:
+            timing.observe(host, transport.monotonic() - start)
+        return None
+    except socket.timeout:
+        outcome = "timeout"
+        return None
     except OSError:
         return None
+    finally:
+        INFLIGHT.dec("tcp_connect")
+        observe_connect("tcp", outcome, transport.monotonic() - start)
+
+
+_CONNECT_IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY, 10035}
 
 
-def udp_connect(host: str, port: int, timeout: float = 1.0) -> str:
+async def async_tcp_connect(
+    sock: socket.socket,
+    addr: tuple,
+    timeout: float,
+    timing: TimingTable | None = None,
+    limiter: RateLimiter | None = None,
+) -> bool:
+    """
+    non-blocking connect.
+    - connect_ex 결과가 즉시 나오면(loopback RST 등) 이벤트 루프를 거치지 않음
+    - 진행 중이면 writable 이벤트 / timeout 중 먼저 오는 쪽을 기다림
+    - timing 지정 시: 호스트 RTT 기반 timeout, 성공/RST 응답 시간을 샘플로 기록
+    - limiter 지정 시: SYN 전송 전 전역/호스트별 토큰 확보 (이벤트 루프는 막지 않음)
+    """
+    loop = asyncio.get_running_loop()
+    host = addr[0]
+    if timing is not None:
+        timeout = timing.timeout(host)
+    if limiter is not None:
+        await limiter.acquire_async(host)
+
+    start = time.monotonic()
+    err = sock.connect_ex(addr)
+    if err in (0, errno.ECONNREFUSED, 10061):
+        if timing is not None:
+            timing.observe(host, time.monotonic() - start)
+        observe_connect("tcp", "open" if err == 0 else "refused", time.monotonic() - start)
+        return err == 0
+    if err not in _CONNECT_IN_PROGRESS:
+        observe_connect("tcp", "error", time.monotonic() - start)
+        return False
+
+    fut = loop.create_future()
+    fd = sock.fileno()
+
+    def _wake() -> None:
+        if not fut.done():
+            fut.set_result(None)
+
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.settimeout(timeout)
+        loop.add_writer(fd, _wake)
+    except NotImplementedError:
+        # Proactor 루프(Windows)는 add_writer 미지원 → sock_connect로 처리
+        try:
+            await asyncio.wait_for(loop.sock_connect(sock, addr), timeout)
+            return True
+        except (OSError, asyncio.TimeoutError):
+            return False
 
-        # UDP는 연결 개념이 없어 바로 sendto()로 패킷 전송
-        sock.sendto(b"", (host, port))
+    handle = loop.call_later(timeout, _wake)
+    INFLIGHT.inc("tcp_connect")
+    try:
+        await fut
+    finally:
+        INFLIGHT.dec("tcp_connect")
+        loop.remove_writer(fd)
+        handle.cancel()
 
+    err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+    if err == 0:
         try:
-            data, addr = sock.recvfrom(1024)
-            # 응답 패킷 수신 → open
-            return "open"
-        except socket.timeout:
-            # 응답 없음 → open|filtered
-            return "open|filtered"
-        except OSError as e:
-            # ICMP Port Unreachable (Win/Linux 에러 코드 다름)
-            if e.errno in (111, 113, 10061):
-                return "closed"
-            return "open|filtered"
+            sock.getpeername()   # timeout으로 깨어난 경우 아직 미연결
+        except OSError:
+            observe_connect("tcp", "timeout", time.monotonic() - start)
+            return False
+
+    if timing is not None and err in (0, errno.ECONNREFUSED, 10061):
+        timing.observe(host, time.monotonic() - start)
+    outcome = "open" if err == 0 else "refused" if err in (errno.ECONNREFUSED, 10061) else "error"
+    observe_connect("tcp", outcome, time.monotonic() - start)
+    return err == 0
+
+
+def tcp_ping(
+    host: str,
+    port: int,
+    timeout: float = 1.0,
+    timing: TimingTable | None = None,
+    limiter: RateLimiter | None = None,
+) -> tuple[str, float | None]:
+    """
+    호스트 생존 확인용 TCP connect.
+    - 반환: (결과, RTT)  결과 = "open" / "refused" / "timeout" / "error"
+    - open과 refused 모두 호스트가 응답했다는 뜻
+    """
+    if timing is not None:
+        timeout = timing.timeout(host)
+    if limiter is not None:
+        limiter.acquire(host)
+
+    transport = get_transport()
+    start = transport.monotonic()
+    try:
+        sock = transport.create_connection((host, port), timeout=timeout)
+        sock.close()
+        outcome = "open"
+    except ConnectionRefusedError:
+        outcome = "refused"
+    except socket.timeout:
+        return "timeout", None
+    except OSError:
+        return "error", None
+
+    rtt = transport.monotonic() - start
+    if timing is not None:
+        timing.observe(host, rtt)
+    return outcome, rtt
+
+
+def udp_connect(
+    host: str,
+    port: int,
+    timeout: float = 1.0,
+    timing: TimingTable | None = None,
+    limiter: RateLimiter | None = None,
+    retries: int = 0,
+) -> str:
+    state, _ = udp_probe(host, port, b"", timeout, timing=timing, limiter=limiter, retries=retries)
+    return state
+
+
+def udp_probe(
+    host: str,
+    port: int,
+    payload: bytes = b"",
+    timeout: float = 1.0,
+    timing: TimingTable | None = None,
+    limiter: RateLimiter | None = None,
+    retries: int = 0,
+) -> Tuple[str, bytes | None]:
+    """UDP 요청 전송 후 (state, 응답 데이터) 반환."""
+    if timing is not None:
+        timeout = timing.timeout(host)
+
+    transport = get_transport()
+    sock = None
+    # 지표용 결과: open(응답) / refused(ICMP unreachable) / timeout(무응답) / error
+    outcome = "error"
+    INFLIGHT.inc("udp_probe")
+    begin = transport.monotonic()
+    try:
+        family = socket.AF_INET6 if ":" in host else socket.AF_INET
+        sock = transport.udp_socket(family)
+        sock.settimeout(timeout)
+
+        # connect()한 UDP 소켓이어야 ICMP port unreachable이 recv 에러로 전달됨
+        sock.connect((host, port))
+
+        # 응답이 없으면 retries 만큼 재전송 (UDP probe / ICMP 응답 유실 대비)
+        for _ in range(max(0, retries) + 1):
+            if limiter is not None:
+                limiter.acquire(host)
+            start = transport.monotonic()
+            sock.send(payload)
+
+            try:
+                data = sock.recv(4096)
+                # 응답 패킷 수신 → open
+                outcome = "open"
+                if timing is not None:
+                    timing.observe(host, transport.monotonic() - start)
+                return "open", data
+            except socket.timeout:
+                continue
+            except OSError as e:
+                # ICMP Port Unreachable (Win/Linux 에러 코드 다름)
+                if e.errno in (111, 113, 10061):
+                    outcome = "refused"
+                    if timing is not None:
+                        timing.observe(host, transport.monotonic() - start)
+                    return "closed", None
+                return "open|filtered", None
+
+        # 응답 없음 → open|filtered
+        outcome = "timeout"
+        return "open|filtered", None
 
     except Exception:
-        return "closed"
+        return "closed", None
     finally:
-        try:
+        if sock is not None:
             sock.close()
-        except:
-            pass
\ No newline at end of file
+        INFLIGHT.dec("udp_probe")
+        observe_connect("udp", outcome, transport.monotonic() - begin)
@@ -1,36 +1,19 @@
 # scanner/version_parser.py
 
-import re
+from .signatures import match_banner
 
 def parse_version(service: str, banner: str | None) -> str | None:
     if not banner:
         return None
 
-    b = banner.lower()
+    # 시그니처 DB (scanner/signatures.json)에서 product / version 매칭
+    m = match_banner(banner, service)
+    if m and m.version:
+        return m.version
 
-    # SSH
-    if service == "ssh":
-        m = re.search(r"openssh[_/ ]([\d\.p]+)", b)
-        if m:
-            return m.group(1)
-        return banner.strip()
-
-    # FTP
-    if service == "ftp":
-        m = re.search(r"vsftpd ([\d\.]+)", b)
-        if m:
-            return m.group(1)
-        return banner.strip()
-
-    # HTTP
+    # HTTP는 버전을 못 찾으면 저장하지 않음
     if service == "http":
-    # Server: Apache/2.4.25 (Debian)
-        m = re.search(r"Apache/([\d\.]+)", banner, re.IGNORECASE)
-        if m:
-            return m.group(1)   # ← 버전만 저장됨
         return None
-    # Telnet은 배너 파싱 실패해도 raw로 출력
-    if service == "telnet":
-        return banner.strip()
 
+    # SSH / FTP / Telnet 등은 배너 파싱 실패해도 raw로 출력
     return banner.strip()
@@ -0,0 +1,56 @@
+# scripts/merge_shards.py
+import argparse
+
+from scanner.checkpoint import load_scan_file
+from scanner.scan_runner import generate_scan_id
+from scanner.sharding import merge_shard_results
+from db.save_scan_results import save_scan_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge --shard scan outputs into one scan record")
+    parser.add_argument("files", nargs="+", help="Shard JSON files written by run_scan --shard (-oJ)")
+    parser.add_argument("--scan-id", help="scan_id for the merged record (default: new id)")
+    parser.add_argument("--no-db", action="store_true", help="Print the summary only, do not save to DB")
+    args = parser.parse_args()
+
+    shards = [load_scan_file(path) for path in args.files]
+
+    # 모든 shard가 모였는지 확인 (빠진 shard가 있어도 병합은 진행)
+    counts = {tuple(s["shard"])[1] for s in shards if s.get("shard")}
+    indexes = {tuple(s["shard"])[0] for s in shards if s.get("shard")}
+    if len(counts) > 1:
+        print(f"[!] Shards come from different splits: {sorted(counts)}")
+        return
+    if counts:
+        missing = sorted(set(range(1, counts.pop() + 1)) - indexes)
+        if missing:
+            print(f"[!] Missing shards: {missing}")
+
+    try:
+        result = merge_shard_results(shards, scan_id=args.scan_id or generate_scan_id())
+    except ValueError as e:
+        print(f"[!] {e}")
+        return
+
+    n_hosts = 0
+    n_open = 0
+    for t in result["targets"]:
+        if "error" in t or t.get("status") == "down":
+            continue
+        n_hosts += 1
+        n_open += t["results"].count("open")
+
+    print(
+        f"Merged {len(shards)} shard(s) into {result['scan_id']}: "
+        f"{n_hosts} host up, {n_open} open ports"
+    )
+
+    if args.no_db:
+        return
+    save_scan_results(result)
+    print("\n[+] DB 저장 완료")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,66 @@
 # scripts/run_scan.py
 import argparse
-from scanner.scan_runner import run_scan
-from db.save_scan_results import save_scan_results
+from scanner.scan_runner import iter_scan
+from scanner.targets import TargetSpace, TargetSpecs
+from scanner.multiproc import run_scan_multiprocess
+from scanner.result_store import HostResults, PortLayout
+from scanner.config import load_scanner_config
+from scanner.checkpoint import ScanCheckpoint, load_checkpoint, dump_run, dump_result, write_scan_file
+from scanner.sharding import parse_shard
+from scanner.tls_scanner import run_tls_stage
+from scanner.rate_limit import RateLimiter
+from scanner.rdns import ReverseResolver, attach_host_names
+from scanner.resolver import resolve_target_specs
+from scanner.incremental import known_ports_by_host, full_sweep_due, plan_incremental, diff_results
+from scanner.utils import parse_ports
+from db.save_scan_results import StreamingScanSaver, save_scan_results, save_port_changes
+from db.db_client import get_connection
+from db.query_helpers import get_open_ports, get_last_full_sweep
 from scanner.service_fingerprints import guess_service
+from scanner import metrics
 from datetime import datetime
 
 
 def main():
+    config = load_scanner_config()
+    net_cfg = config["network"]
+    tls_cfg = config["tls"]
+    inc_cfg = config["incremental"]
+
     parser = argparse.ArgumentParser(description="Custom Scanner")
     sub = parser.add_subparsers(dest="command")
     scan_parser = sub.add_parser("scan", help="run scanner")
 
     # 포트 범위
     scan_parser.add_argument("--ports", default="1-1024", help="Port range (fixed)")
-    scan_parser.add_argument("--target", required=True, help="IP or domain to scan")
+    scan_parser.add_argument(
+        "--top-ports",
+        type=int,
+        metavar="N",
+        help="Scan the N most frequently open ports per protocol instead of --ports",
+    )
+    scan_parser.add_argument(
+        "--port-order",
+        choices=["frequency", "numeric"],
+        default="frequency",
+        help="Probe order (frequency: most likely open ports first)",
+    )
+    scan_parser.add_argument(
+        "--target",
+        help="IP, CIDR (10.0.0.0/16), range (10.0.1.5-200) or hostname; comma separated",
+    )
+    scan_parser.add_argument(
+        "-iL",
+        "--input-list",
+        metavar="FILE",
+        help="Read target specs from a file (one or more per line)",
+    )
+    scan_parser.add_argument(
+        "--randomize",
+        action="store_true",
+        help="Scan the (host, port) space in a random permutation order",
+    )
+    scan_parser.add_argument("--seed", type=int, default=None, help="Permutation seed")
 
     # 스캔 타입
     scan_parser.add_argument("-sT", action="store_true", help="TCP scan")
@@ -21,7 +68,85 @@ def main():
 
     # 성능 옵션
     scan_parser.add_argument("--timeout", type=float, default=1.0)
+    scan_parser.add_argument(
+        "--adaptive-timeout",
+        action=argparse.BooleanOptionalAction,
+        default=net_cfg["adaptive_timeout"],
+        help="Derive per-host connect timeouts from measured RTT (--timeout is the upper bound)",
+    )
+    scan_parser.add_argument(
+        "--min-rtt-timeout",
+        type=float,
+        default=net_cfg["min_rtt_timeout"],
+        help="Lower bound for adaptive timeouts (seconds)",
+    )
     scan_parser.add_argument("--max-workers", type=int, default=100)
+    scan_parser.add_argument(
+        "--rate",
+        type=float,
+        default=net_cfg["rate_limit_per_second"],
+        help="Max probes per second across all targets (0 = unlimited)",
+    )
+    scan_parser.add_argument(
+        "--host-rate",
+        type=float,
+        default=net_cfg["rate_limit_per_host"],
+        help="Max probes per second per target host (0 = unlimited)",
+    )
+    scan_parser.add_argument(
+        "--udp-engine",
+        choices=["threaded", "batch"],
+        default="batch",
+        help="UDP engine (batch: probes many ports from one socket, collects ICMP errors asynchronously)",
+    )
+    scan_parser.add_argument(
+        "--udp-window",
+        type=int,
+        default=512,
+        help="Max outstanding probes for the batch UDP engine",
+    )
+    scan_parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=net_cfg["max_retries"],
+        help="Retransmissions for unanswered UDP probes (slows down per host on ICMP rate limiting)",
+    )
+
+    # Host discovery
+    scan_parser.add_argument(
+        "--discover",
+        action="store_true",
+        help="Probe a few ports first and port-scan only hosts that answer",
+    )
+    scan_parser.add_argument(
+        "--discovery-ports",
+        default="80,443,22,445,3389",
+        help="TCP ports used for host discovery (open or refused = alive)",
+    )
+    scan_parser.add_argument(
+        "--icmp",
+        action="store_true",
+        help="Also use ICMP echo for host discovery (needs ping socket / raw socket privilege)",
+    )
+
+    scan_parser.add_argument(
+        "--engine",
+        choices=["threaded", "async"],
+        default="threaded",
+        help="TCP scan engine (threaded: ThreadPoolExecutor, async: asyncio)",
+    )
+    scan_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1000,
+        help="Max in-flight connects for the async engine",
+    )
+    scan_parser.add_argument(
+        "--max-host-inflight",
+        type=int,
+        default=None,
+        help="Max in-flight probes per target host (default: global limit)",
+    )
 
     # 서비스/버전 탐지
     scan_parser.add_argument(
@@ -30,6 +155,66 @@ def main():
         help="Detect service versions (banner/metadata)",
     )
 
+    scan_parser.add_argument(
+        "--tls",
+        action=argparse.BooleanOptionalAction,
+        default=tls_cfg["enabled"],
+        help="TLS handshake (SNI) on https-like open ports: certificate subject/SAN/expiry + Server header "
+             "(off by default; adds one extra connection per candidate port)",
+    )
+    scan_parser.add_argument(
+        "--tls-concurrency",
+        type=int,
+        default=tls_cfg["max_concurrency"],
+        help="Max TLS handshakes in flight",
+    )
+
+    # 증분 스캔 (DB의 이전 결과 기준)
+    scan_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Re-verify ports open in the DB + top ports; sweep --ports fully only every full_sweep_hours",
+    )
+    scan_parser.add_argument(
+        "--full-sweep",
+        action="store_true",
+        help="With --incremental: force the full --ports sweep now",
+    )
+
+    # 체크포인트 / 재개
+    scan_parser.add_argument(
+        "--resume",
+        metavar="SCAN_ID",
+        help="Resume an interrupted scan from logs/checkpoints/<SCAN_ID>.json",
+    )
+    scan_parser.add_argument(
+        "--checkpoint-interval",
+        type=float,
+        default=30.0,
+        help="Seconds between progress checkpoints",
+    )
+
+    # 멀티 프로세스 (코어 수만큼 워커 프로세스, 각자 shard 하나씩 스캔)
+    scan_parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Worker processes; each scans its own shard of the host x port space",
+    )
+
+    # 분산 스캔: (host, port, proto) 공간을 N개로 나눠 그중 i번째만 스캔
+    scan_parser.add_argument(
+        "--shard",
+        metavar="i/N",
+        help="Scan only shard i of N (results go to -oJ, combine with scripts.merge_shards)",
+    )
+    scan_parser.add_argument(
+        "-oJ",
+        "--output-json",
+        metavar="FILE",
+        help="Save compact JSON results (default for --shard: <scan_id>.shard<i>of<N>.json)",
+    )
+
     # 텍스트 출력 파일(-oN)
     scan_parser.add_argument(
         "-oN",
@@ -38,6 +223,19 @@ def main():
         help="Save normal text output to a text file",
     )
 
+    # 지표 (connect / banner latency, 결과 카운터, 단계별 시간)
+    scan_parser.add_argument(
+        "--metrics",
+        metavar="FILE",
+        help="Write scanner metrics at the end of the scan (.prom/.txt: Prometheus text, otherwise JSON)",
+    )
+    scan_parser.add_argument(
+        "--metrics-format",
+        choices=["json", "prometheus"],
+        default=None,
+        help="Metrics file format (default: by --metrics extension)",
+    )
+
     args = parser.parse_args()
 
     # 스캐너 사용 방법
@@ -45,6 +243,100 @@ def main():
         print("Usage: python -m scripts.run_scan scan -sT -sU --target <IP>")
         return
 
+    # 중단된 스캔 재개: 체크포인트에 저장된 옵션으로 다시 실행
+    resume_data = None
+    if args.resume:
+        try:
+            resume_data = load_checkpoint(args.resume)
+        except FileNotFoundError:
+            print(f"[!] 체크포인트가 없습니다: {args.resume}")
+            return
+        args = argparse.Namespace(**{**resume_data["options"], "command": "scan", "resume": args.resume})
+        print(f"[+] Resuming {args.resume} (saved at {resume_data['saved_at']})")
+
+    # --metrics를 지정하지 않으면 기록도 하지 않음
+    metrics_path = getattr(args, "metrics", None)
+    metrics.set_enabled(bool(metrics_path))
+
+    def save_metrics() -> None:
+        if metrics_path:
+            fmt = metrics.write_metrics(metrics_path, getattr(args, "metrics_format", None))
+            print(f"[+] Saved {fmt} metrics to {metrics_path}")
+
+    if not args.target and not args.input_list:
+        print("[!] --target 또는 -iL 중 하나는 필요합니다")
+        return
+
+    shard = None
+    if args.shard:
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            print(f"[!] {e}")
+            return
+
+    # 호스트 이름 타겟은 스캔 전에 한꺼번에 조회해서 주소로 교체
+    # (여러 이름이 같은 주소면 한 번만 스캔)
+    specs = [args.target] if args.target else []
+    resolved = resolve_target_specs(TargetSpecs(specs, args.input_list))
+    if resolved.hostnames or resolved.unresolved:
+        n_names = len({n for names in resolved.hostnames.values() for n in names})
+        print(
+            f"[+] Resolved {n_names} hostname(s) to {len(resolved.hostnames)} address(es)"
+            + (f", {len(resolved.unresolved)} unresolved" if resolved.unresolved else "")
+        )
+
+    # 타겟 스펙은 구간 단위 TargetSpace (주소를 펼치지 않음, 겹치는 스펙은 한 번만)
+    # → randomize 인덱스 접근 + 끝난 호스트를 1비트로 기록하는 seen 비트맵에 사용
+    targets = TargetSpace(resolved.specs)
+
+    # 스캔할 주소가 하나도 없으면 DB(scans 행) / 체크포인트 / 출력 파일을 만들지 않고 종료
+    if len(targets) == 0:
+        unresolved = set(resolved.unresolved)
+        for spec in targets.invalid:
+            if spec in unresolved:
+                print(f"[!] Error: failed to resolve {spec}")
+            else:
+                print(f"[!] Error: invalid_ip (invalid IP: {spec})")
+        print("[!] No valid targets to scan")
+        return
+
+    # scans.target(VARCHAR 255)에 저장되는 값 그대로 (스트리밍 / --processes 저장과 full sweep 조회가 같은 라벨 사용)
+    target_label = ",".join(specs + ([f"-iL {args.input_list}"] if args.input_list else []))[:255]
+
+    # 증분 스캔: DB에 open으로 남아있는 포트 + 상위 포트 (+ 주기가 됐으면 전체 범위)
+    ports = args.ports
+    port_label = f"top {args.top_ports}" if getattr(args, "top_ports", None) else args.ports
+    known = None
+    plan = None
+    if getattr(args, "incremental", False):
+        conn = get_connection()
+        try:
+            known_rows = get_open_ports(conn)
+            last_full = get_last_full_sweep(conn, target_label)
+        finally:
+            conn.close()
+
+        known = known_ports_by_host(known_rows, targets)
+        due = args.full_sweep or full_sweep_due(last_full, inc_cfg["full_sweep_hours"])
+        if getattr(args, "planned_mode", None):
+            due = args.planned_mode == "full"   # 재개: 처음 실행 때 정한 모드 그대로
+        top_n = getattr(args, "top_ports", None) or inc_cfg["top_ports"]
+        protocols = (["tcp"] if args.sT or not args.sU else []) + (["udp"] if args.sU else [])
+        plan = plan_incremental(known, parse_ports(args.ports), top_n, due, last_full, protocols)
+        if getattr(args, "planned_ports", None):
+            # 재개: 처음 실행 때 정한 포트 목록 그대로 (체크포인트 상태 배열과 맞아야 함)
+            plan.ports, plan.mode = args.planned_ports, args.planned_mode
+        args.planned_ports, args.planned_mode = plan.ports, plan.mode
+
+        ports = plan.ports
+        port_label = args.ports if plan.mode == "full" else f"incremental ({len(plan.ports)} ports)"
+        n_common = "/".join(f"{len(p)} {proto}" for proto, p in plan.common.items())
+        print(
+            f"[+] Incremental scan ({plan.mode}): {n_common} ports per host, "
+            f"+ {plan.known_ports} known open ports re-verified on {plan.known_hosts} hosts"
+        )
+
     # Nmap 스타일 옵션 해석
     if not args.sT and not args.sU:
         scan_type = "tcp"
@@ -63,26 +355,158 @@ def main():
     enable_udp = udp_enabled and tcp_enabled  # TCP+UDP
     udp_only = (udp_enabled and not tcp_enabled)
 
-    # 실행
-    results = run_scan(
-        targets=[args.target],
-        ports=args.ports,
+    scan_options = dict(
         timeout=args.timeout,
         threaded=True,
         max_workers=args.max_workers,
+        engine=args.engine,
+        concurrency=args.concurrency,
+        per_host_limit=args.max_host_inflight,
         enable_udp=enable_udp,
         udp_only=udp_only,
         scan_type=scan_type,
+        randomize=args.randomize,
+        seed=args.seed,
+        adaptive_timeout=args.adaptive_timeout,
+        min_timeout=args.min_rtt_timeout,
+        rate_limit=args.rate,
+        host_rate_limit=args.host_rate,
+        rate_burst=net_cfg["rate_limit_burst"] or None,
+        discovery=args.discover,
+        discovery_ports=args.discovery_ports,
+        discovery_icmp=args.icmp,
+        udp_engine=args.udp_engine,
+        udp_window=args.udp_window,
+        udp_retries=args.max_retries,
+        hostnames=resolved.hostnames,
+        unresolved=resolved.unresolved,
+        # 증분 스캔은 포트 목록(plan.ports, 모든 호스트 계획의 합집합)을 직접 넘기고 호스트별로 거름
+        top_ports=None if plan else getattr(args, "top_ports", None),
+        task_filter=plan.wants if plan else None,
+        port_order=getattr(args, "port_order", "frequency"),
     )
 
-    # 출력 준비 (콘솔 + 파일 공통)
-    file_lines = []  # -oN 파일에 쓸 라인들
+    # 출력 준비 (콘솔 + -oN 파일에 바로 기록)
+    # (재개한 스캔은 기존 파일 뒤에 이어서 기록)
+    out_mode = "a" if resume_data else "w"
+    out_file = open(args.output_normal, out_mode, encoding="utf-8") if args.output_normal else None
+
+    def out(line: str = "") -> None:
+        print(line, flush=True)
+        if out_file is not None:
+            out_file.write(line + "\n")
+            out_file.flush()
+
+    run = None
+    saver = None
+    if args.processes > 1:
+        # 멀티 프로세스: 워커별 shard를 끝까지 스캔한 뒤 병합 (스트리밍 / 체크포인트 없음)
+        out(f"Starting Scan at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ({args.processes} processes)")
+        results = run_scan_multiprocess(
+            targets,
+            ports,
+            processes=args.processes,
+            shard=shard,
+            **scan_options,
+        )
+        results["target"] = target_label
+        for t in results["targets"]:
+            if isinstance(t["results"], HostResults):
+                for r in t["results"].dicts(("open",)):
+                    out(f"Discovered open port {r['port']}/{r['protocol']} on {t['ip']}")
+        out()
+    else:
+        # 실행 (결과는 포트가 끝나는 즉시 스트리밍)
+        # 끝난 호스트 entry는 바로 정리 (open 포트 / 증분 비교 대상 호스트만 남김) → 긴 스윕도 메모리 일정
+        run = iter_scan(targets, ports, resume=resume_data, shard=shard, flush_hosts=True, **scan_options)
+        run.target = target_label
+        if known:
+            run.retain = known.__contains__
+        run.checkpoint = ScanCheckpoint(
+            run.scan_id,
+            options={k: v for k, v in vars(args).items() if k not in ("command", "resume")},
+            interval=args.checkpoint_interval,
+        )
+
+        out(f"Starting Scan at {run.started_at}")
+
+        # DB에는 RUNNING 상태로 먼저 기록 후 open 포트가 나올 때마다 저장
+        # (shard 스캔은 merge_shards에서 합친 뒤 한 번에 저장)
+        if shard is None:
+            saver = StreamingScanSaver(
+                scan_id=run.scan_id,
+                target=target_label,
+                scan_type=scan_type,
+                port_range=port_label,
+                started_at=run.started_at,
+                config_snapshot={"incremental": plan.mode} if plan else None,
+                scan_db_id=resume_data.get("scan_db_id") if resume_data else None,
+            )
+            # 체크포인트에 행 id를 남겨 --resume 시 같은 scans 행을 이어서 사용
+            run.checkpoint.scan_db_id = saver.scan_db_id
+
+        # 역방향 DNS는 호스트 결과가 처음 나올 때 백그라운드로 시작
+        resolver = ReverseResolver() if shard is None else None
+
+        try:
+            for host, r in run:
+                # 보고할 포트가 있는 호스트만 조회 (나머지 남은 entry는 attach_host_names에서)
+                if resolver is not None and (r.state == "open" or r.banner):
+                    resolver.submit(host)
+                if saver is not None:
+                    saver.add(host, r)
+                if r.state == "open":
+                    out(f"Discovered open port {r.port}/{r.protocol} on {host}")
+        except BaseException:
+            run.checkpoint.save(run)
+            if saver is not None:
+                saver.fail()
+            if resolver is not None:
+                resolver.close()
+            if out_file is not None:
+                out_file.close()
+            print(f"\n[!] Scan interrupted. Resume with: --resume {run.scan_id}")
+            # 중단된 스캔도 그때까지의 지표는 남김
+            save_metrics()
+            raise
+
+        run.checkpoint.remove()
+
+        results = run.result()
+        if resolver is not None:
+            attach_host_names(results, resolver)
+            resolver.close()
+        out()
+
+    # TLS stage: https 후보 포트에 동시 핸드셰이크 → 인증서 / Server 헤더로 레코드 갱신
+    if getattr(args, "tls", tls_cfg["enabled"]):
+        # 핸드셰이크 connect도 --rate / --host-rate 제한을 따름
+        tls_limiter = None
+        if args.rate > 0 or args.host_rate > 0:
+            tls_limiter = RateLimiter(
+                rate=args.rate, per_host_rate=args.host_rate, burst=net_cfg["rate_limit_burst"] or None
+            )
+        updated = run_tls_stage(
+            results,
+            timeout=tls_cfg["timeout"],
+            concurrency=getattr(args, "tls_concurrency", tls_cfg["max_concurrency"]),
+            limiter=tls_limiter,
+        )
+        if saver is not None:
+            for host, record in updated:
+                saver.add(host, record)
+
+    # 증분 스캔: DB(ports.last_scan_id 시점)와 비교해서 변경 사항 표시
+    changes = []
+    if plan is not None:
+        changes = diff_results(results, known)
+        results["incremental"] = plan.to_dict()
+        results["changes"] = [c.to_dict() for c in changes]
+        results["port_range"] = port_label
+        results["config"] = {"incremental": plan.mode}
 
-    scan_id = results["scan_id"]
     started_at = results["started_at"]
     finished_at = results["finished_at"]
-    target_info = results["targets"][0]
-    ip = target_info["ip"]
 
     # 문자열 → datetime 변환
     started_dt = datetime.fromisoformat(started_at)
@@ -91,68 +515,120 @@ def main():
     # 시간 차이 계산
     duration = (finished_dt - started_dt).total_seconds()
 
-    if "error" in target_info:
-        msg = f"[!] Error: {target_info['error']} (invalid IP: {ip})"
-        print(msg)
-        file_lines.append(msg)
-        return
-
-    port_results = target_info["results"]
-
-    line = f"Starting Scan at {started_at}"
-    print(line)
-    file_lines.append(line)
+    n_hosts = 0
+    for target_info in results["targets"]:
+        ip = target_info["ip"]
 
-    line = f"Scan report for {ip}"
-    print(line)
-    file_lines.append(line)
-
-    print("Host is up")
-    file_lines.append("Host is up")
-
-    closed = [r for r in port_results if r["state"] == "closed"]
-    line = f"closed ports: {len(closed)}"
-    print(line)
-    file_lines.append(line)
-
-    # 헤더
-    header = "PORT\tSTATE\tSERVICE\tVERSION" if args.sV else "PORT\tSTATE\tSERVICE"
-    print(header)
-    file_lines.append(header)
+        if "error" in target_info:
+            if target_info["error"] == "unresolved":
+                out(f"[!] Error: failed to resolve {ip}")
+            else:
+                out(f"[!] Error: {target_info['error']} (invalid IP: {ip})")
+            continue
 
-    # 포트 출력
-    for r in sorted(port_results, key=lambda x: (x["protocol"], x["port"])):
+        names = target_info.get("hostnames")
+        out(f"Scan report for {names[0]} ({ip})" if names else f"Scan report for {ip}")
 
-        # open 포트만 출력
-        if r["state"] != "open":
+        if target_info.get("status") == "down":
+            out("Host seems down")
+            out()
             continue
 
-        port = r["port"]
-        proto = r["protocol"]
-        state = r["state"]
-
-        service = r.get("service") or guess_service(port) or "-"
-        version = r.get("version") or "-"
+        n_hosts += 1
+        port_results = target_info["results"]
 
-        if args.sV:
-            line = f"{port}/{proto}\t{state}\t{service:<15}\t{version}"
+        discovery = target_info.get("discovery")
+        if discovery:
+            out(f"Host is up ({discovery['method']})")
         else:
-            line = f"{port}/{proto}\t{state}\t{service}"
+            out("Host is up")
 
-        print(line)
-        file_lines.append(line)
+        out(f"closed ports: {port_results.count('closed')}")
 
-    # -oN 파일 저장
-    if args.output_normal:
-        with open(args.output_normal, "w", encoding="utf-8") as f:
-            f.write("\n".join(file_lines))
+        tls_info = {("tcp", d["port"]): d for d in target_info.get("tls", ())}
+
+        # 헤더
+        out("PORT\tSTATE\tSERVICE\tVERSION" if args.sV else "PORT\tSTATE\tSERVICE")
+
+        # 포트 출력
+        # open 포트만 출력
+        for r in sorted(port_results.dicts(("open",)), key=lambda x: (x["protocol"], x["port"])):
+            port = r["port"]
+            proto = r["protocol"]
+            state = r["state"]
+
+            service = r.get("service") or guess_service(port, proto) or "-"
+            version = r.get("version") or "-"
+
+            if args.sV:
+                out(f"{port}/{proto}\t{state}\t{service:<15}\t{version}")
+            else:
+                out(f"{port}/{proto}\t{state}\t{service}")
+
+            tls = tls_info.get((proto, port))
+            if args.sV and tls and tls["subject"] is not None:
+                out(f"| ssl-cert: {tls['subject']}")
+                if tls["san"]:
+                    out(f"| SAN: {', '.join(tls['san'])}")
+                expired = " (EXPIRED)" if tls["expired"] else ""
+                out(f"|_Not valid after: {tls['not_after']}{expired}")
+
+        out()
+
+    # flush_hosts로 정리된 호스트 (보고할 포트가 없어 개별 보고 생략)
+    flushed = results.get("flushed") or {}
+    if flushed.get("up") or flushed.get("down"):
+        n_hosts += flushed["up"]
+        out(f"Not shown: {flushed['up']} host(s) up with no open ports, {flushed['down']} host(s) down")
+        out()
+
+    if plan is not None:
+        out(f"Changes since last scan: {len(changes)}")
+        for c in changes:
+            if c.change == "new_open":
+                detail = f"new open ({c.service or '-'} {c.version or ''})".rstrip()
+            elif c.change == "closed":
+                detail = f"closed (was open in {c.previous_scan_id})"
+            else:
+                detail = f"version {c.previous_version} -> {c.version}"
+            out(f"  {c.ip}\t{c.port}/{c.protocol}\t{detail}")
+        out()
+
+    if out_file is not None:
+        out_file.close()
         print(f"\n[+] Saved output to {args.output_normal}")
 
-    # DB 저장
-    print(f"Scan done: 1 IP address (1 host up) scanned in {duration} seconds")
-    save_scan_results(results)
-    print("\n[+] DB 저장 완료")
+    json_path = args.output_json
+    if json_path is None and shard is not None:
+        json_path = f"{results['scan_id']}.shard{shard[0]}of{shard[1]}.json"
+    if json_path:
+        if run is not None:
+            data = dump_run(run)
+        else:
+            layout = next(
+                (t["results"].layout for t in results["targets"] if isinstance(t["results"], HostResults)),
+                PortLayout(),
+            )
+            data = dump_result(results, layout)
+        write_scan_file(json_path, data)
+        print(f"[+] Saved JSON results to {json_path}")
+
+    if saver is not None:
+        saver.finish(results)
+    elif run is None and shard is None:
+        save_scan_results(results)
+    if changes and shard is None:
+        save_port_changes(results["scan_id"], changes)
+
+    save_metrics()
+
+    if n_hosts == 0:
+        return
 
+    n_scanned = sum(1 for t in results["targets"] if "error" not in t) + sum(flushed.values())
+    print(f"Scan done: {n_scanned} IP address ({n_hosts} host up) scanned in {duration} seconds")
+    if shard is None:
+        print("\n[+] DB 저장 완료")
 
 if __name__ == "__main__":
     main()
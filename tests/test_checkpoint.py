@@ -0,0 +1,78 @@
+# tests/test_checkpoint.py
+"""
+체크포인트 저장 / 로드 / 재개 검증 (simnet 가상 네트워크 사용).
+    python -m pytest tests/test_checkpoint.py
+"""
+from scanner.checkpoint import ScanCheckpoint, dump_run, decode_scan_data, load_checkpoint
+from scanner.scan_runner import iter_scan
+from scanner.simnet import SimHost, SimNetwork, SimService
+from scanner.targets import TargetSpace
+from scanner.transport import use_transport
+
+TARGETS = ["10.0.0.1-4", "bad host"]
+SSH_BANNER = b"SSH-2.0-OpenSSH_8.9p1\r\n"
+
+
+def _network() -> SimNetwork:
+    return SimNetwork({
+        "10.0.0.2": SimHost(tcp={22: SimService(banner=SSH_BANNER), 80: SimService()}),
+        "10.0.0.3": SimHost(tcp={443: SimService()}),
+    })
+
+
+def _scan(**options):
+    with use_transport(_network()):
+        run = iter_scan(TargetSpace(TARGETS), "20-25,80,443", timeout=0.1, engine="sequential", **options)
+        return run, list(run)
+
+
+# ---------------------------------------------------------------------
+# 저장 / 로드
+# ---------------------------------------------------------------------
+
+def test_checkpoint_file_round_trip(tmp_path):
+    run, _ = _scan()
+    checkpoint = ScanCheckpoint(run.scan_id, options={"ports": "20-25,80,443"}, directory=str(tmp_path))
+    checkpoint.scan_db_id = 7
+    checkpoint.save(run)
+
+    state = load_checkpoint(run.scan_id, str(tmp_path))
+    assert state["options"] == {"ports": "20-25,80,443"} and state["scan_db_id"] == 7
+    assert state["layout"] == {"tcp": run.layout.tcp, "udp": []}
+
+    by_ip = {t["ip"]: t for t in state["targets"]}
+    assert by_ip["bad host"]["error"] == "invalid_ip" and "states" not in by_ip["bad host"]
+    for entry in run.targets:
+        if "error" not in entry:
+            assert by_ip[entry["ip"]]["states"] == bytes(entry["results"].states)
+    assert sorted(r["port"] for r in by_ip["10.0.0.2"]["records"]) == [22, 80]
+
+    checkpoint.remove()
+    assert not (tmp_path / f"{run.scan_id}.json").exists()
+
+
+# ---------------------------------------------------------------------
+# 재개
+# ---------------------------------------------------------------------
+
+def test_resume_skips_recorded_ports_and_matches_full_scan():
+    _, full_results = _scan()
+    full = {(h, r.port): r.state for h, r in full_results}
+
+    with use_transport(_network()):
+        run = iter_scan(TargetSpace(TARGETS), "20-25,80,443", timeout=0.1, engine="sequential")
+        it = iter(run)
+        first = [next(it) for _ in range(13)]
+        state = decode_scan_data(dump_run(run))
+
+    run, rest = _scan(resume=state)
+
+    assert run.scan_id == state["scan_id"]
+    assert len(first) + len(rest) == len(full)
+    assert not {(h, r.port) for h, r in first} & {(h, r.port) for h, r in rest}
+    merged = {
+        (t["ip"], r["port"]): r["state"]
+        for t in run.to_dict()["targets"] if "error" not in t for r in t["results"]
+    }
+    assert merged == full
+    assert [t["ip"] for t in run.targets if "error" in t] == ["bad host"]
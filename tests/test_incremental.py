@@ -0,0 +1,101 @@
+# tests/test_incremental.py
+"""
+증분 스캔 계획(plan_incremental) / 변경 비교(diff_results) 검증 (simnet 가상 네트워크 사용).
+    python -m pytest tests/test_incremental.py
+"""
+from scanner.incremental import diff_results, plan_incremental
+from scanner.scan_runner import iter_scan
+from scanner.service_fingerprints import top_ports
+from scanner.simnet import SimHost, SimNetwork, SimService
+from scanner.targets import TargetSpace
+from scanner.transport import use_transport
+
+WEB = "10.0.0.1"
+DNS = "10.0.0.2"
+
+KNOWN = {
+    WEB: {("tcp", 5555): {"service": "app", "version": "1.0", "last_scan_id": "S1"}},
+    DNS: {
+        ("tcp", 6666): {"service": "app", "version": None, "last_scan_id": "S1"},
+        ("udp", 7777): {"service": "app", "version": None, "last_scan_id": "S1"},
+    },
+}
+
+
+def _network() -> SimNetwork:
+    return SimNetwork({
+        WEB: SimHost(tcp={5555: SimService()}),
+        DNS: SimHost(udp={7777: "filtered"}),   # 응답 없음 → open|filtered
+    })
+
+
+def _scan(plan, **options):
+    with use_transport(_network()):
+        run = iter_scan(
+            TargetSpace([WEB, DNS]), plan.ports, timeout=0.1, engine="sequential",
+            task_filter=plan.wants, flush_hosts=True, **options,
+        )
+        run.retain = KNOWN.__contains__
+        results = list(run)
+    return run, results
+
+
+# ---------------------------------------------------------------------
+# plan_incremental: 호스트별 포트
+# ---------------------------------------------------------------------
+
+def test_plan_scans_known_ports_only_on_their_own_host():
+    plan = plan_incremental(KNOWN, range(1, 1025), top_n=5)
+    _, results = _scan(plan)
+
+    scanned = {(h, r.port) for h, r in results}
+    common = set(top_ports(5, "tcp"))
+    assert scanned == {(ip, p) for ip in (WEB, DNS) for p in common} | {(WEB, 5555), (DNS, 6666)}
+    assert plan.known_ports == 2   # UDP를 스캔하지 않으므로 udp/7777은 재확인 대상 아님
+
+
+def test_plan_uses_top_ports_of_the_scanned_protocol():
+    plan = plan_incremental(KNOWN, range(1, 1025), top_n=5, protocols=["udp"])
+
+    assert plan.common == {"udp": sorted(top_ports(5, "udp"))}
+    assert plan.wants((DNS, 7777, "udp")) and not plan.wants((WEB, 7777, "udp"))
+    assert not plan.wants((DNS, 6666, "tcp"))
+    assert "known" not in plan.to_dict()
+
+
+def test_full_sweep_adds_range_to_every_host():
+    plan = plan_incremental(KNOWN, range(1, 11), top_n=5, full_sweep=True)
+
+    assert plan.mode == "full"
+    assert all(plan.wants((DNS, p, "tcp")) for p in range(1, 11))
+    assert not plan.wants((DNS, 5555, "tcp"))
+
+
+# ---------------------------------------------------------------------
+# diff_results
+# ---------------------------------------------------------------------
+
+def test_diff_reports_closed_but_not_open_filtered():
+    plan = plan_incremental(KNOWN, range(1, 1025), top_n=5, protocols=["tcp", "udp"])
+    run, _ = _scan(plan, enable_udp=True, scan_type="tcp+udp")
+
+    changes = {(c.ip, c.protocol, c.port): c for c in diff_results(run.result(), plan.known)}
+    # UDP open → open|filtered: 응답이 없었을 뿐이므로 변경 없음
+    assert list(changes) == [(DNS, "tcp", 6666)]
+    assert changes[(DNS, "tcp", 6666)].change == "closed"
+    assert changes[(DNS, "tcp", 6666)].previous_scan_id == "S1"
+
+
+def test_diff_reports_new_open_and_version_changes():
+    known = {WEB: {("tcp", 5555): {"service": "app", "version": "1.0", "last_scan_id": "S1"}}}
+    network = SimNetwork({WEB: SimHost(tcp={
+        5555: SimService(banner=b"SSH-2.0-OpenSSH_9.6\r\n"),
+        22: SimService(banner=b"SSH-2.0-OpenSSH_8.9\r\n"),
+    })})
+    plan = plan_incremental(known, range(1, 1025), top_n=5)
+    with use_transport(network):
+        run = iter_scan(TargetSpace([WEB]), plan.ports, timeout=0.1, engine="sequential", task_filter=plan.wants)
+        list(run)
+
+    changes = [(c.port, c.change, c.previous_version, c.version) for c in diff_results(run.result(), known)]
+    assert changes == [(22, "new_open", None, "8.9"), (5555, "version_changed", "1.0", "9.6")]
@@ -0,0 +1,57 @@
+# tests/test_multiproc.py
+"""
+run_scan_multiprocess 검증 (processes=1이면 워커를 부모 프로세스에서 실행 → simnet 사용 가능).
+    python -m pytest tests/test_multiproc.py
+"""
+import scanner.multiproc as multiproc
+from scanner.multiproc import run_scan_multiprocess, worker_shards
+from scanner.rate_limit import RateLimiter
+from scanner.simnet import SimHost, SimNetwork, SimService
+from scanner.targets import TargetSpace
+from scanner.timing import TimingTable
+from scanner.transport import use_transport
+
+LIVE = ["10.0.0.2", "10.0.0.5"]
+
+
+def _network() -> SimNetwork:
+    hosts = {ip: SimHost(tcp={80: SimService()}, default_tcp="filtered") for ip in LIVE}
+    return SimNetwork(hosts)
+
+
+def test_discovery_uses_rate_limit_and_timing(monkeypatch):
+    seen = {}
+    real = multiproc.discover_hosts
+
+    def spy(hosts, ports, **kwargs):
+        seen.update(kwargs)
+        return real(hosts, ports, **kwargs)
+
+    monkeypatch.setattr(multiproc, "discover_hosts", spy)
+    with use_transport(_network()):
+        result = run_scan_multiprocess(
+            TargetSpace(["10.0.0.1-8", "10.0.0.4-6", "bad host"]),
+            "80",
+            processes=1,
+            timeout=0.5,
+            discovery=True,
+            discovery_ports="80",
+            rate_limit=1000,
+            adaptive_timeout=True,
+        )
+
+    assert isinstance(seen["limiter"], RateLimiter)
+    assert seen["limiter"]._global.rate == 1000   # 부모 단독 실행 → 워커 수로 나누지 않음
+    assert isinstance(seen["timing"], TimingTable)
+
+    assert [t["ip"] for t in result["targets"] if "error" not in t] == LIVE
+    assert all(t["status"] == "up" for t in result["targets"] if "error" not in t)
+    assert [t["ip"] for t in result["targets"] if "error" in t] == ["bad host"]
+    assert result["discovery"]["hosts_up"] == 2 and result["discovery"]["hosts_down"] == 6
+    assert result["flushed"] == {"up": 0, "down": 6}
+
+
+def test_worker_shards_refine_node_shard():
+    assert worker_shards(3) == [(1, 3), (2, 3), (3, 3)]
+    # 노드 shard 2/4를 워커 2개로: key mod 8 ∈ {1, 5} → key mod 4 == 1
+    assert worker_shards(2, (2, 4)) == [(2, 8), (6, 8)]
@@ -0,0 +1,99 @@
+# tests/test_result_store.py
+"""
+PortLayout / HostResults(포트 상태 배열) / SeenHosts 검증.
+    python -m pytest tests/test_result_store.py
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from scanner.result_store import STATE_CODES, HostResults, PortLayout, SeenHosts
+from scanner.targets import TargetSpace
+
+
+def _res(port, state, protocol="tcp", banner=None, service=None, version=None):
+    return SimpleNamespace(
+        port=port, protocol=protocol, state=state, banner=banner, service=service, version=version,
+    )
+
+
+# ---------------------------------------------------------------------
+# PortLayout
+# ---------------------------------------------------------------------
+
+def test_layout_slots_are_tcp_then_udp_sorted():
+    layout = PortLayout([443, 22, 80, 22], [161, 53])
+
+    assert len(layout) == 5
+    assert [layout.port(s) for s in range(5)] == [
+        ("tcp", 22), ("tcp", 80), ("tcp", 443), ("udp", 53), ("udp", 161),
+    ]
+    assert all(layout.slot(*layout.port(s)) == s for s in range(5))
+    with pytest.raises(KeyError):
+        layout.slot("tcp", 53)
+
+
+# ---------------------------------------------------------------------
+# HostResults
+# ---------------------------------------------------------------------
+
+def test_host_results_stores_one_byte_per_port_and_records_only_details():
+    hr = HostResults(PortLayout([22, 80, 443], [53]))
+    hr.add(_res(22, "open", banner="SSH-2.0-x", service="ssh", version="8.9"))
+    hr.add(_res(80, "closed"))
+    hr.add(_res(443, "filtered", banner="\x15\x03"))
+    hr.add(_res(53, "open|filtered", protocol="udp"))
+
+    assert bytes(hr.states) == bytes([
+        STATE_CODES["open"], STATE_CODES["closed"], STATE_CODES["filtered"], STATE_CODES["open|filtered"],
+    ])
+    # open이거나 banner가 있는 포트만 레코드
+    assert sorted(hr.records) == [0, 2]
+    assert hr.complete() and len(hr) == 4 and hr.count("closed") == 1
+
+
+def test_host_results_dicts_keep_port_order_and_filter_by_state():
+    hr = HostResults(PortLayout([22, 80, 443]))
+    hr.add(_res(443, "closed"))
+    hr.add(_res(22, "open", banner="SSH-2.0-x", service="ssh", version="8.9"))
+
+    assert [d["port"] for d in hr] == [22, 443]   # 80은 아직 스캔 안 됨
+    assert hr.pending("tcp", 80) and not hr.pending("tcp", 22) and not hr.complete()
+    assert [d["version"] for d in hr.dicts(("open",))] == ["8.9"]
+    assert [d["state"] for d in hr.dicts(("closed",))] == ["closed"]
+
+
+def test_host_results_restore_round_trip():
+    layout = PortLayout([22, 80], [53])
+    hr = HostResults(layout)
+    hr.add(_res(22, "open", banner="SSH-2.0-x"))
+    hr.add(_res(53, "closed", protocol="udp"))
+
+    restored = HostResults.restore(layout, bytes(hr.states), [r.to_dict() for r in hr.records.values()])
+    assert restored.to_list() == hr.to_list()
+
+
+def test_reopened_port_drops_stale_record():
+    hr = HostResults(PortLayout([22]))
+    hr.add(_res(22, "open", banner="x"))
+    hr.add(_res(22, "closed"))
+
+    assert hr.records == {} and hr.count("closed") == 1
+
+
+# ---------------------------------------------------------------------
+# SeenHosts
+# ---------------------------------------------------------------------
+
+def test_seen_hosts_uses_bits_inside_space_and_set_outside():
+    seen = SeenHosts(TargetSpace(["10.0.0.0/24"]))
+    seen.add("10.0.0.7")
+    seen.add("192.168.1.1")
+
+    assert len(seen.bits) == 32
+    assert "10.0.0.7" in seen and "10.0.0.8" not in seen
+    assert seen.addrs == {"192.168.1.1"} and "192.168.1.1" in seen
+
+    other = SeenHosts(TargetSpace(["10.0.0.0/24"]))
+    other.load(bytes(seen.bits), seen.addrs)
+    assert "10.0.0.7" in other and "192.168.1.1" in other and "10.0.0.8" not in other
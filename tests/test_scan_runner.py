@@ -0,0 +1,125 @@
+# tests/test_scan_runner.py
+"""
+iter_scan / ScanRun 검증 (simnet 가상 네트워크 사용).
+    python -m pytest tests/test_scan_runner.py
+"""
+import random
+import tracemalloc
+
+import pytest
+
+import scanner.scan_runner as scan_runner
+from scanner.checkpoint import decode_scan_data, dump_run
+from scanner.scan_runner import iter_scan
+from scanner.service_fingerprints import load_services_db
+from scanner.simnet import SimHost, SimNetwork, SimService
+from scanner.targets import TargetSpace
+from scanner.transport import use_transport
+
+OPEN_HOST = "10.0.1.5"
+SSH_BANNER = b"SSH-2.0-OpenSSH_8.9p1\r\n"
+
+
+class _StatelessNetwork(SimNetwork):
+    """시도 횟수를 기록하지 않는 SimNetwork (메모리 측정에 simnet 자체 상태가 섞이지 않게)."""
+
+    def rng(self, kind, ip, port):
+        return random.Random(0)
+
+
+def _network(cls=SimNetwork) -> SimNetwork:
+    return cls({OPEN_HOST: SimHost(tcp={22: SimService(banner=SSH_BANNER)})})
+
+
+def _scan(net, targets, **options):
+    with use_transport(net):
+        run = iter_scan(TargetSpace(targets), "20-27", timeout=0.1, engine="sequential", **options)
+        results = list(run)
+    return run, results
+
+
+# ---------------------------------------------------------------------
+# flush_hosts
+# ---------------------------------------------------------------------
+
+@pytest.mark.parametrize("randomize", [False, True])
+def test_flush_hosts_keeps_only_hosts_with_open_ports(randomize):
+    run, results = _scan(_network(), ["10.0.1.0/24"], flush_hosts=True, randomize=randomize, seed=1)
+
+    assert len(results) == 254 * 8
+    assert [t["ip"] for t in run.result()["targets"]] == [OPEN_HOST]
+    assert run.flushed == {"up": 253, "down": 0}
+    assert "10.0.1.1" in run.seen and OPEN_HOST not in run.seen
+    assert [r["port"] for r in run.to_dict()["targets"][0]["results"] if r["state"] == "open"] == [22]
+
+
+def test_flush_hosts_retain_keeps_entries():
+    net = _network()
+    with use_transport(net):
+        run = iter_scan(TargetSpace(["10.0.1.1-10"]), "20-27", timeout=0.1, engine="sequential", flush_hosts=True)
+        run.retain = {"10.0.1.2"}.__contains__
+        list(run)
+
+    assert [t["ip"] for t in run.result()["targets"]] == ["10.0.1.2", OPEN_HOST]
+    assert run.flushed["up"] == 8
+
+
+def test_flushed_hosts_are_skipped_on_resume():
+    targets = ["10.0.1.1-10.0.2.88"]   # 344개 = 호스트 블록(256개) 1개 + 나머지
+    net = _network()
+    with use_transport(net):
+        run = iter_scan(TargetSpace(targets), "20-27", timeout=0.1, engine="sequential", flush_hosts=True)
+        it = iter(run)
+        for _ in range(256 * 8):   # 첫 블록의 모든 작업 완료
+            next(it)
+        state = decode_scan_data(dump_run(run))
+
+    assert run.flushed["up"] == 255   # OPEN_HOST만 entry 유지
+    run, results = _scan(_network(), targets, flush_hosts=True, resume=state)
+
+    assert len(results) == (344 - 256) * 8
+    assert all(h >= "10.0.2.1" for h, _ in results)
+    assert run.flushed["up"] == 343
+    assert [t["ip"] for t in run.result()["targets"]] == [OPEN_HOST]
+
+
+def test_scan_memory_stays_bounded_as_target_range_grows(monkeypatch):
+    # randomize도 블록 단위 순열이면 동시에 entry를 가진 호스트 수가 블록 크기로 제한됨
+    monkeypatch.setattr(scan_runner, "FLUSH_BLOCK_HOSTS", 256)
+    load_services_db()
+
+    def peak(spec, randomize):
+        net = _network(_StatelessNetwork)
+        highest = 0
+        with use_transport(net):
+            tracemalloc.start()
+            try:
+                run = iter_scan(
+                    TargetSpace([spec]), "20-27", timeout=0.1, engine="sequential",
+                    flush_hosts=True, randomize=randomize, seed=3,
+                )
+                for i, _ in enumerate(run):
+                    if i % 1000 == 0:
+                        highest = max(highest, tracemalloc.get_traced_memory()[0])
+            finally:
+                tracemalloc.stop()
+        return highest
+
+    for randomize in (False, True):
+        small = peak("10.0.0.0/22", randomize)
+        large = peak("10.0.0.0/20", randomize)   # 호스트 4배
+        assert large < small * 1.25
+
+
+# ---------------------------------------------------------------------
+# TargetSpace: 겹치는 스펙
+# ---------------------------------------------------------------------
+
+def test_overlapping_target_specs_are_scanned_once():
+    run, results = _scan(
+        _network(), ["10.0.1.0/29", "10.0.1.4-10.0.1.9", OPEN_HOST], randomize=True, seed=2,
+    )
+
+    hosts = [t["ip"] for t in run.result()["targets"]]
+    assert sorted(hosts) == [f"10.0.1.{i}" for i in range(1, 10)]
+    assert len(results) == 9 * 8
@@ -0,0 +1,88 @@
+# tests/test_scheduler.py
+"""
+_TaskSource(호스트별 in-flight 상한) / ScanScheduler 검증.
+    python -m pytest tests/test_scheduler.py
+"""
+import threading
+
+from scanner.scheduler import ScanScheduler, _TaskSource
+
+
+def _tasks(hosts, ports):
+    return [(h, p, "tcp") for h in hosts for p in ports]
+
+
+def _drain(source):
+    out = []
+    while True:
+        task = source.next()
+        if task is None:
+            return out
+        out.append(task)
+
+
+# ---------------------------------------------------------------------
+# _TaskSource
+# ---------------------------------------------------------------------
+
+def test_task_source_caps_inflight_per_host():
+    source = _TaskSource(_tasks(["a", "b"], range(5)), per_host_limit=2, max_deferred=100)
+
+    # 호스트별 2개까지만 꺼내고, 상한에 걸린 a의 작업은 미뤄둔 채 b로 넘어감
+    assert _drain(source) == [("a", 0, "tcp"), ("a", 1, "tcp"), ("b", 0, "tcp"), ("b", 1, "tcp")]
+    assert not source.empty()
+
+    source.done("a")
+    assert _drain(source) == [("a", 2, "tcp")]
+    source.done("b")
+    source.done("b")
+    assert _drain(source) == [("b", 2, "tcp"), ("b", 3, "tcp")]
+
+
+def test_task_source_bounds_deferred_queue():
+    tasks = iter(_tasks(["a"], range(100)))
+    source = _TaskSource(tasks, per_host_limit=1, max_deferred=3)
+
+    assert _drain(source) == [("a", 0, "tcp")]
+    # 미뤄둔 작업이 3개에 닿으면 iterator를 더 당기지 않음
+    assert next(tasks) == ("a", 4, "tcp")
+
+
+def test_task_source_drains_every_task():
+    tasks = _tasks(["a", "b", "c"], range(4))
+    source = _TaskSource(tasks, per_host_limit=1, max_deferred=2)
+
+    seen = []
+    while not source.empty():
+        batch = _drain(source)
+        seen.extend(batch)
+        for host, _, _ in batch:
+            source.done(host)
+    assert sorted(seen) == sorted(tasks)
+
+
+# ---------------------------------------------------------------------
+# ScanScheduler: thread backend에서도 호스트별 상한 유지
+# ---------------------------------------------------------------------
+
+def test_scheduler_respects_per_host_limit():
+    lock = threading.Lock()
+    inflight = {}
+    peak = {}
+    release = threading.Barrier(2, timeout=5)
+
+    def probe(host, port):
+        with lock:
+            inflight[host] = inflight.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), inflight[host])
+        if port < 2:
+            release.wait()   # 같은 시간에 두 작업이 겹치도록
+        with lock:
+            inflight[host] -= 1
+        return port
+
+    scheduler = ScanScheduler({"tcp": probe}, max_workers=8, per_host_limit=2)
+    results = list(scheduler.run(_tasks(["a", "b", "c"], range(6))))
+
+    assert len(results) == 18
+    assert max(peak.values()) <= 2
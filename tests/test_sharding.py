@@ -0,0 +1,90 @@
+# tests/test_sharding.py
+"""
+shard_filter / merge_shard_results 검증 (simnet 가상 네트워크 사용).
+    python -m pytest tests/test_sharding.py
+"""
+import pytest
+
+from scanner.checkpoint import decode_scan_data, dump_run
+from scanner.result_store import PortLayout
+from scanner.scan_runner import iter_scan
+from scanner.sharding import merge_shard_results, parse_shard, shard_filter
+from scanner.simnet import SimHost, SimNetwork, SimService
+from scanner.targets import TargetSpace
+from scanner.transport import use_transport
+
+TARGETS = ["10.0.0.1-6", "bad host"]
+PORTS = "20-25,80,443"
+
+
+def _network() -> SimNetwork:
+    return SimNetwork({
+        "10.0.0.2": SimHost(tcp={22: SimService(), 80: SimService()}),
+        "10.0.0.5": SimHost(tcp={443: SimService()}),
+    })
+
+
+def _scan(**options):
+    with use_transport(_network()):
+        run = iter_scan(TargetSpace(TARGETS), PORTS, timeout=0.1, engine="sequential", **options)
+        results = list(run)
+    return run, results
+
+
+# ---------------------------------------------------------------------
+# shard_filter
+# ---------------------------------------------------------------------
+
+def test_parse_shard():
+    assert parse_shard("2/4") == (2, 4)
+    for bad in ("0/4", "5/4", "x", "1/0"):
+        with pytest.raises(ValueError):
+            parse_shard(bad)
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 7])
+def test_shard_filters_partition_the_task_space(count):
+    layout = PortLayout([22, 80, 443], [53, 161])
+    tasks = [
+        (f"10.0.0.{h}", port, proto)
+        for h in range(1, 20) for proto, port in (layout.port(s) for s in range(len(layout)))
+    ]
+    filters = [shard_filter(layout, (i, count)) for i in range(1, count + 1)]
+
+    owners = [sum(f(t) for f in filters) for t in tasks]
+    assert owners == [1] * len(tasks)
+    # 연속된 주소 × 포트 공간이라 shard 크기 차이는 1 이하
+    sizes = [sum(f(t) for t in tasks) for f in filters]
+    assert max(sizes) - min(sizes) <= 1
+
+
+# ---------------------------------------------------------------------
+# merge_shard_results
+# ---------------------------------------------------------------------
+
+def test_merged_shards_equal_unsharded_scan():
+    full_run, full_results = _scan()
+    shard_runs = [_scan(shard=(i, 3)) for i in (1, 2, 3)]
+
+    assert sum(len(results) for _, results in shard_runs) == len(full_results)
+    merged = merge_shard_results(
+        (decode_scan_data(dump_run(run)) for run, _ in shard_runs), scan_id="MERGED",
+    )
+
+    assert merged["scan_id"] == "MERGED" and merged["shards"] == 3
+    assert [t["ip"] for t in merged["targets"]] == [t["ip"] for t in full_run.targets]
+    for got, want in zip(merged["targets"], full_run.targets):
+        if "error" in want:
+            assert got["error"] == want["error"] and got["results"] == []
+        else:
+            assert got["results"].to_list() == want["results"].to_list()
+
+
+def test_merge_rejects_shards_with_different_ports():
+    a, _ = _scan(shard=(1, 2))
+    with use_transport(_network()):
+        b = iter_scan(TargetSpace(TARGETS), "20-30", timeout=0.1, engine="sequential", shard=(2, 2))
+        list(b)
+
+    with pytest.raises(ValueError, match="different ports"):
+        merge_shard_results([decode_scan_data(dump_run(a)), decode_scan_data(dump_run(b))])
@@ -0,0 +1,63 @@
+# tests/test_signatures.py
+"""
+시그니처 DB(scanner/signatures.json) 검증.
+    python -m pytest tests/test_signatures.py
+"""
+import pytest
+
+from analysis.fingerprint_parser import parse_banner
+from scanner.signatures import SignatureDB, _TOKEN_SPLIT, load_signature_db, match_banner
+
+
+def test_every_keyword_survives_tokenization():
+    # 배너는 [^a-z0-9] 기준으로 토큰화해 색인 → keyword가 토큰 하나가 아니면 시그니처가 죽음
+    for sig in load_signature_db().signatures:
+        if sig.keyword:
+            assert _TOKEN_SPLIT.split(sig.keyword) == [sig.keyword], sig.id
+
+
+def test_every_signature_is_reachable_through_its_keyword():
+    db = load_signature_db()
+    for sig in db.signatures:
+        if sig.keyword:
+            assert sig in db.candidates(f"x {sig.keyword} y", sig.service), sig.id
+
+
+def test_multi_token_keyword_is_rejected():
+    with pytest.raises(ValueError, match="mini_httpd"):
+        SignatureDB([{"id": "bad", "product": "x", "keyword": "mini_httpd", "pattern": "x"}])
+
+
+def test_keyword_index_limits_candidates():
+    db = SignatureDB([
+        {"id": "a", "product": "Alpha", "keyword": "alpha", "service": "http", "pattern": r"alpha/(?P<version>\S+)"},
+        {"id": "b", "product": "Beta", "keyword": "beta", "service": "http", "pattern": r"beta/(?P<version>\S+)"},
+        {"id": "c", "product": "Any", "service": "ftp", "pattern": r"^220 "},
+    ])
+
+    # keyword 없는 시그니처는 서비스가 같을 때만 후보
+    assert [s.id for s in db.candidates("Server: Alpha/1.2", "http")] == ["a"]
+    assert [s.id for s in db.candidates("220 Alpha/1.2", "ftp")] == ["c", "a"]
+    assert db.match("Server: Beta/2.0", "http").version == "2.0"
+    assert db.match("Server: Gamma/2.0", "http") is None
+
+
+def test_mini_httpd_banner_matches():
+    m = match_banner("HTTP/1.0 200 OK\r\nServer: mini_httpd/1.30 26Oct2018\r\n\r\n", "http")
+    assert (m.product, m.version, m.signature_id) == ("mini_httpd", "1.30", "http-minihttpd")
+
+
+@pytest.mark.parametrize("banner, service, product, version", [
+    ("SSH-2.0-OpenSSH_8.9p1 Ubuntu-3ubuntu0.1", "ssh", "OpenSSH", "8.9p1"),
+    ("220 (vsFTPd 3.0.5)", "ftp", "vsftpd", "3.0.5"),
+    ("HTTP/1.1 200 OK\r\nServer: nginx/1.18.0 (Ubuntu)\r\n", "http", "nginx", "1.18.0"),
+])
+def test_common_banners(banner, service, product, version):
+    m = match_banner(banner, service)
+    assert m is not None and m.product.lower() == product.lower() and m.version == version
+
+
+def test_fingerprint_parser_returns_version_only():
+    assert parse_banner("SSH-2.0-OpenSSH_8.9p1", "ssh") == (None, "8.9p1")
+    assert parse_banner("", "ssh") == (None, None)
+    assert parse_banner("hello", "ssh") == (None, None)
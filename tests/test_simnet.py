@@ -0,0 +1,265 @@
+# tests/test_simnet.py
+"""
+simnet.SimNetwork로 실제 네트워크 없이 스캐너 동작 검증.
+    python -m pytest tests/test_simnet.py
+(배치 UDP 엔진은 커널 소켓 / MSG_ERRQUEUE를 직접 쓰므로 공유 소켓 / 시계 / poll만 바꿔서 검증)
+"""
+import heapq
+
+import pytest
+
+import scanner.banner_grabber as banner_grabber
+from scanner.discovery import discover_hosts
+from scanner.rate_limit import RateLimiter
+from scanner.simnet import SimHost, SimNetwork, SimService
+from scanner.tcp_scanner import scan_single_port, sequential_scan, threaded_scan
+from scanner.transport import use_transport
+from scanner.udp_scanner import UDPBatchScanner, _BatchRun
+from scanner.utils import udp_probe
+
+HOST = "10.0.0.1"
+SSH_BANNER = b"SSH-2.0-OpenSSH_8.9p1 Ubuntu-3\r\n"
+HTTP_RESPONSE = b"HTTP/1.1 200 OK\r\nServer: nginx/1.18.0\r\nContent-Length: 0\r\n\r\n"
+
+
+def _network(seed: int = 0, **host_options) -> SimNetwork:
+    return SimNetwork({
+        HOST: SimHost(
+            tcp={
+                22: SimService(banner=SSH_BANNER),
+                80: SimService(responses={b"GET ": HTTP_RESPONSE}),
+                25: "filtered",
+            },
+            udp={53: "echo", 161: "filtered"},
+            **host_options,
+        ),
+    }, seed=seed)
+
+
+# ---------------------------------------------------------------------
+# TCP: threaded_scan
+# ---------------------------------------------------------------------
+
+def test_threaded_scan_states_and_banners():
+    net = _network(latency=0.01)
+    with use_transport(net):
+        results = {r["port"]: r for r in threaded_scan(HOST, "20-30,80", timeout=1.0, max_workers=20)}
+
+    assert results[22]["state"] == "open"
+    assert results[22]["banner"].startswith("SSH-2.0-OpenSSH_8.9p1")
+    assert results[80]["state"] == "open"
+    assert "nginx" in results[80]["banner"]
+    # filtered(drop) / closed(RST)는 connect 실패로 둘 다 closed
+    assert results[25]["state"] == "closed"
+    assert results[23]["state"] == "closed"
+    assert net.stats["tcp_connects"] == len(results)
+
+
+def test_filtered_ports_cost_a_full_timeout():
+    net = SimNetwork({HOST: SimHost(default_tcp="filtered", latency=0.01)})
+    with use_transport(net):
+        results = sequential_scan(HOST, "1-5", timeout=1.0)
+
+    assert all(r["state"] == "closed" for r in results)
+    # drop 포트는 RST가 없으므로 포트마다 timeout만큼 대기 (가상 시간)
+    assert net.clock.elapsed() == pytest.approx(5.0)
+
+
+def test_threaded_scan_is_reproducible_with_loss():
+    def scan(seed):
+        net = _network(seed=seed, latency=0.02, jitter=0.01, loss=0.3)
+        with use_transport(net):
+            return [(r["port"], r["state"]) for r in threaded_scan(HOST, "20-30,80", timeout=0.5, max_workers=8)]
+
+    assert scan(7) == scan(7)
+
+
+# ---------------------------------------------------------------------
+# Host discovery
+# ---------------------------------------------------------------------
+
+def test_discovery_stops_probing_a_host_once_alive():
+    # 첫 probe 포트(80)만 열려 있고 나머지는 drop → alive 판정 뒤 남은 포트는 보내지 않음
+    net = SimNetwork({
+        HOST: SimHost(tcp={80: SimService()}, default_tcp="filtered"),
+        "10.0.0.9": SimHost(default_tcp="filtered"),
+    })
+    with use_transport(net):
+        results = {d.ip: d for d in discover_hosts([HOST, "10.0.0.9"], [80, 443, 22], timeout=1.0, max_workers=1)}
+
+    assert results[HOST].alive and results[HOST].method == "tcp/80 open"
+    assert not results["10.0.0.9"].alive
+    assert net.stats["tcp_connects"] == 1 + 3
+    assert net.clock.elapsed() == pytest.approx(3.0, abs=0.1)
+
+
+# ---------------------------------------------------------------------
+# 배너: 기본 probe가 없는 포트의 probe escalation
+# ---------------------------------------------------------------------
+
+@pytest.mark.parametrize("escalation, identified", [(True, True), (False, False)])
+def test_unknown_port_gets_escalation_probes_by_default(monkeypatch, escalation, identified):
+    settings = {**banner_grabber.banner_settings(), "probe_escalation": escalation, "send_payload": False}
+    monkeypatch.setattr(banner_grabber, "banner_settings", lambda: settings)
+    net = SimNetwork({HOST: SimHost(tcp={40080: SimService(responses={b"GET ": HTTP_RESPONSE})})})
+    with use_transport(net):
+        res = scan_single_port(HOST, 40080, timeout=1.0)
+
+    assert res.state == "open"
+    assert (res.banner is not None and "nginx" in res.banner) is identified
+
+
+# ---------------------------------------------------------------------
+# UDP: udp_probe 재전송
+# ---------------------------------------------------------------------
+
+@pytest.mark.parametrize("retries", [0, 1, 3])
+def test_udp_probe_retransmits_unanswered_probes(retries):
+    net = _network()
+    with use_transport(net):
+        state, data = udp_probe(HOST, 161, b"probe", timeout=1.0, retries=retries)
+
+    assert (state, data) == ("open|filtered", None)
+    assert net.stats["udp_sent"] == retries + 1
+    assert net.clock.elapsed() == pytest.approx((retries + 1) * 1.0)
+
+
+def test_udp_probe_answered_and_closed_ports_stop_retrying():
+    net = _network()
+    with use_transport(net):
+        assert udp_probe(HOST, 53, b"hello", timeout=1.0, retries=3) == ("open", b"hello")
+        assert udp_probe(HOST, 9999, b"x", timeout=1.0, retries=3) == ("closed", None)
+
+    assert net.stats["udp_sent"] == 2
+    assert net.stats["icmp_sent"] == 1
+
+
+def test_udp_probe_retry_recovers_from_icmp_rate_limit():
+    # ICMP unreachable 초당 1개: 두 번째 closed 포트의 첫 응답은 버려지고 재전송에서 closed 확인
+    net = _network(icmp_rate=1, icmp_burst=1)
+    with use_transport(net):
+        assert udp_probe(HOST, 9001, b"x", timeout=1.0) == ("closed", None)
+        assert udp_probe(HOST, 9002, b"x", timeout=1.0, retries=0) == ("open|filtered", None)
+        assert udp_probe(HOST, 9003, b"x", timeout=1.0, retries=1) == ("closed", None)
+
+
+# ---------------------------------------------------------------------
+# RateLimiter (가상 시간으로 전송 간격 확인)
+# ---------------------------------------------------------------------
+
+def test_rate_limiter_spaces_tcp_connects():
+    net = SimNetwork({HOST: SimHost(latency=0.0)})
+    with use_transport(net):
+        limiter = RateLimiter(rate=10, burst=1)
+        for port in range(1000, 1020):
+            assert scan_single_port(HOST, port, timeout=1.0, limiter=limiter).state == "closed"
+
+    # 20번 connect, 초당 10개 → 첫 번째 이후 19 x 0.1초
+    assert net.stats["tcp_connects"] == 20
+    assert net.clock.elapsed() == pytest.approx(1.9)
+
+
+def test_rate_limiter_per_host_limit_covers_udp_retransmits():
+    net = _network()
+    with use_transport(net):
+        limiter = RateLimiter(per_host_rate=2, per_host_burst=1)
+        udp_probe(HOST, 161, b"probe", timeout=0.1, limiter=limiter, retries=3)
+
+    # 재전송도 토큰을 씀: 전송 4번 → 0.5초 간격 3번 (timeout 0.1초보다 간격이 김)
+    assert net.stats["udp_sent"] == 4
+    assert net.clock.elapsed() == pytest.approx(1.5 + 0.1)
+
+
+# ---------------------------------------------------------------------
+# UDP: 배치 엔진 + ICMP rate limit
+# ---------------------------------------------------------------------
+
+class _SimSharedSocket:
+    """배치 엔진 공유 소켓 대신: 전송하면 SimHost 규칙대로 응답 / ICMP 에러 도착을 예약."""
+
+    def __init__(self, run: "_SimBatchRun"):
+        self.run = run
+
+    def sendto(self, data: bytes, address) -> int:
+        net = self.run.net
+        ip, port = address
+        host = net.hosts.get(ip)
+        net.count("udp_sent")
+        if host is None or not host.up:
+            return len(data)
+        spec = host.udp.get(port, host.default_udp)
+        at = net.clock.now() + host.rtt(None)
+        if spec == "closed":
+            if net.icmp_allowed(host):
+                net.count("icmp_sent")
+                self.run.arrive(at, (ip, port), "closed")
+        elif spec != "filtered":
+            self.run.arrive(at, (ip, port), "open", bytes(data) if spec == "echo" else spec)
+        return len(data)
+
+
+class _SimBatchRun(_BatchRun):
+    """_BatchRun을 SimNetwork 가상 시간으로 실행 (I/O 지점만 교체, 재전송 / 간격 조절 로직은 그대로)."""
+
+    def __init__(self, scanner: UDPBatchScanner, tasks, net: SimNetwork):
+        super().__init__(scanner, tasks)
+        self.net = net
+        self.arrivals: list = []   # (도착 시각, seq, key, state, data) heap
+        self.sock = _SimSharedSocket(self)
+
+    def arrive(self, at, key, state, data=None) -> None:
+        self.seq += 1
+        heapq.heappush(self.arrivals, (at, self.seq, key, state, data))
+
+    def _now(self) -> float:
+        return self.net.clock.now()
+
+    def _shared_socket(self, family):
+        return self.sock
+
+    def _poll(self, wait: float) -> None:
+        until = self._now() + wait
+        if self.arrivals and self.arrivals[0][0] < until:
+            until = self.arrivals[0][0]
+        self.net.clock.advance_to(until)
+        while self.arrivals and self.arrivals[0][0] <= self._now():
+            _, _, key, state, data = heapq.heappop(self.arrivals)
+            self._resolve(key, state, data)
+
+
+def _batch_scan(net: SimNetwork, ports, **options):
+    scanner = UDPBatchScanner(timeout=1.0, use_errqueue=True, **options)
+    run = _SimBatchRun(scanner, ((HOST, p) for p in ports), net)
+    return {r.port: r.state for _, r in run.run()}, scanner.stats
+
+
+def test_batch_udp_recovers_closed_ports_behind_icmp_rate_limit():
+    # 닫힌 포트 40개 + drop 포트 1개, ICMP unreachable 초당 1개
+    ports = list(range(9000, 9040)) + [161]
+    net = _network(icmp_rate=1, icmp_burst=1)
+    states, stats = _batch_scan(net, ports)
+
+    assert states[161] == "open|filtered"
+    assert [p for p in ports[:-1] if states[p] != "closed"] == []
+    assert stats["rate_limited_hosts"] == 1
+    # 간격을 늘린 뒤에는 포트당 ICMP 1개 → 닫힌 포트 수 x 1초 정도 (느린 스캔과 같은 정확도)
+    assert net.clock.elapsed() < 120
+
+
+def test_batch_udp_without_extra_retries_loses_rate_limited_ports():
+    # 비교: 추가 재전송이 없으면 대부분 open|filtered로 확정됨 (수정 전 동작)
+    ports = list(range(9000, 9040))
+    states, _ = _batch_scan(_network(icmp_rate=1, icmp_burst=1), ports, rate_limit_retries=0)
+
+    assert sum(1 for p in ports if states[p] == "open|filtered") > len(ports) // 2
+
+
+def test_batch_udp_does_not_slow_down_hosts_without_rate_limit():
+    ports = list(range(9000, 9040)) + [53]
+    net = _network()
+    states, stats = _batch_scan(net, ports)
+
+    assert states[53] == "open"
+    assert all(states[p] == "closed" for p in ports[:-1])
+    assert stats["retransmits"] == 0 and stats["rate_limited_hosts"] == 0
+    assert net.clock.elapsed() < 0.1
@@ -0,0 +1,82 @@
+# tests/test_targets.py
+"""
+TargetSpace / cyclic_permutation / 작업 순열 검증.
+    python -m pytest tests/test_targets.py
+"""
+import pytest
+
+from scanner.scan_runner import _interleave_tasks, _permuted_tasks
+from scanner.targets import TargetSpace, cyclic_permutation, parse_target_spec
+
+
+# ---------------------------------------------------------------------
+# cyclic_permutation
+# ---------------------------------------------------------------------
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3, 10, 97, 256, 1000])
+def test_cyclic_permutation_is_a_bijection(n):
+    values = list(cyclic_permutation(n, seed=5))
+    assert sorted(values) == list(range(n))
+
+
+def test_cyclic_permutation_is_reproducible_per_seed():
+    assert list(cyclic_permutation(500, seed=1)) == list(cyclic_permutation(500, seed=1))
+    assert list(cyclic_permutation(500, seed=1)) != list(cyclic_permutation(500, seed=2))
+    assert list(cyclic_permutation(500, seed=1)) != list(range(500))
+
+
+# ---------------------------------------------------------------------
+# TargetSpace
+# ---------------------------------------------------------------------
+
+def test_parse_target_spec_forms():
+    assert parse_target_spec("10.0.0.0/30") == (int(0x0A000001), 2, 4)   # network / broadcast 제외
+    assert parse_target_spec("10.0.1.5-7") == (int(0x0A000105), 3, 4)
+    assert parse_target_spec("10.0.1.7-10.0.1.5") == (int(0x0A000105), 3, 4)
+    assert parse_target_spec("example.com") is None
+
+
+def test_target_space_index_round_trip():
+    space = TargetSpace(["10.0.1.0/28", "192.168.0.10-20", "::1", "2001:db8::/126", "host.local"])
+    addrs = list(space)
+
+    assert len(space) == len(addrs) == 14 + 11 + 1 + 3
+    assert len(set(addrs)) == len(addrs)
+    assert space.invalid == ["host.local"]
+    for i, ip in enumerate(addrs):
+        assert space[i] == ip and space.index(ip) == i
+    assert space.index("10.0.1.0") is None and "10.0.2.1" not in space and "host.local" not in space
+    with pytest.raises(IndexError):
+        space[len(space)]
+
+
+def test_target_space_merges_overlapping_and_adjacent_specs():
+    space = TargetSpace(["10.0.0.5-20", "10.0.0.1-10", "10.0.0.21", "10.0.0.15", "10.0.0.30"])
+
+    assert list(space) == [f"10.0.0.{i}" for i in list(range(1, 22)) + [30]]
+    assert space.index("10.0.0.30") == 21
+
+
+# ---------------------------------------------------------------------
+# 작업 순서: 호스트 × 포트 × 프로토콜 공간을 빠짐없이 한 번씩
+# ---------------------------------------------------------------------
+
+@pytest.mark.parametrize("block", [None, 4])
+def test_permuted_tasks_cover_every_task_once(block):
+    space = TargetSpace(["10.0.0.1-10"])
+    tasks = list(_permuted_tasks(space, [22, 80, 443], [53], seed=9, block_hosts=block))
+    expected = list(_interleave_tasks(space, [22, 80, 443], [53]))
+
+    assert len(tasks) == len(expected) == 10 * 4
+    assert sorted(tasks) == sorted(expected)
+    assert tasks != expected
+
+
+def test_permuted_blocks_finish_each_host_within_its_block():
+    space = TargetSpace(["10.0.0.1-10"])
+    tasks = list(_permuted_tasks(space, [22, 80, 443], [53], seed=9, block_hosts=4))
+
+    # 블록(호스트 4개 이하 × 작업 4개) 안에서 호스트의 작업이 모두 끝남
+    for ip in space:
+        positions = [i for i, t in enumerate(tasks) if t[0] == ip]
+        assert positions[-1] - positions[0] < 4 * 4
@@ -0,0 +1,95 @@
+# tests/test_timing.py
+"""
+RttEstimator / TimingTable(동적 timeout) / TokenBucket(전송 속도 제한) 검증.
+    python -m pytest tests/test_timing.py
+(TokenBucket은 transport 시계를 쓰므로 simnet 가상 시간으로 확인)
+"""
+import pytest
+
+from scanner.rate_limit import RateLimiter, TokenBucket
+from scanner.simnet import SimNetwork
+from scanner.timing import RttEstimator, TimingTable
+from scanner.transport import use_transport
+
+
+# ---------------------------------------------------------------------
+# RttEstimator
+# ---------------------------------------------------------------------
+
+def test_rtt_estimator_follows_rfc6298():
+    est = RttEstimator()
+    assert est.timeout() is None
+
+    est.observe(0.1)
+    assert (est.srtt, est.rttvar) == pytest.approx((0.1, 0.05))
+    assert est.timeout() == pytest.approx(0.1 + 4 * 0.05)
+
+    est.observe(0.3)
+    # rttvar = 3/4·0.05 + 1/4·|0.1 - 0.3|, srtt = 7/8·0.1 + 1/8·0.3
+    assert est.rttvar == pytest.approx(0.0875)
+    assert est.srtt == pytest.approx(0.125)
+    assert est.samples == 2
+
+
+def test_rtt_estimator_converges_on_stable_rtt():
+    est = RttEstimator()
+    for _ in range(100):
+        est.observe(0.02)
+    assert est.srtt == pytest.approx(0.02)
+    assert est.timeout() == pytest.approx(0.02, abs=1e-6)
+
+
+# ---------------------------------------------------------------------
+# TimingTable
+# ---------------------------------------------------------------------
+
+def test_timing_table_clamps_and_defaults_to_max():
+    table = TimingTable(min_timeout=0.1, max_timeout=1.0)
+    assert table.timeout("10.0.0.1") == 1.0      # 샘플 없음 → 상한
+
+    table.observe("10.0.0.1", 0.001)
+    assert table.timeout("10.0.0.1") == 0.1      # 하한
+    table.observe("10.0.0.2", 2.0)
+    assert table.timeout("10.0.0.2") == 1.0      # 상한
+
+    table.forget("10.0.0.1")
+    assert "10.0.0.1" not in table.snapshot() and table.timeout("10.0.0.1") == 1.0
+
+
+# ---------------------------------------------------------------------
+# TokenBucket / RateLimiter
+# ---------------------------------------------------------------------
+
+def test_token_bucket_allows_burst_then_spaces_reservations():
+    net = SimNetwork()
+    with use_transport(net):
+        bucket = TokenBucket(rate=10, burst=3)
+        waits = [bucket.reserve() for _ in range(6)]
+
+    # 버킷 크기만큼 바로 보내고, 이후는 빚으로 예약 → 0.1초 간격으로 밀림
+    assert waits == pytest.approx([0, 0, 0, 0.1, 0.2, 0.3])
+
+
+def test_token_bucket_refills_over_time_up_to_burst():
+    net = SimNetwork()
+    with use_transport(net):
+        bucket = TokenBucket(rate=10, burst=2)
+        bucket.reserve(), bucket.reserve()
+        assert not bucket.idle()
+
+        net.clock.advance(0.1)
+        assert bucket.reserve() == 0.0
+        net.clock.advance(10)
+        assert bucket.idle()
+        assert [bucket.reserve() for _ in range(3)] == pytest.approx([0, 0, 0.1])
+
+
+def test_rate_limiter_takes_the_slower_of_global_and_host_buckets():
+    net = SimNetwork()
+    with use_transport(net):
+        limiter = RateLimiter(rate=100, per_host_rate=1, burst=1, per_host_burst=1)
+        assert limiter.reserve("a") == 0.0
+        assert limiter.reserve("a") == pytest.approx(1.0)    # 호스트 버킷이 더 느림
+        assert limiter.reserve("b") == pytest.approx(0.02)   # 다른 호스트는 전역 간격만
+
+    assert not RateLimiter().enabled